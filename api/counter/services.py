@@ -0,0 +1,31 @@
+from api.utils.redis_cache import get_raw_client
+from django.core.cache import caches
+
+
+class RequestCounterService:
+
+    key = "request_count"
+
+    def __init__(self, cache_alias: str = "default"):
+        self.cache_alias = cache_alias
+
+    def increment(self) -> int:
+        """
+        Increments the request counter, creating it when missing.
+
+        On Redis this is a single atomic ``INCR`` round trip; other backends
+        fall back to ``add`` followed by ``incr``.
+
+        Returns:
+            int: The new request count.
+        """
+        cache = caches[self.cache_alias]
+        # The tiered cache keeps counters in its shared tier.
+        cache = getattr(cache, "remote", cache)
+
+        client = get_raw_client(cache)
+        if client is not None:
+            return client.incr(cache.make_and_validate_key(self.key))
+
+        cache.add(self.key, 0, timeout=None)
+        return cache.incr(self.key)
@@ -1,28 +1,21 @@
 # tests/test_views.py
 
+from django.test import SimpleTestCase
 from django.urls import reverse
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APITestCase
 from rest_framework import status
 from django.core.cache import caches
+from factories.testcases import AuthenticatedTestMixin
+
+from ..services import RequestCounterService
 
 cache_ = caches['default']
 
 
-class RequestCountAPITest(APITestCase):
+class RequestCountAPITest(AuthenticatedTestMixin, APITestCase):
 
     def setUp(self):
-        self.client = APIClient()
-        self.username = 'username'
-        self.password = 'password'
-
-        token_url = reverse('register')
-
-        response = self.client.post(token_url, {'username': self.username,
-                                                'password': self.password})
-        self.token = response.data['access']
-
-        # Set the Authorization header for authenticated requests
-        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.token)
+        super().setUp()
         cache_.set('request_count', 10)  # Setting initial request count
 
     def test_get_request_count_success(self):
@@ -49,3 +42,24 @@ class RequestCountAPITest(APITestCase):
         url = reverse('reset-request-count')
         response = self.client.post(url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class MetricsAPITest(AuthenticatedTestMixin, APITestCase):
+
+    def test_get_metrics_success(self):
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_metrics_unauthorized(self):
+        self.client.credentials()
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class RequestCounterServiceTest(SimpleTestCase):
+
+    def test_increment_creates_missing_counter(self):
+        cache_.delete('request_count')
+        self.assertEqual(RequestCounterService().increment(), 1)
+        self.assertEqual(RequestCounterService().increment(), 2)
+        self.assertEqual(cache_.get('request_count'), 2)
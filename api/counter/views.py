@@ -3,7 +3,8 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from api.user_auth.authentication import StatelessJWTAuthentication
+from api.utils.rate_limiter import limiters
 
 cache_ = caches['default']
 
@@ -14,7 +15,7 @@ class RequestCountAPIView(APIView):
     """
 
     permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
 
     def get(self, request) -> Response:
 
@@ -34,7 +35,7 @@ class ResetRequestCountAPIView(APIView):
     """
 
     permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
 
     def post(self, request) -> Response:
 
@@ -46,3 +47,24 @@ class ResetRequestCountAPIView(APIView):
         except Exception as e:
             return Response({"error": str(e)},
                             status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class MetricsAPIView(APIView):
+    """
+    API view to return cache and rate limiter metrics of the worker serving
+    the request.
+    """
+
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [StatelessJWTAuthentication]
+
+    def get(self, request) -> Response:
+
+        """return per worker cache hit ratios and rate limiter metrics"""
+        metrics = {}
+        if hasattr(cache_, 'stats'):
+            metrics['cache'] = cache_.stats()
+        if limiters:
+            metrics['rate_limiters'] = {
+                name: limiter.stats() for name, limiter in limiters.items()}
+        return Response(metrics, status=status.HTTP_200_OK)
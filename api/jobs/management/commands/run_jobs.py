@@ -0,0 +1,45 @@
+import signal
+import time
+
+from api.jobs.services import JobService
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+
+class Command(BaseCommand):
+    help = "Runs queued background jobs until stopped. Start as many workers as needed." # noqa
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true",
+                            help="exit when no job is due")
+        parser.add_argument("--max-jobs", type=int,
+                            help="exit after running this many jobs")
+        parser.add_argument("--interval", type=float,
+                            default=settings.JOBS_POLL_INTERVAL,
+                            help="seconds to wait when the queue is empty")
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        job_service = JobService()
+        ran = 0
+
+        while not self.stopping:
+            close_old_connections()
+            job = job_service.claim()
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["interval"])
+                continue
+
+            job = job_service.run(job)
+            ran += 1
+            self.stdout.write(f"{job.name} {job.pk} {job.status}")
+            if options["max_jobs"] and ran >= options["max_jobs"]:
+                break
+
+    def stop(self, signum, frame):
+        # Finish the running job, then exit.
+        self.stopping = True
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.7 on 2026-10-19 14:45
+
+import api.utils.uuid7
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='uuid',
+            field=models.UUIDField(default=api.utils.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
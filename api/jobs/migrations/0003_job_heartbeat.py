@@ -0,0 +1,28 @@
+# Generated by Django 5.0.7 on 2026-10-19 15:13
+
+from django.db import migrations, models
+
+
+def start_heartbeats(apps, schema_editor):
+    # Jobs running during the upgrade are judged by when they started, as
+    # before.
+    Job = apps.get_model("jobs", "Job")
+    Job.objects.filter(status="running").update(
+        heartbeat_at=models.F("started_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_uuid7_primary_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='heartbeat_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(start_heartbeats,
+                             migrations.RunPython.noop),
+    ]
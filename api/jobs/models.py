@@ -0,0 +1,47 @@
+from api.utils.uuid7 import uuid7
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+
+    class Status(models.TextChoices):
+        QUEUED = "queued"
+        RUNNING = "running"
+        SUCCEEDED = "succeeded"
+        FAILED = "failed"
+
+    uuid = models.UUIDField(
+        primary_key=True, default=uuid7, editable=False
+    )
+    name = models.CharField(max_length=255)
+    kwargs = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=Status.choices,
+                              default=Status.QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    # Percent complete, reported by the job itself.
+    progress = models.PositiveSmallIntegerField(default=0)
+    result = models.JSONField(null=True)
+    error = models.TextField(default="")
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True)
+    # Refreshed while the job runs, see JobService.requeue_stale.
+    heartbeat_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "run_after"])]
+
+    def set_progress(self, progress: int) -> None:
+        """
+        Records how far the job got, visible at ``GET /jobs/<uuid>/``, and
+        counts as a heartbeat.
+
+        Args:
+            progress (int): Percent complete, clamped to 0-100.
+        """
+        self.progress = min(max(int(progress), 0), 100)
+        Job.objects.filter(pk=self.pk).update(progress=self.progress,
+                                              heartbeat_at=timezone.now())
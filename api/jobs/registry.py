@@ -0,0 +1,36 @@
+from typing import Callable, Dict, NamedTuple, Optional
+
+
+class JobDefinition(NamedTuple):
+    func: Callable
+    max_attempts: int
+
+
+registry: Dict[str, JobDefinition] = {}
+
+
+def job(name: Optional[str] = None, max_attempts: int = 3) -> Callable:
+    """
+    Registers a function as a background job.
+
+    The function is called with the running ``Job`` followed by the keyword
+    arguments it was enqueued with, which must be JSON serializable. Its
+    return value is stored as the job result.
+
+        @job("movies.purge_collections")
+        def purge_collections(job, uuids):
+            ...
+
+    Args:
+        name (str, optional): The job name, defaults to ``module.function``.
+        max_attempts (int, optional): Runs before the job is marked failed.
+
+    Returns:
+        Callable: The decorator.
+    """
+    def decorator(func: Callable) -> Callable:
+        job_name = name or f"{func.__module__}.{func.__name__}"
+        registry[job_name] = JobDefinition(func, max_attempts)
+        func.job_name = job_name
+        return func
+    return decorator
@@ -0,0 +1,12 @@
+from rest_framework import serializers
+
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Job
+        fields = ["uuid", "name", "status", "progress", "attempts",
+                  "max_attempts", "result", "error", "created_at",
+                  "started_at", "heartbeat_at", "finished_at"]
@@ -0,0 +1,169 @@
+import logging
+import threading
+import traceback
+from datetime import timedelta
+from typing import Any, Optional, Union
+
+from config.db.routers import pin_to_primary, unpin
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+from .registry import registry
+
+logger = logging.getLogger(__name__)
+
+
+class Heartbeat:
+
+    """
+    Refreshes a running job's ``heartbeat_at`` every
+    ``JOBS_HEARTBEAT_INTERVAL`` seconds from a background thread, so a long
+    job that reports no progress is not taken for lost and run twice.
+    """
+
+    def __init__(self, job: Job):
+        self.job = job
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.beat, daemon=True,
+                                       name=f"job-heartbeat-{job.pk}")
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+
+    def beat(self) -> None:
+        try:
+            while not self.stopped.wait(settings.JOBS_HEARTBEAT_INTERVAL):
+                Job.objects.filter(
+                    pk=self.job.pk, status=Job.Status.RUNNING
+                ).update(heartbeat_at=timezone.now())
+        except Exception:
+            logger.exception("Heartbeat of job %s failed", self.job.pk)
+        finally:
+            # The thread's own connection.
+            connection.close()
+
+
+class JobService:
+
+    def enqueue(self, name: Union[str, Any], **kwargs) -> Job:
+        """
+        Queues a registered job. With ``JOBS_ALWAYS_EAGER`` it runs right away in the calling process, which is what tests use.
+
+        Args:
+            name (Union[str, Callable]): The job name or the decorated function.
+            **kwargs: JSON serializable arguments for the job.
+
+        Returns:
+            Job: The queued, or with eager mode finished, job.
+
+        Raises:
+            KeyError: If no job is registered under the name.
+        """ # noqa
+        name = getattr(name, "job_name", name)
+        definition = registry[name]
+        job = Job.objects.create(name=name, kwargs=kwargs,
+                                 max_attempts=definition.max_attempts)
+        if settings.JOBS_ALWAYS_EAGER:
+            self.run_eagerly(job)
+        return job
+
+    def run_eagerly(self, job: Job) -> None:
+        while job.status == Job.Status.QUEUED:
+            job.status = Job.Status.RUNNING
+            job.attempts += 1
+            job.started_at = job.heartbeat_at = timezone.now()
+            job.save(update_fields=["status", "attempts", "started_at",
+                                    "heartbeat_at"])
+            self.run(job)
+
+    def claim(self) -> Optional[Job]:
+        """
+        Takes the next due job. The conditional update lets any number of workers poll the same table without running a job twice.
+
+        Returns:
+            Optional[Job]: The claimed job, now running, or None if nothing is due.
+        """ # noqa
+        now = timezone.now()
+        self.requeue_stale(now)
+        due = Job.objects.filter(
+            status=Job.Status.QUEUED, run_after__lte=now
+        ).order_by("run_after").values_list("pk", flat=True)[:10]
+
+        for pk in due:
+            claimed = Job.objects.filter(
+                pk=pk, status=Job.Status.QUEUED
+            ).update(status=Job.Status.RUNNING, started_at=now,
+                     heartbeat_at=now, attempts=F("attempts") + 1)
+            if claimed:
+                return Job.objects.get(pk=pk)
+        return None
+
+    def requeue_stale(self, now) -> int:
+        """
+        Recovers running jobs whose worker died mid run, noticed by their heartbeat stopping for ``JOBS_STALE_AFTER`` seconds. They are requeued while attempts are left and failed otherwise, so a job that kills its worker is not retried forever.
+
+        Args:
+            now (datetime): The current time.
+
+        Returns:
+            int: The number of jobs requeued.
+        """ # noqa
+        stale = Job.objects.filter(
+            status=Job.Status.RUNNING,
+            heartbeat_at__lt=now - timedelta(
+                seconds=settings.JOBS_STALE_AFTER),
+        )
+        stale.filter(attempts__gte=F("max_attempts")).update(
+            status=Job.Status.FAILED, finished_at=now,
+            error="The worker stopped while running the job.")
+        return stale.update(status=Job.Status.QUEUED, run_after=now)
+
+    def run(self, job: Job) -> Job:
+        """
+        Runs a claimed job and records its outcome. Failed jobs are retried with exponential backoff until ``max_attempts`` runs.
+
+        The job reads from the primary: it usually acts on rows written just before it was queued, which a lagging replica may not have yet.
+
+        Args:
+            job (Job): A job in the running state.
+
+        Returns:
+            Job: The job with its updated status.
+        """ # noqa
+        definition = registry.get(job.name)
+        token = pin_to_primary()
+        try:
+            if definition is None:
+                raise LookupError(f"No job registered as {job.name!r}")
+            with Heartbeat(job):
+                job.result = definition.func(job, **job.kwargs)
+        except Exception:
+            logger.exception("Job %s (%s) failed", job.name, job.pk)
+            job.error = traceback.format_exc()
+            if definition is not None and job.attempts < job.max_attempts:
+                job.status = Job.Status.QUEUED
+                job.run_after = timezone.now() + timedelta(
+                    seconds=settings.JOBS_RETRY_BACKOFF
+                    * 2 ** (job.attempts - 1))
+            else:
+                job.status = Job.Status.FAILED
+                job.finished_at = timezone.now()
+        else:
+            job.status = Job.Status.SUCCEEDED
+            job.progress = 100
+            job.error = ""
+            job.finished_at = timezone.now()
+        finally:
+            unpin(token)
+
+        job.save(update_fields=["status", "result", "error", "progress",
+                                "run_after", "finished_at"])
+        return job
@@ -0,0 +1,143 @@
+import time
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from factories.testcases import AuthenticatedTestMixin
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import Job
+from ..registry import job
+from ..services import Heartbeat, JobService
+
+calls = []
+
+
+@job("tests.add")
+def add(job, a, b):
+    job.set_progress(50)
+    return a + b
+
+
+@job("tests.flaky", max_attempts=2)
+def flaky(job):
+    calls.append(job.attempts)
+    raise ValueError("flaky")
+
+
+class JobServiceTest(TestCase):
+
+    def setUp(self):
+        calls.clear()
+        self.job_service = JobService()
+
+    def test_enqueue_and_run(self):
+        queued = self.job_service.enqueue(add, a=1, b=2)
+        self.assertEqual(queued.status, Job.Status.QUEUED)
+
+        claimed = self.job_service.claim()
+        self.assertEqual(claimed.pk, queued.pk)
+        self.assertEqual(claimed.status, Job.Status.RUNNING)
+        self.assertIsNone(self.job_service.claim())
+
+        finished = self.job_service.run(claimed)
+        self.assertEqual(finished.status, Job.Status.SUCCEEDED)
+        self.assertEqual(finished.result, 3)
+        self.assertEqual(finished.progress, 100)
+
+    def test_failed_job_is_retried_with_backoff(self):
+        queued = self.job_service.enqueue("tests.flaky")
+        retried = self.job_service.run(self.job_service.claim())
+        self.assertEqual(retried.status, Job.Status.QUEUED)
+        self.assertGreater(retried.run_after, timezone.now())
+        self.assertIn("ValueError: flaky", retried.error)
+        self.assertIsNone(self.job_service.claim())
+
+        Job.objects.filter(pk=queued.pk).update(run_after=timezone.now())
+        failed = self.job_service.run(self.job_service.claim())
+        self.assertEqual(failed.status, Job.Status.FAILED)
+        self.assertEqual(calls, [1, 2])
+
+    @override_settings(JOBS_ALWAYS_EAGER=True)
+    def test_eager_mode(self):
+        self.assertEqual(self.job_service.enqueue(add, a=2, b=2).result, 4)
+        self.assertEqual(self.job_service.enqueue(flaky).status,
+                         Job.Status.FAILED)
+        self.assertEqual(calls, [1, 2])
+
+    def test_stale_jobs_are_requeued(self):
+        queued = self.job_service.enqueue(add, a=1, b=1)
+        Job.objects.filter(pk=queued.pk).update(
+            status=Job.Status.RUNNING, attempts=1,
+            started_at=timezone.now() - timedelta(days=1),
+            heartbeat_at=timezone.now() - timedelta(days=1))
+        self.assertEqual(self.job_service.claim().pk, queued.pk)
+
+    def test_long_running_job_with_heartbeat_is_not_requeued(self):
+        queued = self.job_service.enqueue(add, a=1, b=1)
+        Job.objects.filter(pk=queued.pk).update(
+            status=Job.Status.RUNNING, attempts=1,
+            started_at=timezone.now() - timedelta(days=1))
+        queued.set_progress(10)
+        self.assertIsNone(self.job_service.claim())
+
+    def test_stale_job_without_attempts_left_fails(self):
+        queued = self.job_service.enqueue("tests.flaky")
+        Job.objects.filter(pk=queued.pk).update(
+            status=Job.Status.RUNNING, attempts=2,
+            heartbeat_at=timezone.now() - timedelta(days=1))
+        self.assertIsNone(self.job_service.claim())
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Job.Status.FAILED)
+
+    def test_unknown_job_fails(self):
+        unknown = Job.objects.create(name="tests.unknown")
+        self.assertEqual(self.job_service.run(unknown).status,
+                         Job.Status.FAILED)
+
+
+class RunJobsCommandTest(TransactionTestCase):
+
+    # The command closes stale connections between jobs, which would close
+    # the connection holding a TestCase's transaction.
+    def test_run_jobs_command(self):
+        JobService().enqueue(add, a=1, b=2)
+        JobService().enqueue(add, a=3, b=4)
+        call_command("run_jobs", "--once", stdout=StringIO())
+        self.assertEqual(sorted(Job.objects.values_list("result", flat=True)),
+                         [3, 7])
+
+
+class HeartbeatTest(TransactionTestCase):
+
+    @override_settings(JOBS_HEARTBEAT_INTERVAL=0.01)
+    def test_heartbeat_while_running(self):
+        started = timezone.now() - timedelta(days=1)
+        running = Job.objects.create(name="tests.add", attempts=1,
+                                     status=Job.Status.RUNNING,
+                                     started_at=started, heartbeat_at=started)
+        with Heartbeat(running):
+            time.sleep(0.1)
+        running.refresh_from_db()
+        self.assertGreater(running.heartbeat_at, started)
+
+
+class JobDetailViewTest(AuthenticatedTestMixin, APITestCase):
+
+    def test_job_status(self):
+        queued = JobService().enqueue(add, a=1, b=2)
+        response = self.client.get(reverse("job-detail",
+                                           kwargs={"pk": queued.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "queued")
+        self.assertEqual(response.data["progress"], 0)
+
+    def test_unknown_job(self):
+        unknown_uuid = "12345678-1234-5678-1234-567812345678"
+        response = self.client.get(reverse("job-detail",
+                                           kwargs={"pk": unknown_uuid}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,18 @@
+from api.user_auth.authentication import StatelessJWTAuthentication
+from rest_framework import generics
+from rest_framework.permissions import IsAuthenticated
+
+from .models import Job
+from .serializers import JobSerializer
+
+
+class JobDetailView(generics.RetrieveAPIView):
+    """
+    API view to return the status and progress of a background job.
+    """
+
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [StatelessJWTAuthentication]
+
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
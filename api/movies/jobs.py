@@ -0,0 +1,30 @@
+from api.jobs.registry import job
+
+from .models import Movie
+from .services import DeleteCollectionService
+
+
+@job("movies.purge_collections")
+def purge_collections(job, uuids):
+    """
+    Purges soft deleted collections and reports progress per movie batch.
+
+    Args:
+        job (Job): The running job.
+        uuids (List[str]): The UUIDs of the collections to purge.
+
+    Returns:
+        Dict[str, int]: The number of movies purged.
+    """
+    total = Movie.objects.filter(collection_id__in=uuids).count()
+    purged = 0
+
+    def on_batch(deleted):
+        nonlocal purged
+        purged += deleted
+        if total:
+            job.set_progress(purged * 100 // total)
+
+    for uuid in uuids:
+        DeleteCollectionService().purge_collection(uuid, on_batch=on_batch)
+    return {"movies_purged": purged}
@@ -0,0 +1,17 @@
+from api.movies.services import DeleteCollectionService
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Purges collections left deleted by COLLECTION_DELETE_MODE=deferred, e.g. after a failed purge job." # noqa
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int,
+                            help="movies deleted per statement")
+        parser.add_argument("--limit", type=int,
+                            help="most collections purged in this run")
+
+    def handle(self, *args, **options):
+        purged = DeleteCollectionService().purge_deleted_collections(
+            batch_size=options["batch_size"], limit=options["limit"])
+        self.stdout.write(f"Purged {purged} collections")
@@ -0,0 +1,16 @@
+from api.movies.services import CollectionSummaryService
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Recomputes the movie count and genre summary of every collection from its movies." # noqa
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000,
+                            help="collections checked per transaction")
+
+    def handle(self, *args, **options):
+        checked, repaired = CollectionSummaryService().repair_summaries(
+            batch_size=options["batch_size"])
+        self.stdout.write(
+            f"Checked {checked} collections, repaired {repaired}")
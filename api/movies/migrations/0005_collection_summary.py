@@ -0,0 +1,56 @@
+# Generated by Django 5.0.7 on 2026-10-19 14:42
+
+from collections import Counter
+
+from django.db import migrations, models
+
+
+def summarize_collections(apps, schema_editor):
+    Collection = apps.get_model('movies', 'Collection')
+    Movie = apps.get_model('movies', 'Movie')
+
+    summaries = {}
+    for collection_id, genres in Movie.objects.values_list(
+            'collection_id', 'genres').iterator():
+        movie_count, counts = summaries.setdefault(collection_id, [0, Counter()])
+        summaries[collection_id][0] = movie_count + 1
+        counts.update(genre for genre in genres.split(', ') if genre)
+
+    collections = []
+    for collection in Collection.objects.filter(pk__in=summaries).iterator():
+        movie_count, counts = summaries[collection.pk]
+        collection.movie_count = movie_count
+        collection.genre_counts = dict(counts)
+        collection.top_genres = [genre for genre, _ in sorted(
+            counts.items(), key=lambda item: (-item[1], item[0]))[:3]]
+        collections.append(collection)
+    Collection.objects.bulk_update(
+        collections, ['movie_count', 'genre_counts', 'top_genres'],
+        batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0004_collection_is_deleted'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='collection',
+            name='genre_counts',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AddField(
+            model_name='collection',
+            name='movie_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='collection',
+            name='top_genres',
+            field=models.JSONField(default=list),
+        ),
+        migrations.RunPython(summarize_collections,
+                             migrations.RunPython.noop),
+    ]
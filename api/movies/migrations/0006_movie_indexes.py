@@ -0,0 +1,29 @@
+# Generated by Django 5.0.7 on 2026-10-19 14:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0005_collection_summary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['collection', 'title'], name='movie_collection_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['collection', 'genres'], name='movie_collection_genres_idx'),
+        ),
+        # The composite indexes above lead with collection_id, which makes
+        # the foreign key's own index redundant.
+        migrations.AlterField(
+            model_name='movie',
+            name='collection',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='movies', to='movies.collection'),
+        ),
+    ]
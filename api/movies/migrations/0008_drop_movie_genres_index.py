@@ -0,0 +1,17 @@
+# Generated by Django 5.0.7 on 2026-10-19 15:17
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0007_uuid7_primary_keys'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='movie',
+            name='movie_collection_genres_idx',
+        ),
+    ]
@@ -0,0 +1,30 @@
+from config.db.routers import (has_recent_write, mark_recent_write,
+                               pin_to_primary, unpin)
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+
+class ReadYourWritesMixin:
+    """
+    Pins writes, and reads by users who wrote recently, to the primary
+    database so replica lag never hides a user's own changes.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if not settings.DATABASE_REPLICA_ALIASES:
+            return
+
+        if (request.method not in SAFE_METHODS
+                or has_recent_write(request.user.pk)):
+            request.primary_token = pin_to_primary()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(request, "primary_token", None)
+        if token is not None:
+            wrote = (request.method not in SAFE_METHODS
+                     and response.status_code < 400)
+            if wrote:
+                mark_recent_write(request.user.pk)
+            unpin(token)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -1,21 +1,106 @@
-import uuid
+from collections import Counter
+from typing import Iterable
 
+from api.utils.uuid7 import uuid7
 from django.db import models
 
 
+class CollectionManager(models.Manager):
+
+    """Hides collections that are deleted but not purged yet."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
+
+
 class Collection(models.Model):
-    uuid = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False) # noqa
+    uuid = models.UUIDField(primary_key=True, default=uuid7, editable=False) # noqa
     title = models.CharField(max_length=255, null=False)
     description = models.TextField(default="")
+    # Set by deferred deletes until the collection and its movies are
+    # purged in batches, see DeleteCollectionService.
+    is_deleted = models.BooleanField(default=False, db_index=True)
+    # Summary of the movies, kept up to date by every write path so
+    # listing collections never reads the movies. Rebuilt by the
+    # repair_collection_summaries command.
+    movie_count = models.PositiveIntegerField(default=0)
+    genre_counts = models.JSONField(default=dict)
+    top_genres = models.JSONField(default=list)
+
+    objects = CollectionManager()
+    all_objects = models.Manager()
+
+    SUMMARY_FIELDS = ["movie_count", "genre_counts", "top_genres"]
+    TOP_GENRES = 3
+
+    def summarize(self, genres: Iterable[str]) -> None:
+        """
+        Sets the summary fields, without saving them.
+
+        Args:
+            genres (Iterable[str]): The ``genres`` of every movie in the
+                collection, e.g. ``"Action, Drama"``.
+        """
+        genres = list(genres)
+        self.movie_count = len(genres)
+        self.set_genre_counts(self.count_genres(genres))
+
+    def update_summary(self, removed: Iterable[str],
+                       added: Iterable[str]) -> None:
+        """
+        Adjusts the summary fields for movies removed from and added to the
+        collection, without saving them or reading the other movies. An
+        updated movie is removed with its old genres and added with its
+        new ones.
+
+        Args:
+            removed (Iterable[str]): The ``genres`` of the removed movies.
+            added (Iterable[str]): The ``genres`` of the added movies.
+        """
+        removed, added = list(removed), list(added)
+        self.movie_count = max(
+            self.movie_count + len(added) - len(removed), 0)
+        counts = Counter(self.genre_counts)
+        counts.subtract(self.count_genres(removed))
+        counts.update(self.count_genres(added))
+        self.set_genre_counts(counts)
+
+    @staticmethod
+    def count_genres(genres: Iterable[str]) -> Counter:
+        counts = Counter()
+        for movie_genres in genres:
+            counts.update(genre for genre in movie_genres.split(", ")
+                          if genre)
+        return counts
+
+    def set_genre_counts(self, counts: Counter) -> None:
+        counts = {genre: count for genre, count in counts.items()
+                  if count > 0}
+        self.genre_counts = counts
+        # Ties go alphabetically so the summary does not depend on the
+        # order the movies were read in.
+        self.top_genres = [genre for genre, _ in sorted(
+            counts.items(), key=lambda item: (-item[1], item[0])
+        )[:self.TOP_GENRES]]
 
 
 class Movie(models.Model):
     uuid = models.UUIDField(
-        primary_key=True, default=uuid.uuid4, editable=False
+        primary_key=True, default=uuid7, editable=False
     )  # Use UUID as the primary key
     title = models.CharField(max_length=255, null=False)
     description = models.TextField(default="")
     genres = models.CharField(max_length=255, default="")
+    # Indexed by the composite indexes below, which lead with it.
     collection = models.ForeignKey(
-        Collection, related_name="movies", on_delete=models.CASCADE
+        Collection, related_name="movies", on_delete=models.CASCADE,
+        db_index=False,
     )
+
+    class Meta:
+        indexes = [
+            # A collection's movies in title order (retrieve and update),
+            # and the movies of the collections whose summary is refreshed.
+            models.Index(fields=["collection", "title"],
+                         name="movie_collection_title_idx"),
+        ]
@@ -0,0 +1,154 @@
+"""
+Caches upstream movie pages and fetches the pages a user is likely to ask
+for next in the background.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .upstream import (decode_page, get_upstream_client,
+                       get_upstream_rate_limiter)
+
+logger = logging.getLogger(__name__)
+
+
+class MoviePageCache:
+
+    """
+    Upstream page bodies exactly as received, keyed by page number. Disabled
+    while ``MOVIE_PAGE_CACHE_TIMEOUT`` is 0.
+    """
+
+    key_prefix = "movies:page-body"
+
+    def __init__(self, cache_alias: str = "default"):
+        self.cache_alias = cache_alias
+
+    @property
+    def enabled(self) -> bool:
+        return settings.MOVIE_PAGE_CACHE_TIMEOUT > 0
+
+    def get(self, page: int) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        return caches[self.cache_alias].get(self.get_key(page))
+
+    def set(self, page: int, body: bytes) -> None:
+        if self.enabled:
+            caches[self.cache_alias].set(
+                self.get_key(page), body,
+                timeout=settings.MOVIE_PAGE_CACHE_TIMEOUT)
+
+    def has(self, page: int) -> bool:
+        return self.enabled and caches[self.cache_alias].has_key(
+            self.get_key(page))
+
+    def get_key(self, page: int) -> str:
+        return f"{self.key_prefix}:{page}"
+
+
+class RateBudget:
+
+    """
+    A per process token bucket: ``rate`` requests per second with bursts of
+    up to ``burst``. ``try_acquire`` never waits.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens
+                              + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class PagePrefetcher:
+
+    """
+    Warms the page cache with the ``MOVIE_PREFETCH_PAGES`` pages after the
+    one just served, on a small per worker thread pool.
+
+    Prefetches are dropped rather than queued when the pages are already
+    cached or in flight, when every pool thread is busy, or when the
+    ``MOVIE_PREFETCH_RATE`` budget or the shared upstream rate limit has no
+    spare token, so they never delay or crowd out the fetches users are
+    waiting on.
+    """
+
+    executor = ThreadPoolExecutor(
+        max_workers=settings.MOVIE_PREFETCH_WORKERS,
+        thread_name_prefix="movie-prefetch",
+    )
+    budget = RateBudget(rate=settings.MOVIE_PREFETCH_RATE,
+                        burst=max(settings.MOVIE_PREFETCH_PAGES, 1))
+    in_flight = set()
+    lock = threading.Lock()
+
+    def __init__(self, page_cache: MoviePageCache = None):
+        self.page_cache = page_cache or MoviePageCache()
+
+    def schedule(self, page: int) -> int:
+        """
+        Starts background fetches for the pages following ``page``.
+
+        Args:
+            page (int): The page that was just served.
+
+        Returns:
+            int: The number of fetches started.
+        """
+        if not self.page_cache.enabled:
+            return 0
+
+        started = 0
+        for next_page in range(page + 1,
+                               page + 1 + settings.MOVIE_PREFETCH_PAGES):
+            if self.page_cache.has(next_page):
+                continue
+            with self.lock:
+                if (next_page in self.in_flight or len(self.in_flight)
+                        >= settings.MOVIE_PREFETCH_WORKERS):
+                    continue
+                if not self.budget.try_acquire():
+                    break
+                # Prefetches only use spare upstream capacity.
+                limiter = get_upstream_rate_limiter()
+                if limiter is not None and not limiter.try_acquire():
+                    break
+                self.in_flight.add(next_page)
+            self.executor.submit(self.fetch, next_page)
+            started += 1
+        return started
+
+    def fetch(self, page: int) -> None:
+        try:
+            api_client = get_upstream_client(rate_limited=False)
+            api_response = api_client.get(f"/?page={page}")
+            if api_response.status_code == 200:
+                # Nobody is waiting on this page, so validate all of it
+                # before it can be served in passthrough mode.
+                decode_page(api_response.content)
+                self.page_cache.set(page, api_response.content)
+        except Exception:
+            logger.warning("Prefetching movie page %s failed", page,
+                           exc_info=True)
+        finally:
+            with self.lock:
+                self.in_flight.discard(page)
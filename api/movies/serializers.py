@@ -1,4 +1,6 @@
+from django.conf import settings
 from rest_framework import serializers
+
 from .models import Collection, Movie
 
 
@@ -25,7 +27,10 @@ class CollectionSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         movies_data = validated_data.pop("movies")
-        collection = Collection.objects.create(**validated_data)
+        collection = Collection(**validated_data)
+        collection.summarize(
+            movie_data.get("genres", "") for movie_data in movies_data)
+        collection.save(force_insert=True)
         for movie_data in movies_data:
             Movie.objects.create(collection=collection, **movie_data)
         return collection
@@ -35,11 +40,102 @@ class CollectionSerializer(serializers.ModelSerializer):
         instance.title = validated_data.get("title", instance.title)
         instance.description = validated_data.get(
             "description", instance.description)
-        instance.save()
+        update_fields = ["title", "description"]
+
+        if movies_data:
+            # Uses the prefetched movies when available, otherwise loads
+            # them in a single query, then writes every change in one bulk
+            # update.
+            movies = {movie.uuid: movie for movie in instance.movies.all()}
+            fields = set()
+            for movie_data in movies_data:
+                movie = movies.get(movie_data["uuid"])
+                if movie is None:
+                    raise serializers.ValidationError({
+                        "movies": [f"Movie {movie_data['uuid']} is not in "
+                                   "this collection."]
+                    })
+                for attr, value in movie_data.items():
+                    if attr != "uuid":
+                        setattr(movie, attr, value)
+                        fields.add(attr)
 
-        for movies in movies_data:
-            movie_ins = instance.movies.get(uuid=movies["uuid"])
-            if movie_ins:
-                MovieSerializer().update(movie_ins, movies)
+            if fields:
+                Movie.objects.bulk_update(
+                    [movies[movie_data["uuid"]]
+                     for movie_data in movies_data],
+                    sorted(fields),
+                )
+            if "genres" in fields:
+                # The view locked the collection row, so no other write
+                # changes its movies before this summary is saved.
+                instance.summarize(movie.genres for movie in movies.values())
+                update_fields += Collection.SUMMARY_FIELDS
 
+        instance.save(update_fields=update_fields)
         return instance
+
+
+class MoviePatchSerializer(serializers.Serializer):
+
+    OPERATIONS = ("add", "update", "remove")
+
+    op = serializers.ChoiceField(choices=OPERATIONS, default="update")
+    uuid = serializers.UUIDField()
+    title = serializers.CharField(max_length=255, required=False)
+    description = serializers.CharField(allow_blank=True, required=False)
+    genres = serializers.CharField(max_length=255, allow_blank=True,
+                                   required=False)
+
+    def validate(self, attrs):
+        if attrs["op"] == "add" and "title" not in attrs:
+            raise serializers.ValidationError(
+                {"title": ["This field is required to add a movie."]})
+        return attrs
+
+
+class CollectionPatchSerializer(serializers.Serializer):
+
+    title = serializers.CharField(max_length=255, required=False)
+    description = serializers.CharField(allow_blank=True, required=False)
+    movies = MoviePatchSerializer(many=True, required=False)
+
+    def validate_movies(self, movies):
+        uuids = [movie["uuid"] for movie in movies]
+        if len(uuids) != len(set(uuids)):
+            raise serializers.ValidationError(
+                "Each movie may only appear once in a patch.")
+        return movies
+
+
+class BatchOperationSerializer(serializers.Serializer):
+
+    OPERATIONS = ("create", "update", "delete")
+
+    op = serializers.ChoiceField(choices=OPERATIONS)
+    uuid = serializers.UUIDField(required=False)
+    data = serializers.DictField(required=False, default=dict)
+
+    def validate(self, attrs):
+        if attrs["op"] != "create" and "uuid" not in attrs:
+            raise serializers.ValidationError(
+                {"uuid": [f"This field is required to {attrs['op']} a "
+                          "collection."]})
+        return attrs
+
+
+class CollectionBatchSerializer(serializers.Serializer):
+
+    operations = BatchOperationSerializer(many=True, allow_empty=False)
+
+    def validate_operations(self, operations):
+        if len(operations) > settings.BATCH_MAX_OPERATIONS:
+            raise serializers.ValidationError(
+                f"At most {settings.BATCH_MAX_OPERATIONS} operations are "
+                "allowed per batch.")
+        uuids = [operation["uuid"] for operation in operations
+                 if "uuid" in operation]
+        if len(uuids) != len(set(uuids)):
+            raise serializers.ValidationError(
+                "Each collection may only appear once in a batch.")
+        return operations
@@ -1,23 +1,32 @@
 from collections import Counter
-from typing import Any, Dict, List
+from typing import (Any, Callable, Dict, Iterable, List, Optional,
+                    Tuple, Union)
 
 import requests
-from api.utils.api_client import APIClient
+from api.jobs.models import Job
+from api.jobs.services import JobService
+from api.utils import fast_json
 from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.db.models import Prefetch, QuerySet
 from django.http import HttpRequest
-from dotenv import load_dotenv
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
-from .models import Movie
-from .serializers import MovieSerializer
-
-load_dotenv()
+from .models import Collection, Movie
+from .page_cache import MoviePageCache, PagePrefetcher
+from .upstream import (decode_page, get_upstream_client, join_page,
+                       split_page)
+from .serializers import (CollectionPatchSerializer, CollectionSerializer,
+                          MovieSerializer)
 
 
 class MovieListService:
 
-    def get_list(self, request: HttpRequest) -> Dict[str, Any]:
+    page_cache = MoviePageCache()
+    prefetcher = PagePrefetcher(page_cache)
+
+    def get_list(self, request: HttpRequest) -> Union[Dict[str, Any], bytes]:
         """
         Fetches a list of movies from the external API.
 
@@ -25,37 +34,51 @@ class MovieListService:
             request (HttpRequest): The HTTP request containing pagination information.
 
         Returns:
-            Dict[str, Any]: A dictionary containing validated movie data.
+            Union[Dict[str, Any], bytes]: A dictionary containing validated movie data, or the encoded page when ``MOVIE_LIST_PASSTHROUGH`` is on.
 
         Raises:
             RequestException: If there is a network-related error.
+            UpstreamRateLimited: If the upstream rate limit has no room in time.
+            UpstreamSchemaError: If the upstream body is not a page of movies.
             HTTPError: If the response from the API indicates an error.
             Exception: For any other exceptions that may occur.
         """ # noqa
-        api_client = APIClient(
-            base_url=settings.MOVIE_API,
-            username=settings.MOVIE_API_USERNAME,
-            password=settings.MOVIE_API_PASSWORD,
-        )
         page = int(request.GET.get("page", 1))
-        try:
-            api_response = api_client.get(f"/?page={page}")
-            return MovieListService.extract_validated_data(
-                api_response, page, request)
-
-        except (
-            requests.exceptions.RequestException,
-            requests.exceptions.HTTPError,
-            Exception,
-        ) as e:
-            raise e
+        body = self.page_cache.get(page)
+        if body is not None:
+            response, envelope = MovieListService.build_response(
+                body, page, request)
+        else:
+            api_client = get_upstream_client()
+            try:
+                api_response = api_client.get(f"/?page={page}")
+                response, envelope = MovieListService.extract_validated_data(
+                    api_response, page, request)
+
+            except (
+                requests.exceptions.RequestException,
+                requests.exceptions.HTTPError,
+                Exception,
+            ) as e:
+                raise e
+
+        if envelope.get("next"):
+            self.prefetcher.schedule(page)
+        return response
 
     @staticmethod
     def extract_validated_data(api_response: Response,
                                page: int,
-                               request: HttpRequest) -> Dict[str, Any]:
+                               request: HttpRequest
+                               ) -> Tuple[Union[Dict[str, Any], bytes],
+                                          Dict[str, Any]]:
         """
-        Extracts and validates data from the API response.
+        Extracts and validates data from the API response. The body is
+        parsed at most once, on the error path too.
+
+        A page is validated in full before it is cached, passthrough mode
+        included, so a truncated or malformed page is never served from the
+        cache. That costs one decode per cache fill, not per hit.
 
         Args:
             api_response (Response): The response object from the API client.
@@ -63,38 +86,86 @@ class MovieListService:
             request (HttpRequest): The HTTP request for further processing.
 
         Returns:
-            Dict[str, Any]: A dictionary containing validated data.
-        """
+            Tuple[Union[Dict[str, Any], bytes], Dict[str, Any]]: What ``build_response`` returns.
+
+        Raises:
+            UpstreamSchemaError: If the upstream body is not a page of movies.
+        """ # noqa
         status_code = api_response.status_code
+        body = api_response.content
         if status_code == 200:
-            return MovieListService.build_response(api_response, page, request)
-        else:
-            if 'error' in api_response.json():
+            data = decode_page(body)
+            MovieListService.page_cache.set(page, body)
+            return MovieListService.build_response(body, page, request,
+                                                   data=data)
+
+        try:
+            error = fast_json.loads(body)
+        except ValueError:
+            error = None
+        message = error.get("error") if isinstance(error, dict) else None
 
-                error_response = Response()
-                error_response.status_code = api_response.status_code
-                error_response._content = api_response.content
-                raise requests.exceptions.HTTPError(
-                    api_response.json().get("error", "An error occurred"),
-                    response=error_response
-                )
+        error_response = Response()
+        error_response.status_code = status_code
+        error_response._content = body
+        raise requests.exceptions.HTTPError(
+            message or "An error occurred", response=error_response)
+
+    @staticmethod
+    def build_response(body: bytes, page: int, request: HttpRequest,
+                       data: Optional[Dict[str, Any]] = None
+                       ) -> Tuple[Union[Dict[str, Any], bytes],
+                                  Dict[str, Any]]:
+        """
+        Builds the response for an upstream page with pagination links
+        pointing back at this API.
+
+        With ``MOVIE_LIST_PASSTHROUGH`` on, only the envelope ahead of the
+        ``results`` array is decoded and the movies are passed through as
+        received. Pages are validated before they are cached, see
+        ``extract_validated_data``.
+
+        Args:
+            body (bytes): The upstream page body.
+            page (int): The current page number.
+            request (HttpRequest): The HTTP request for constructing absolute URLs.
+            data (Dict[str, Any], optional): The page when it is already decoded.
+
+        Returns:
+            Tuple[Union[Dict[str, Any], bytes], Dict[str, Any]]: The page with rewritten links, encoded in passthrough mode, and the upstream envelope with its ``next`` link.
+
+        Raises:
+            UpstreamSchemaError: If the upstream body is not a page of movies.
+        """ # noqa
+        if settings.MOVIE_LIST_PASSTHROUGH:
+            parts = split_page(body)
+            if parts is not None:
+                envelope, rest = parts
+                return join_page({
+                    **envelope,
+                    **MovieListService.build_links(envelope, page, request),
+                }, rest), envelope
+
+        if data is None:
+            data = decode_page(body)
+        return ({**data, **MovieListService.build_links(data, page, request)},
+                data)
 
     @staticmethod
-    def build_response(response: Response,
-                       page: int, request: HttpRequest) -> Dict[str, Any]:
+    def build_links(data: Dict[str, Any], page: int,
+                    request: HttpRequest) -> Dict[str, Optional[str]]:
         """
-        Builds a response dictionary with pagination information.
+        Returns the ``next`` and ``previous`` links of this API for a page.
 
         Args:
-            response (Response): The response object from the API client.
+            data (Dict[str, Any]): The upstream page or its envelope.
             page (int): The current page number.
             request (HttpRequest): The HTTP request for constructing absolute URLs.
 
         Returns:
-            Dict[str, Any]: A dictionary containing the API response data with pagination links.
+            Dict[str, Optional[str]]: The pagination links.
         """ # noqa
         previous_page = next_page = None
-        data = response.json()
         next_url = data.get("next")
         if next_url:
             next_page = f"{request.build_absolute_uri(request.path)}?page={page + 1}"  # noqa
@@ -105,17 +176,14 @@ class MovieListService:
                 f"{request.build_absolute_uri(request.path)}?page={page - 1}"
             )
 
-        data["next"] = next_page
-        data["previous"] = previous_page
-
-        return data
+        return {"next": next_page, "previous": previous_page}
 
 
 class ListCollectionsService:
 
     def get_collections(self, queryset: QuerySet) -> Dict[str, Any]:
         """
-        Retrieves collections along with their favorite genres.
+        Retrieves collections along with their favorite genres, from the summary columns only.
 
         Args:
             queryset (QuerySet): A queryset of collections to retrieve.
@@ -123,15 +191,12 @@ class ListCollectionsService:
         Returns:
             Dict[str, Any]: A dictionary containing the success status and the collections with favorite genres.
         """ # noqa
-        movies_prefetch = Prefetch("movies", queryset=Movie.objects.all())
-
-        collections = queryset.prefetch_related(movies_prefetch).values(
-            "uuid", "title", "description"
-        )
+        collections = list(queryset.values(
+            "uuid", "title", "description", "movie_count", "top_genres",
+            "genre_counts",
+        ))
 
-        favorite_genres = ListCollectionsService.get_fav_gener(
-            collections, queryset, movies_prefetch
-        )
+        favorite_genres = ListCollectionsService.get_fav_gener(collections)
 
         response = {
             "is_success": True,
@@ -144,30 +209,22 @@ class ListCollectionsService:
         return response
 
     @staticmethod
-    def get_fav_gener(collections: List[Dict[str, Any]],
-                      queryset: QuerySet,
-                      movies_prefetch: Prefetch) -> List[str]:
+    def get_fav_gener(collections: List[Dict[str, Any]]) -> List[str]:
         """
-        Determines the favorite genres from the collections.
+        Determines the favorite genres from the collections' genre counts, removing the counts from the collections.
 
         Args:
-            collections (List[Dict[str, Any]]): A list of collections.
-            queryset (QuerySet): A queryset of collections to retrieve movies from.
-            movies_prefetch (Prefetch): Prefetch object to optimize movie retrieval.
+            collections (List[Dict[str, Any]]): A list of collections with their ``genre_counts``.
 
         Returns:
             List[str]: A list of the top three favorite genres.
         """ # noqa
-        collections = list(collections)
-
-        # Extract all genres
-        all_genres = []
-        for collection in queryset.prefetch_related(movies_prefetch):
-            for movie in collection.movies.all():
-                all_genres.extend(movie.genres.split(", "))
+        genre_counts = Counter()
+        for collection in collections:
+            genre_counts.update(collection.pop("genre_counts"))
 
         # Get favorite genres
-        favorite_genres = Counter(all_genres).most_common(3)
+        favorite_genres = genre_counts.most_common(Collection.TOP_GENRES)
         favorite_genres = [genre[0] for genre in favorite_genres]
 
         return favorite_genres
@@ -205,6 +262,8 @@ class UpdateCollectionService:
         """# noqa
         serializer.is_valid(raise_exception=True)
         updated_collection = serializer.save()
+        # The movies were loaded and updated in place by the serializer, so
+        # this reads them from the prefetch cache instead of re-querying.
         movies_data = MovieSerializer(updated_collection.movies.all(),
                                       many=True).data
 
@@ -213,3 +272,430 @@ class UpdateCollectionService:
             "description": updated_collection.description,
             "movies": movies_data,
         }
+
+
+class PatchCollectionService:
+
+    MOVIE_FIELDS = ("title", "description", "genres")
+
+    def patch_collection(self, collection: Collection,
+                         serializer: object) -> Dict[str, Any]:
+        """
+        Applies a sparse patch to a collection, writing only the rows and columns that change.
+
+        The collection must be locked with ``select_for_update`` in the current transaction, otherwise a concurrent patch can overwrite the summary updated here. The summary is adjusted by the genres of the patched movies only, ``repair_summaries`` recounts it from every movie.
+
+        Args:
+            collection (Collection): The collection to patch.
+            serializer (object): A ``CollectionPatchSerializer`` bound to the patch data.
+
+        Returns:
+            Dict[str, Any]: The collection's title and description with the UUIDs of the added, updated and removed movies.
+
+        Raises:
+            ValidationError: If the patch is invalid or references unknown movies.
+        """ # noqa
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        changed = [field for field in ("title", "description")
+                   if field in data
+                   and data[field] != getattr(collection, field)]
+        for field in changed:
+            setattr(collection, field, data[field])
+
+        operations = {"add": [], "update": [], "remove": []}
+        for movie_data in data.get("movies", []):
+            operations[movie_data.pop("op")].append(movie_data)
+
+        removed, removed_genres = self.remove_movies(
+            collection, operations["remove"])
+        updated, old_genres, new_genres = self.update_movies(
+            collection, operations["update"])
+        added = self.add_movies(collection, operations["add"])
+
+        if removed or added or old_genres:
+            collection.update_summary(
+                removed=removed_genres + old_genres,
+                added=new_genres + [movie_data.get("genres", "")
+                                    for movie_data in operations["add"]],
+            )
+            changed += Collection.SUMMARY_FIELDS
+        if changed:
+            collection.save(update_fields=changed)
+
+        return {
+            "title": collection.title,
+            "description": collection.description,
+            "movies": {
+                "added": added,
+                "updated": updated,
+                "removed": removed,
+            },
+        }
+
+    def remove_movies(self, collection: Collection,
+                      movies_data: List[Dict[str, Any]]
+                      ) -> Tuple[List[str], List[str]]:
+        if not movies_data:
+            return [], []
+        uuids = [movie_data["uuid"] for movie_data in movies_data]
+        movies = Movie.objects.filter(collection=collection, uuid__in=uuids)
+        # Their genres come off the summary.
+        genres = list(movies.values_list("genres", flat=True))
+        if len(genres) != len(uuids):
+            raise ValidationError({"movies": [
+                "Some movies to remove are not in this collection."]})
+        movies.delete()
+        return [str(uuid) for uuid in uuids], genres
+
+    def update_movies(self, collection: Collection,
+                      movies_data: List[Dict[str, Any]]
+                      ) -> Tuple[List[str], List[str], List[str]]:
+        if not movies_data:
+            return [], [], []
+        # Only the movies named in the patch are loaded.
+        movies = Movie.objects.filter(
+            collection=collection,
+            uuid__in=[movie_data["uuid"] for movie_data in movies_data],
+        ).only("uuid", *self.MOVIE_FIELDS).in_bulk()
+
+        changed_movies, fields = [], set()
+        old_genres, new_genres = [], []
+        for movie_data in movies_data:
+            movie = movies.get(movie_data["uuid"])
+            if movie is None:
+                raise ValidationError({"movies": [
+                    f"Movie {movie_data['uuid']} is not in this "
+                    "collection."]})
+            changed = {field for field in self.MOVIE_FIELDS
+                       if field in movie_data
+                       and movie_data[field] != getattr(movie, field)}
+            if "genres" in changed:
+                old_genres.append(movie.genres)
+                new_genres.append(movie_data["genres"])
+            for field in changed:
+                setattr(movie, field, movie_data[field])
+            if changed:
+                changed_movies.append(movie)
+                fields |= changed
+
+        if changed_movies:
+            Movie.objects.bulk_update(changed_movies, sorted(fields))
+        return ([str(movie.uuid) for movie in changed_movies], old_genres,
+                new_genres)
+
+    def add_movies(self, collection: Collection,
+                   movies_data: List[Dict[str, Any]]) -> List[str]:
+        if not movies_data:
+            return []
+        uuids = [movie_data["uuid"] for movie_data in movies_data]
+        if Movie.objects.filter(uuid__in=uuids).exists():
+            raise ValidationError({"movies": [
+                "Some movies to add already exist."]})
+        Movie.objects.bulk_create([
+            Movie(collection=collection, **movie_data)
+            for movie_data in movies_data
+        ])
+        return [str(uuid) for uuid in uuids]
+
+
+class DeleteCollectionService:
+
+    job_service = JobService()
+
+    def delete_collections(self, uuids: Iterable[Any]) -> Optional[Job]:
+        """
+        Deletes collections. With ``COLLECTION_DELETE_MODE = deferred`` they are only flagged as deleted and a background job purges them.
+
+        Args:
+            uuids (Iterable[Any]): The UUIDs of the collections to delete.
+
+        Returns:
+            Optional[Job]: The purge job when deletes are deferred.
+        """ # noqa
+        uuids = list(uuids)
+        collections = Collection.objects.filter(uuid__in=uuids)
+        if settings.COLLECTION_DELETE_MODE == "deferred":
+            if not collections.update(is_deleted=True):
+                return None
+            return self.job_service.enqueue(
+                "movies.purge_collections",
+                uuids=[str(uuid) for uuid in uuids])
+
+        # Movie has no signals or dependents, so the cascade is a single
+        # set based DELETE without loading the movies.
+        collections.delete()
+        return None
+
+    def purge_collection(self, uuid: Any, batch_size: int = None,
+                         on_batch: Callable[[int], None] = None) -> int:
+        """
+        Deletes a soft deleted collection and its movies with set based deletes of at most ``batch_size`` rows, each in its own transaction, so no statement holds locks on the whole collection.
+
+        Args:
+            uuid (Any): The UUID of the collection.
+            batch_size (int, optional): Movies deleted per statement, defaults to ``COLLECTION_PURGE_BATCH_SIZE``.
+            on_batch (Callable[[int], None], optional): Called with the number of movies deleted by each batch.
+
+        Returns:
+            int: The number of movies deleted.
+        """ # noqa
+        if not Collection.all_objects.filter(uuid=uuid,
+                                             is_deleted=True).exists():
+            return 0
+
+        batch_size = batch_size or settings.COLLECTION_PURGE_BATCH_SIZE
+        movies = Movie.objects.filter(collection_id=uuid)
+        purged = 0
+        while True:
+            with transaction.atomic():
+                deleted, _ = Movie.objects.filter(
+                    pk__in=movies.values("pk")[:batch_size]).delete()
+            purged += deleted
+            if on_batch is not None:
+                on_batch(deleted)
+            if deleted < batch_size:
+                break
+
+        Collection.all_objects.filter(uuid=uuid, is_deleted=True).delete()
+        return purged
+
+    def purge_deleted_collections(self, batch_size: int = None,
+                                  limit: int = None) -> int:
+        """
+        Purges collections left soft deleted by the ``deferred`` delete mode.
+
+        Args:
+            batch_size (int, optional): Movies deleted per statement.
+            limit (int, optional): Most collections purged in this call.
+
+        Returns:
+            int: The number of collections purged.
+        """
+        uuids = Collection.all_objects.filter(
+            is_deleted=True).values_list("uuid", flat=True)
+        if limit:
+            uuids = uuids[:limit]
+        uuids = list(uuids)
+        for uuid in uuids:
+            self.purge_collection(uuid, batch_size=batch_size)
+        return len(uuids)
+
+
+class CollectionSummaryService:
+
+    def repair_summaries(self, batch_size: int = 1000) -> Tuple[int, int]:
+        """
+        Recomputes the summary columns of every collection from its movies, ``batch_size`` collections per transaction, and saves the ones that drifted.
+
+        Args:
+            batch_size (int, optional): Collections checked per transaction.
+
+        Returns:
+            Tuple[int, int]: The number of collections checked and repaired.
+        """ # noqa
+        queryset = Collection.objects.only(
+            "uuid", *Collection.SUMMARY_FIELDS).order_by("uuid")
+        checked = repaired = 0
+        last_uuid = None
+        while True:
+            with transaction.atomic():
+                batch = queryset.select_for_update()
+                if last_uuid is not None:
+                    batch = batch.filter(uuid__gt=last_uuid)
+                batch = list(batch[:batch_size])
+                if not batch:
+                    break
+                repaired += self.refresh(batch)
+            checked += len(batch)
+            last_uuid = batch[-1].uuid
+        return checked, repaired
+
+    def refresh(self, collections: List[Collection]) -> int:
+        """
+        Recomputes the summary of ``collections`` with a single query over their movies.
+
+        Args:
+            collections (List[Collection]): Collections with their summary fields loaded.
+
+        Returns:
+            int: The number of collections whose summary changed.
+        """ # noqa
+        genres = {collection.uuid: [] for collection in collections}
+        for collection_id, movie_genres in Movie.objects.filter(
+                collection_id__in=genres).values_list(
+                "collection_id", "genres"):
+            genres[collection_id].append(movie_genres)
+
+        changed = []
+        for collection in collections:
+            summary = [getattr(collection, field)
+                       for field in Collection.SUMMARY_FIELDS]
+            collection.summarize(genres[collection.uuid])
+            if summary != [getattr(collection, field)
+                           for field in Collection.SUMMARY_FIELDS]:
+                changed.append(collection)
+
+        if changed:
+            Collection.objects.bulk_update(changed, Collection.SUMMARY_FIELDS)
+        return len(changed)
+
+
+class BatchCollectionService:
+
+    patch_collection_service = PatchCollectionService()
+    delete_collection_service = DeleteCollectionService()
+
+    def run(self, serializer: object) -> Dict[str, Any]:
+        """
+        Executes a batch of collection operations and reports a result per operation.
+
+        Creates are validated one by one and written with bulk inserts, updates apply
+        ``PatchCollectionService`` in their own savepoint and deletes go through
+        ``DeleteCollectionService``. A failing operation does not affect the others.
+        Must run in a transaction: the updated and deleted collections stay locked until it ends.
+
+        Args:
+            serializer (object): A ``CollectionBatchSerializer`` bound to the batch data.
+
+        Returns:
+            Dict[str, Any]: Whether every operation succeeded and the results in request order.
+
+        Raises:
+            ValidationError: If the batch itself is malformed.
+        """ # noqa
+        serializer.is_valid(raise_exception=True)
+        operations = serializer.validated_data["operations"]
+        results = [None] * len(operations)
+
+        grouped = {"create": [], "update": [], "delete": []}
+        for index, operation in enumerate(operations):
+            grouped[operation["op"]].append((index, operation))
+
+        # Locked in key order like the update and partial_update actions
+        # lock a single collection, so concurrent batches cannot deadlock
+        # and every summary is recomputed under the row lock.
+        targets = Collection.objects.only(
+            "uuid", "title", "description", *Collection.SUMMARY_FIELDS
+        ).select_for_update().order_by("uuid").in_bulk([operation["uuid"]
+                   for index, operation in grouped["update"]
+                   + grouped["delete"]])
+
+        self.create_collections(grouped["create"], results)
+        for index, operation in grouped["update"]:
+            results[index] = self.update_collection(
+                index, operation, targets.get(operation["uuid"]))
+        self.delete_collections(grouped["delete"], targets, results)
+
+        return {
+            "is_success": all(result["status"] < 400 for result in results),
+            "results": results,
+        }
+
+    def create_collections(self, operations: List[Any],
+                           results: List[Dict[str, Any]]) -> None:
+        valid = []
+        for index, operation in operations:
+            serializer = CollectionSerializer(data=operation["data"])
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                results[index] = self.result(
+                    index, "create", 400, error=serializer.errors)
+
+        movie_uuids = [movie_data["uuid"] for index, data in valid
+                       for movie_data in data["movies"]]
+        used = set(Movie.objects.filter(
+            uuid__in=movie_uuids).values_list("uuid", flat=True))
+
+        collections, movies = [], []
+        for index, data in valid:
+            uuids = [movie_data["uuid"] for movie_data in data["movies"]]
+            if used.intersection(uuids) or len(set(uuids)) != len(uuids):
+                results[index] = self.result(index, "create", 400, error={
+                    "movies": ["Some movies already exist."]})
+                continue
+            used.update(uuids)
+
+            collection = Collection(title=data["title"],
+                                    description=data.get("description", ""))
+            collection.summarize(movie_data.get("genres", "")
+                                 for movie_data in data["movies"])
+            collections.append((index, collection))
+            movies.extend(Movie(collection=collection, **movie_data)
+                          for movie_data in data["movies"])
+
+        try:
+            with transaction.atomic():
+                Collection.objects.bulk_create(
+                    [collection for index, collection in collections])
+                Movie.objects.bulk_create(movies)
+        except IntegrityError:
+            # A concurrent writer took a movie UUID, retry one by one so
+            # only the conflicting operations fail.
+            return self.create_one_by_one(collections, movies, results)
+
+        for index, collection in collections:
+            results[index] = self.result(index, "create", 201,
+                                         uuid=collection.uuid)
+
+    def create_one_by_one(self, collections: List[Any], movies: List[Movie],
+                          results: List[Dict[str, Any]]) -> None:
+        for index, collection in collections:
+            try:
+                with transaction.atomic():
+                    collection.save(force_insert=True)
+                    Movie.objects.bulk_create([
+                        movie for movie in movies
+                        if movie.collection is collection])
+            except IntegrityError as e:
+                results[index] = self.result(index, "create", 400,
+                                             error=str(e))
+            else:
+                results[index] = self.result(index, "create", 201,
+                                             uuid=collection.uuid)
+
+    def update_collection(self, index: int, operation: Dict[str, Any],
+                          collection: Collection) -> Dict[str, Any]:
+        if collection is None:
+            return self.result(index, "update", 404, uuid=operation["uuid"],
+                               error="Collection not found.")
+        try:
+            with transaction.atomic():
+                data = self.patch_collection_service.patch_collection(
+                    collection, CollectionPatchSerializer(
+                        data=operation["data"]))
+        except ValidationError as e:
+            return self.result(index, "update", 400, uuid=collection.uuid,
+                               error=e.detail)
+        except IntegrityError as e:
+            return self.result(index, "update", 400, uuid=collection.uuid,
+                               error=str(e))
+        return self.result(index, "update", 200, uuid=collection.uuid,
+                           data=data)
+
+    def delete_collections(self, operations: List[Any],
+                           targets: Dict[Any, Collection],
+                           results: List[Dict[str, Any]]) -> None:
+        job = self.delete_collection_service.delete_collections([
+            operation["uuid"] for index, operation in operations
+            if operation["uuid"] in targets
+        ])
+        for index, operation in operations:
+            if operation["uuid"] in targets and job is not None:
+                # Deferred, like destroy: the purge job can be polled.
+                results[index] = self.result(index, "delete", 202,
+                                             uuid=operation["uuid"],
+                                             job_uuid=job.uuid)
+            elif operation["uuid"] in targets:
+                results[index] = self.result(index, "delete", 204,
+                                             uuid=operation["uuid"])
+            else:
+                results[index] = self.result(
+                    index, "delete", 404, uuid=operation["uuid"],
+                    error="Collection not found.")
+
+    @staticmethod
+    def result(index: int, op: str, status: int, **extra) -> Dict[str, Any]:
+        return {"index": index, "op": op, "status": status, **extra}
@@ -1,17 +1,39 @@
+import gzip
+import json
+import uuid
+from io import StringIO
 from unittest.mock import patch
 
+import msgpack
 import requests
+from api.jobs.registry import job
+from api.jobs.services import JobService
+from config.db.routers import (PrimaryReplicaRouter, has_recent_write,
+                               pin_to_primary, unpin)
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
-from django.test import TestCase
-from rest_framework.test import APITestCase
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import (RequestFactory, SimpleTestCase, TestCase,
+                         TransactionTestCase, override_settings)
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase, APITransactionTestCase
 from django.urls import reverse
 from factories.factories import CollectionFactory, MovieFactory
+from factories.testcases import AuthenticatedTestMixin
 from requests.models import Response
 from rest_framework import status
 
-from ..models import Collection
+from ..models import Collection, Movie
+from ..page_cache import MoviePageCache, PagePrefetcher, RateBudget
 from ..serializers import CollectionSerializer
-from ..services import MovieListService, UpdateCollectionService
+from ..upstream import (UpstreamSchemaError, get_upstream_rate_limiter,
+                        split_page)
+from ..services import (CollectionSummaryService, DeleteCollectionService,
+                        MovieListService, UpdateCollectionService)
+from ..views import CollectionViewSet
 
 
 class MovieListServiceTest(TestCase):
@@ -156,6 +178,223 @@ class MovieListServiceTest(TestCase):
         self.assertEqual(response['previous'], "http://testserver/movies/?page=1")
 
 
+class MovieListParsingTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get('/movies/', {'page': '2'})
+        self.body = (b'{"count": 2, "next": "/?page=3", "previous": "/?page=1", '
+                     b'"results": [{"title": "Movie \\u00e9", "genres": "Drama"}]}')
+
+    def test_invalid_page_schema_raises(self):
+        for body in (b'[]', b'{"next": 3, "results": []}',
+                     b'{"results": [{"id": 1}]}', b'not json'):
+            with self.assertRaises(UpstreamSchemaError):
+                MovieListService.build_response(body, 1, self.request)
+
+    def test_error_body_that_is_not_json(self):
+        api_response = Response()
+        api_response.status_code = 502
+        api_response._content = b'<html>Bad Gateway</html>'
+
+        with self.assertRaises(requests.exceptions.HTTPError) as raised:
+            MovieListService.extract_validated_data(
+                api_response, 1, self.request)
+        self.assertEqual(str(raised.exception), "An error occurred")
+        self.assertEqual(raised.exception.response.status_code, 502)
+
+    @override_settings(MOVIE_LIST_PASSTHROUGH=True)
+    def test_passthrough_rewrites_links_only(self):
+        body, envelope = MovieListService.build_response(
+            self.body, 2, self.request)
+
+        self.assertIsInstance(body, bytes)
+        self.assertTrue(body.endswith(
+            b'"results": [{"title": "Movie \\u00e9", "genres": "Drama"}]}'))
+        self.assertEqual(json.loads(body), {
+            "count": 2,
+            "next": "http://testserver/movies/?page=3",
+            "previous": "http://testserver/movies/?page=1",
+            "results": [{"title": "Movie \u00e9", "genres": "Drama"}],
+        })
+        self.assertEqual(envelope["next"], "/?page=3")
+
+    @override_settings(MOVIE_LIST_PASSTHROUGH=True, MOVIE_PAGE_CACHE_TIMEOUT=60)
+    def test_passthrough_rejects_malformed_page_before_caching(self):
+        api_response = Response()
+        api_response.status_code = 200
+        api_response._content = (b'{"next": null, "previous": null, '
+                                 b'"results": [{"title": "Mov')
+
+        with self.assertRaises(UpstreamSchemaError):
+            MovieListService.extract_validated_data(
+                api_response, 1, self.request)
+        self.assertIsNone(MovieListService.page_cache.get(1))
+
+    @override_settings(MOVIE_LIST_PASSTHROUGH=True)
+    def test_passthrough_falls_back_to_decoding(self):
+        body = b'{"results": [{"title": "Movie"}], "next": null, "previous": null}'
+        self.assertIsNone(split_page(body))
+        self.assertEqual(
+            MovieListService.build_response(body, 1, self.request)[0],
+            {"results": [{"title": "Movie"}], "next": None, "previous": None})
+
+
+class ImmediateExecutor:
+
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+def upstream_page(page):
+    response = Response()
+    response.status_code = 200
+    response._content = (
+        b'{"next": "/?page=%d", "previous": null, "results": []}'
+        % (page + 1))
+    return response
+
+
+@override_settings(MOVIE_PAGE_CACHE_TIMEOUT=60, MOVIE_PREFETCH_PAGES=3)
+@patch.object(PagePrefetcher, 'executor', ImmediateExecutor())
+class MoviePagePrefetchTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get('/movies/', {'page': '1'})
+
+    @patch('api.utils.api_client.APIClient.get')
+    def test_served_pages_are_cached(self, mock_get):
+        mock_get.side_effect = lambda endpoint: upstream_page(
+            int(endpoint.rsplit('=', 1)[1]))
+        with patch.object(PagePrefetcher, 'schedule') as schedule:
+            first = MovieListService().get_list(self.request)
+            second = MovieListService().get_list(self.request)
+
+        self.assertEqual(first, second)
+        self.assertEqual(second['next'], 'http://testserver/movies/?page=2')
+        self.assertEqual(mock_get.call_count, 1)
+        schedule.assert_called_with(1)
+
+    @patch('api.utils.api_client.APIClient.get')
+    def test_next_pages_are_prefetched(self, mock_get):
+        mock_get.side_effect = lambda endpoint: upstream_page(
+            int(endpoint.rsplit('=', 1)[1]))
+        with patch.object(PagePrefetcher, 'budget', RateBudget(100, 10)):
+            MovieListService().get_list(self.request)
+
+        page_cache = MoviePageCache()
+        self.assertTrue(all(page_cache.has(page) for page in (1, 2, 3, 4)))
+        self.assertEqual(mock_get.call_count, 4)
+
+        # Cached pages are not fetched again.
+        with patch.object(PagePrefetcher, 'budget', RateBudget(100, 10)):
+            self.assertEqual(PagePrefetcher().schedule(2), 1)
+
+    @patch('api.utils.api_client.APIClient.get')
+    def test_prefetch_stays_within_rate_budget(self, mock_get):
+        mock_get.side_effect = lambda endpoint: upstream_page(
+            int(endpoint.rsplit('=', 1)[1]))
+        with patch.object(PagePrefetcher, 'budget', RateBudget(0, 1)):
+            self.assertEqual(PagePrefetcher().schedule(1), 1)
+            self.assertEqual(PagePrefetcher().schedule(5), 0)
+        self.assertEqual(mock_get.call_count, 1)
+
+
+@override_settings(MOVIE_API_RATE=0.1, MOVIE_API_BURST=1,
+                   MOVIE_API_MAX_WAIT=0)
+class MovieListRateLimitTest(AuthenticatedTestMixin, APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        super().setUp()
+
+    @patch('requests.Session.get')
+    def test_rate_limited_upstream_returns_503(self, session_get):
+        session_get.return_value = upstream_page(1)
+        get_upstream_rate_limiter().try_acquire()
+
+        response = self.client.get(reverse('movies'))
+        self.assertEqual(response.status_code,
+                         status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        session_get.assert_not_called()
+
+        metrics = self.client.get(reverse('metrics')).data
+        self.assertEqual(metrics['rate_limiters']['movie-api']['rejected'], 1)
+
+
+class MovieListViewTest(AuthenticatedTestMixin, APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        super().setUp()
+
+    @patch('requests.Session.get')
+    def test_invalid_upstream_page_returns_502(self, session_get):
+        response = Response()
+        response.status_code = 200
+        response._content = b'{"results": "none"}'
+        session_get.return_value = response
+
+        response = self.client.get(reverse('movies'))
+        self.assertEqual(response.status_code, status.HTTP_502_BAD_GATEWAY)
+
+    @override_settings(COMPRESSION_ENCODINGS=['gzip'])
+    @patch('requests.Session.get')
+    def test_response_is_compressed(self, session_get):
+        movies = [{'title': f'Movie {i}'} for i in range(50)]
+        upstream = Response()
+        upstream.status_code = 200
+        upstream._content = json.dumps({
+            'next': None, 'previous': None, 'results': movies}).encode()
+        session_get.return_value = upstream
+
+        response = self.client.get(reverse('movies'),
+                                   HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.content)),
+                         {'next': None, 'previous': None, 'results': movies})
+
+    @override_settings(MOVIE_LIST_PASSTHROUGH=True)
+    @patch('requests.Session.get')
+    def test_passthrough_response(self, session_get):
+        session_get.return_value = upstream_page(1)
+
+        response = self.client.get(reverse('movies'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json(), {
+            'next': 'http://testserver/movies/?page=2',
+            'previous': None,
+            'results': [],
+        })
+
+
+class CollectionThrottleTest(AuthenticatedTestMixin, APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        super().setUp()
+
+    def test_writes_are_throttled_reads_are_not(self):
+        rates = {'user': None, 'movies': None, 'collections-write': '2/min'}
+        with override_settings(REST_FRAMEWORK={
+                'DEFAULT_AUTHENTICATION_CLASSES': [
+                    'api.user_auth.authentication.StatelessJWTAuthentication'],
+                'DEFAULT_THROTTLE_RATES': rates}):
+            statuses = [self.client.post(
+                reverse('collection-list'),
+                {'title': 'Title', 'description': 'Description',
+                 'movies': []}, format='json').status_code
+                for _ in range(3)]
+            self.assertEqual(statuses, [status.HTTP_201_CREATED] * 2
+                             + [status.HTTP_429_TOO_MANY_REQUESTS])
+            self.assertEqual(
+                self.client.get(reverse('collection-list')).status_code,
+                status.HTTP_200_OK)
+
+
 class ListCollectionsServiceTest(TestCase):
     def setUp(self):
         self.collection = CollectionFactory()
@@ -258,17 +497,10 @@ class UpdateCollectionServiceTest(TestCase):
         self.assertEqual(updated_collection['movies'][0]['title'], "Movie 1")
 
 
-class DeleteCollectionTest(APITestCase):
+class DeleteCollectionTest(AuthenticatedTestMixin, APITestCase):
 
     def setUp(self):
-
-        self.username = 'username'
-        self.password = 'password'
-        token_url = reverse('register')
-        response = self.client.post(token_url, {'username': self.username,
-                                                'password': self.password})
-        self.token = response.data['access']
-        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.token)
+        super().setUp()
 
         self.collection = CollectionFactory.create()
 
@@ -285,6 +517,34 @@ class DeleteCollectionTest(APITestCase):
         self.assertFalse(Collection.objects.filter(
             uuid=self.collection.uuid).exists())
 
+    def test_delete_purges_movies_in_batches(self):
+        MovieFactory.create_batch(5, collection=self.collection)
+        # Only soft deleted collections are purged.
+        self.assertEqual(DeleteCollectionService().purge_collection(
+            self.collection.uuid, batch_size=2), 0)
+
+        Collection.objects.filter(uuid=self.collection.uuid).update(
+            is_deleted=True)
+        with CaptureQueriesContext(connection) as queries:
+            purged = DeleteCollectionService().purge_collection(
+                self.collection.uuid, batch_size=2)
+        self.assertEqual(purged, 5)
+        movie_deletes = [query for query in queries
+                         if query['sql'].startswith(
+                             'DELETE FROM "movies_movie"')]
+        # Three batches, then the cascade of the collection row finds none.
+        self.assertEqual(len(movie_deletes), 4)
+        self.assertFalse(Collection.all_objects.filter(
+            uuid=self.collection.uuid).exists())
+
+    def test_purge_deleted_collections_command(self):
+        MovieFactory.create_batch(2, collection=self.collection)
+        Collection.objects.filter(uuid=self.collection.uuid).update(
+            is_deleted=True)
+        call_command('purge_deleted_collections', stdout=StringIO())
+        self.assertFalse(Collection.all_objects.exists())
+        self.assertFalse(Movie.objects.exists())
+
     def test_delete_invalid_collection(self):
         # Generate an invalid UUID that doesn't correspond to any collection
         invalid_uuid = '12345678-1234-5678-1234-567812345679'
@@ -293,4 +553,563 @@ class DeleteCollectionTest(APITestCase):
         response = self.client.delete(url)
 
         # Check that the response status is 404 Not Found
-        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class DeferredDeleteTest(AuthenticatedTestMixin, APITransactionTestCase):
+
+    # run_jobs closes stale connections between jobs, which would close the
+    # connection holding an APITestCase's transaction.
+    def setUp(self):
+        super().setUp()
+        self.collection = CollectionFactory()
+        self.url = reverse('collection-detail',
+                           kwargs={'pk': self.collection.uuid})
+
+    @override_settings(COLLECTION_DELETE_MODE='deferred')
+    def test_deferred_delete(self):
+        MovieFactory.create_batch(3, collection=self.collection)
+        response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        self.assertFalse(Collection.objects.filter(
+            uuid=self.collection.uuid).exists())
+        self.assertEqual(self.client.get(self.url).status_code,
+                         status.HTTP_404_NOT_FOUND)
+        self.assertEqual(Movie.objects.filter(
+            collection_id=self.collection.uuid).count(), 3)
+
+        call_command('run_jobs', '--once', stdout=StringIO())
+        job = self.client.get(reverse(
+            'job-detail', kwargs={'pk': response.data['job_uuid']}))
+        self.assertEqual(job.data['status'], 'succeeded')
+        self.assertEqual(job.data['result'], {'movies_purged': 3})
+        self.assertFalse(Collection.all_objects.filter(
+            uuid=self.collection.uuid).exists())
+        self.assertFalse(Movie.objects.filter(
+            collection_id=self.collection.uuid).exists())
+
+
+@override_settings(DATABASE_REPLICA_ALIASES=['replica_0'])
+class PrimaryReplicaRouterTest(SimpleTestCase):
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    def test_reads_go_to_replica(self):
+        self.assertEqual(self.router.db_for_read(Collection), 'replica_0')
+
+    def test_writes_go_to_primary(self):
+        self.assertEqual(self.router.db_for_write(Collection), 'default')
+
+    def test_pinned_reads_go_to_primary(self):
+        token = pin_to_primary()
+        try:
+            self.assertEqual(self.router.db_for_read(Collection), 'default')
+        finally:
+            unpin(token)
+
+    def test_other_apps_read_from_primary(self):
+        self.assertEqual(self.router.db_for_read(User), 'default')
+
+
+@job('tests.read_alias')
+def read_alias(job):
+    return PrimaryReplicaRouter().db_for_read(Collection)
+
+
+@override_settings(DATABASE_REPLICA_ALIASES=['replica_0'])
+class JobReadRoutingTest(TransactionTestCase):
+
+    # Outside a test transaction, so reads are not kept on the primary by
+    # an open atomic block.
+    def test_jobs_read_from_primary(self):
+        job_service = JobService()
+        job_service.enqueue(read_alias)
+        self.assertEqual(job_service.run(job_service.claim()).result,
+                         'default')
+        self.assertEqual(PrimaryReplicaRouter().db_for_read(Collection),
+                         'replica_0')
+
+
+@override_settings(DATABASE_REPLICA_ALIASES=['replica_0'])
+class ReadYourWritesTest(AuthenticatedTestMixin, APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        super().setUp()
+        self.user = User.objects.get(username=self.username)
+
+    def test_write_makes_user_sticky_to_primary(self):
+        self.assertFalse(has_recent_write(self.user.pk))
+        response = self.client.post(reverse('collection-list'), {
+            'title': 'Collection', 'description': 'Description',
+            'movies': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(has_recent_write(self.user.pk))
+
+
+class CollectionQueryCountTest(AuthenticatedTestMixin, APITestCase):
+
+    def count_queries(self, method, movie_count):
+        collection = CollectionFactory()
+        movies = MovieFactory.create_batch(movie_count, collection=collection)
+        url = reverse('collection-detail', kwargs={'pk': collection.uuid})
+        payload = {
+            'title': 'Updated', 'description': 'Updated description',
+            'movies': [{'uuid': str(movie.uuid), 'title': 'Updated movie',
+                        'description': 'Updated', 'genres': 'Drama'}
+                       for movie in movies],
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, payload,
+                                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['movies']), movie_count)
+        return len(queries)
+
+    def test_retrieve_uses_constant_queries(self):
+        self.count_queries('get', 1)
+        self.assertEqual(self.count_queries('get', 2),
+                         self.count_queries('get', 20))
+
+    def test_update_uses_constant_queries(self):
+        self.count_queries('put', 1)
+        self.assertEqual(self.count_queries('put', 2),
+                         self.count_queries('put', 20))
+
+    def test_update_unknown_movie(self):
+        collection = CollectionFactory()
+        url = reverse('collection-detail', kwargs={'pk': collection.uuid})
+        response = self.client.put(url, {
+            'title': 'Updated', 'description': 'Updated description',
+            'movies': [{'uuid': str(MovieFactory().uuid), 'title': 'Movie',
+                        'description': 'Movie', 'genres': 'Drama'}],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class PartialUpdateCollectionTest(AuthenticatedTestMixin, APITestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.collection = CollectionFactory(title='Collection')
+        self.movies = MovieFactory.create_batch(
+            3, collection=self.collection, genres='Action')
+        self.url = reverse('collection-detail',
+                           kwargs={'pk': self.collection.uuid})
+
+    def test_rename_only(self):
+        response = self.client.patch(self.url, {'title': 'Renamed'},
+                                     format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.title, 'Renamed')
+        self.assertEqual(self.collection.movies.count(), 3)
+
+    def test_add_update_and_remove_movies(self):
+        new_uuid = '12345678-1234-5678-1234-567812345678'
+        response = self.client.patch(self.url, {'movies': [
+            {'op': 'add', 'uuid': new_uuid, 'title': 'New movie'},
+            {'uuid': str(self.movies[0].uuid), 'genres': 'Drama'},
+            {'uuid': str(self.movies[1].uuid), 'genres': 'Action'},
+            {'op': 'remove', 'uuid': str(self.movies[2].uuid)},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['movies'], {
+            'added': [new_uuid],
+            'updated': [str(self.movies[0].uuid)],
+            'removed': [str(self.movies[2].uuid)],
+        })
+        self.assertEqual(
+            dict(self.collection.movies.values_list('uuid', 'genres')), {
+                self.movies[0].uuid: 'Drama',
+                self.movies[1].uuid: 'Action',
+                uuid.UUID(new_uuid): '',
+            })
+
+    def test_unchanged_movies_are_not_written(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, {'movies': [
+                {'uuid': str(movie.uuid), 'genres': 'Action'}
+                for movie in self.movies]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['movies']['updated'], [])
+        self.assertFalse(any(query['sql'].startswith('UPDATE')
+                             for query in queries))
+
+    def test_unknown_movie_rolls_back(self):
+        response = self.client.patch(self.url, {
+            'title': 'Renamed',
+            'movies': [{'uuid': '12345678-1234-5678-1234-567812345679',
+                        'title': 'Missing'}],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.title, 'Collection')
+
+    def test_add_requires_title(self):
+        response = self.client.patch(self.url, {'movies': [
+            {'op': 'add', 'uuid': '12345678-1234-5678-1234-567812345678'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unknown_collection_is_not_found(self):
+        url = reverse('collection-detail', kwargs={'pk': uuid.uuid4()})
+        response = self.client.patch(url, {'title': 'Renamed'},
+                                     format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class BatchCollectionTest(AuthenticatedTestMixin, APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('collection-batch')
+        self.collection = CollectionFactory(title='Collection')
+        self.movie = MovieFactory(collection=self.collection)
+
+    def create_operation(self, movies=2):
+        return {'op': 'create', 'data': {
+            'title': 'Batch', 'description': 'Batch collection',
+            'movies': [{'uuid': str(uuid.uuid4()), 'title': 'Movie',
+                        'description': 'Movie', 'genres': 'Drama'}
+                       for _ in range(movies)],
+        }}
+
+    def test_mixed_operations(self):
+        doomed = CollectionFactory()
+        response = self.client.post(self.url, {'operations': [
+            self.create_operation(),
+            {'op': 'update', 'uuid': str(self.collection.uuid),
+             'data': {'title': 'Renamed'}},
+            {'op': 'delete', 'uuid': str(doomed.uuid)},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['is_success'])
+        self.assertEqual([result['status'] for result in
+                          response.data['results']], [201, 200, 204])
+        created = Collection.objects.get(
+            uuid=response.data['results'][0]['uuid'])
+        self.assertEqual(created.movies.count(), 2)
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.title, 'Renamed')
+        self.assertFalse(Collection.objects.filter(uuid=doomed.uuid).exists())
+
+    @override_settings(COLLECTION_DELETE_MODE='deferred')
+    def test_deferred_deletes_return_the_purge_job(self):
+        doomed = CollectionFactory()
+        response = self.client.post(self.url, {'operations': [
+            {'op': 'delete', 'uuid': str(doomed.uuid)},
+            {'op': 'delete', 'uuid': str(self.collection.uuid)},
+        ]}, format='json')
+
+        results = response.data['results']
+        self.assertEqual([result['status'] for result in results],
+                         [202, 202])
+        self.assertEqual(results[0]['job_uuid'], results[1]['job_uuid'])
+        job = self.client.get(reverse(
+            'job-detail', kwargs={'pk': results[0]['job_uuid']}))
+        self.assertEqual(job.status_code, status.HTTP_200_OK)
+
+    def test_failed_operation_does_not_affect_others(self):
+        duplicate = self.create_operation()
+        duplicate['data']['movies'][0]['uuid'] = str(self.movie.uuid)
+        response = self.client.post(self.url, {'operations': [
+            duplicate,
+            {'op': 'update', 'uuid': str(self.collection.uuid),
+             'data': {'movies': [{'op': 'remove',
+                                  'uuid': str(uuid.uuid4())}]}},
+            {'op': 'delete', 'uuid': str(uuid.uuid4())},
+            self.create_operation(),
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['is_success'])
+        self.assertEqual([result['status'] for result in
+                          response.data['results']], [400, 400, 404, 201])
+        self.assertEqual(Collection.objects.count(), 2)
+        self.assertTrue(Collection.objects.filter(
+            uuid=self.movie.collection_id).exists())
+
+    def test_creates_use_constant_queries(self):
+        def count_queries(operations):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.url, {
+                    'operations': operations}, format='json')
+            self.assertTrue(response.data['is_success'])
+            return len(queries)
+
+        count_queries([self.create_operation()])
+        self.assertEqual(
+            count_queries([self.create_operation() for _ in range(2)]),
+            count_queries([self.create_operation() for _ in range(20)]))
+
+    @override_settings(BATCH_MAX_OPERATIONS=2)
+    def test_too_many_operations(self):
+        response = self.client.post(self.url, {'operations': [
+            self.create_operation() for _ in range(3)]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Collection.objects.count(), 1)
+
+    def test_collection_may_appear_once(self):
+        response = self.client.post(self.url, {'operations': [
+            {'op': 'update', 'uuid': str(self.collection.uuid),
+             'data': {'title': 'Renamed'}},
+            {'op': 'delete', 'uuid': str(self.collection.uuid)},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CollectionLockTest(AuthenticatedTestMixin, APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.collection = CollectionFactory()
+        self.movie = MovieFactory(collection=self.collection, genres='Drama')
+        self.url = reverse('collection-detail',
+                           kwargs={'pk': self.collection.uuid})
+
+    def locked_models(self, method, url, payload):
+        with patch.object(QuerySet, 'select_for_update', autospec=True,
+                          side_effect=QuerySet.select_for_update) as lock:
+            response = getattr(self.client, method)(url, payload,
+                                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [call.args[0].model for call in lock.call_args_list]
+
+    def test_update_locks_the_collection(self):
+        self.assertEqual(self.locked_models('put', self.url, {
+            'title': 'Title', 'description': 'Description',
+            'movies': [{'uuid': str(self.movie.uuid), 'title': 'Movie',
+                        'description': 'Plot', 'genres': 'Horror'}],
+        }), [Collection])
+
+    def test_partial_update_locks_the_collection(self):
+        self.assertEqual(self.locked_models('patch', self.url, {
+            'movies': [{'op': 'update', 'uuid': str(self.movie.uuid),
+                        'genres': 'Horror'}],
+        }), [Collection])
+
+    def test_batch_locks_the_collections(self):
+        self.assertEqual(self.locked_models(
+            'post', reverse('collection-batch'), {'operations': [
+                {'op': 'update', 'uuid': str(self.collection.uuid),
+                 'data': {'title': 'Renamed'}},
+            ]}), [Collection])
+
+
+class MessagePackTest(AuthenticatedTestMixin, APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        super().setUp()
+
+    def test_create_and_retrieve(self):
+        payload = {'title': 'Title', 'description': 'Description',
+                   'movies': [{'uuid': str(uuid.uuid4()), 'title': 'Movie',
+                               'description': 'Plot', 'genres': 'Drama'}]}
+        response = self.client.post(
+            reverse('collection-list'), msgpack.packb(payload),
+            content_type='application/msgpack',
+            HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        collection_uuid = msgpack.unpackb(response.content)['collection_uuid']
+
+        response = self.client.get(
+            reverse('collection-detail', kwargs={'pk': collection_uuid}),
+            HTTP_ACCEPT='application/msgpack')
+        data = msgpack.unpackb(response.content)
+        self.assertEqual(data['title'], 'Title')
+        self.assertEqual(data['movies'][0]['genres'], 'Drama')
+
+        # The list holds UUIDs from a values() queryset.
+        response = self.client.get(reverse('collection-list'),
+                                   HTTP_ACCEPT='application/msgpack')
+        collections = msgpack.unpackb(response.content)['data']['collections']
+        self.assertEqual(collections[0]['uuid'], collection_uuid)
+
+    @override_settings(MOVIE_LIST_PASSTHROUGH=True)
+    @patch('requests.Session.get')
+    def test_movie_list_passthrough(self, session_get):
+        session_get.return_value = upstream_page(1)
+
+        response = self.client.get(reverse('movies'),
+                                   HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content), {
+            'next': 'http://testserver/movies/?page=2',
+            'previous': None,
+            'results': [],
+        })
+
+
+class CollectionSummaryTest(AuthenticatedTestMixin, APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        super().setUp()
+
+    def movie(self, genres):
+        return {'uuid': str(uuid.uuid4()), 'title': 'Movie',
+                'description': 'Plot', 'genres': genres}
+
+    def create(self, *genres):
+        response = self.client.post(reverse('collection-list'), {
+            'title': 'Title', 'description': 'Description',
+            'movies': [self.movie(movie_genres) for movie_genres in genres],
+        }, format='json')
+        return Collection.objects.get(uuid=response.data['collection_uuid'])
+
+    def assertSummary(self, collection, movie_count, top_genres):
+        collection.refresh_from_db()
+        self.assertEqual(collection.movie_count, movie_count)
+        self.assertEqual(collection.top_genres, top_genres)
+
+    def test_create_update_and_patch_keep_summary(self):
+        collection = self.create('Drama, Comedy', 'Drama', 'Horror')
+        self.assertSummary(collection, 3, ['Drama', 'Comedy', 'Horror'])
+        self.assertEqual(collection.genre_counts,
+                         {'Drama': 2, 'Comedy': 1, 'Horror': 1})
+
+        url = reverse('collection-detail', kwargs={'pk': collection.uuid})
+        movies = list(collection.movies.all())
+        self.client.put(url, {
+            'title': 'Title', 'description': 'Description',
+            'movies': [{'uuid': str(movie.uuid), 'title': movie.title,
+                        'description': movie.description,
+                        'genres': 'Western'} for movie in movies],
+        }, format='json')
+        self.assertSummary(collection, 3, ['Western'])
+
+        self.client.patch(url, {'movies': [
+            {'op': 'remove', 'uuid': str(movies[0].uuid)},
+            {'op': 'add', **self.movie('Action, Western')},
+        ]}, format='json')
+        self.assertSummary(collection, 3, ['Western', 'Action'])
+
+    def test_patch_adjusts_summary_without_reading_other_movies(self):
+        collection = self.create('Drama, Comedy', 'Drama', 'Horror', 'Horror')
+        drama = collection.movies.get(genres='Drama')
+        horror = collection.movies.filter(genres='Horror').first()
+
+        url = reverse('collection-detail', kwargs={'pk': collection.uuid})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(url, {'movies': [
+                {'op': 'remove', 'uuid': str(drama.uuid)},
+                {'uuid': str(horror.uuid), 'genres': 'Comedy'},
+                {'op': 'add', **self.movie('Western')},
+            ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Only the patched movies are read.
+        movie_reads = [query['sql'] for query in queries
+                       if query['sql'].startswith('SELECT')
+                       and Movie._meta.db_table in query['sql']]
+        self.assertTrue(movie_reads)
+        self.assertTrue(all(' IN (' in sql for sql in movie_reads))
+
+        self.assertSummary(collection, 4, ['Comedy', 'Drama', 'Horror'])
+        recount = Collection()
+        recount.summarize(collection.movies.values_list('genres', flat=True))
+        self.assertEqual(collection.genre_counts, recount.genre_counts)
+
+    def test_new_rows_get_time_ordered_keys(self):
+        first = self.create('Drama')
+        second = self.create('Drama')
+        self.assertEqual(first.uuid.version, 7)
+        self.assertLess(first.uuid, second.uuid)
+
+    def test_batch_create_keeps_summary(self):
+        response = self.client.post(reverse('collection-batch'), {
+            'operations': [{'op': 'create', 'data': {
+                'title': 'Title', 'movies': [self.movie('Drama')]}}],
+        }, format='json')
+        collection = Collection.objects.get(
+            uuid=response.data['results'][0]['uuid'])
+        self.assertSummary(collection, 1, ['Drama'])
+
+    def test_list_reads_only_the_summary(self):
+        self.create('Drama, Comedy', 'Drama')
+        self.create('Comedy', 'Comedy, Horror')
+        self.client.get(reverse('collection-list'))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('collection-list'))
+        self.assertFalse(any('movies_movie' in query['sql']
+                             for query in queries))
+        data = response.data['data']
+        self.assertEqual(data['favourite_genres'][:2], ['Comedy', 'Drama'])
+        self.assertEqual(
+            sorted((collection['movie_count'], collection['top_genres'])
+                   for collection in data['collections']),
+            [(2, ['Comedy', 'Horror']), (2, ['Drama', 'Comedy'])])
+        self.assertNotIn('genre_counts', data['collections'][0])
+
+    def test_repair_command(self):
+        collection = CollectionFactory()
+        MovieFactory(collection=collection, genres='Drama, Comedy')
+        MovieFactory(collection=collection, genres='Drama')
+        healthy = self.create('Horror')
+
+        out = StringIO()
+        call_command('repair_collection_summaries', '--batch-size', '1',
+                     stdout=out)
+        self.assertEqual(out.getvalue().strip(),
+                         'Checked 2 collections, repaired 1')
+        self.assertSummary(collection, 2, ['Drama', 'Comedy'])
+        self.assertSummary(healthy, 1, ['Horror'])
+
+
+class MovieIndexTest(TestCase):
+
+    def setUp(self):
+        self.collection = CollectionFactory()
+        MovieFactory.create_batch(5, collection=self.collection)
+        MovieFactory.create_batch(5)
+
+    def explain_movie_queries(self, run):
+        """
+        Runs ``run`` and returns the plan of each movie query it executed.
+        """
+        if connection.vendor == 'postgresql':
+            # Tiny test tables are cheaper to scan, only check the index
+            # can be used.
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        with CaptureQueriesContext(connection) as queries:
+            run()
+        sqls = [query['sql'] for query in queries
+                if 'FROM "movies_movie"' in query['sql']]
+        self.assertTrue(sqls)
+        plans = []
+        with connection.cursor() as cursor:
+            for sql in sqls:
+                cursor.execute(
+                    f'{connection.ops.explain_query_prefix()} {sql}')
+                plans.append('\n'.join(str(row) for row in cursor.fetchall()))
+        return plans
+
+    def assertUsesIndex(self, plan, index):
+        self.assertIn(index, plan)
+        # No full scan and no separate sort step.
+        for step in ('SCAN movies_movie', 'Seq Scan', 'TEMP B-TREE', 'Sort'):
+            self.assertNotIn(step, plan)
+
+    def test_retrieve_loads_movies_in_title_order(self):
+        view = CollectionViewSet(action='retrieve')
+        plans = self.explain_movie_queries(
+            lambda: view.get_queryset().get(pk=self.collection.uuid))
+        self.assertEqual(len(plans), 1)
+        self.assertUsesIndex(plans[0], 'movie_collection_title_idx')
+
+    def test_summary_refresh(self):
+        collections = list(Collection.objects.filter(
+            pk__in=[self.collection.uuid, CollectionFactory().uuid]))
+        plans = self.explain_movie_queries(
+            lambda: CollectionSummaryService().refresh(collections))
+        self.assertEqual(len(plans), 1)
+        self.assertUsesIndex(plans[0], 'movie_collection_title_idx')
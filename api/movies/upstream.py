@@ -0,0 +1,130 @@
+from typing import Any, Dict, Optional, Tuple
+
+from api.utils import fast_json
+from api.utils.api_client import APIClient
+from api.utils.rate_limiter import TokenBucketRateLimiter, get_rate_limiter
+from django.conf import settings
+
+# Where the movies start in a page laid out like the upstream's, with the
+# ``count``, ``next`` and ``previous`` envelope first.
+RESULTS_KEY = b'"results":'
+
+
+class UpstreamSchemaError(ValueError):
+
+    """Raised when the upstream body is not a page of movies."""
+
+
+def get_upstream_rate_limiter() -> Optional[TokenBucketRateLimiter]:
+    """
+    Returns the limiter shared by every worker calling ``MOVIE_API``.
+
+    Returns:
+        Optional[TokenBucketRateLimiter]: None while ``MOVIE_API_RATE`` is 0.
+    """
+    if settings.MOVIE_API_RATE <= 0:
+        return None
+    return get_rate_limiter("movie-api", settings.MOVIE_API_RATE,
+                            settings.MOVIE_API_BURST)
+
+
+def get_upstream_client(rate_limited: bool = True):
+    """
+    Builds a client for ``MOVIE_API``.
+
+    Args:
+        rate_limited (bool, optional): Pace requests with the shared limiter.
+            Pass False when a token was already taken for the request.
+
+    Returns:
+        APIClient: The client.
+    """
+    return APIClient(
+        base_url=settings.MOVIE_API,
+        username=settings.MOVIE_API_USERNAME,
+        password=settings.MOVIE_API_PASSWORD,
+        rate_limiter=get_upstream_rate_limiter() if rate_limited else None,
+        max_wait=settings.MOVIE_API_MAX_WAIT,
+    )
+
+
+def decode_page(body: bytes) -> Dict[str, Any]:
+    """
+    Decodes an upstream page in a single pass and validates its schema.
+
+    Args:
+        body (bytes): The upstream response body.
+
+    Returns:
+        Dict[str, Any]: The page.
+
+    Raises:
+        UpstreamSchemaError: If the body is not a valid page of movies.
+    """
+    try:
+        data = fast_json.loads(body)
+    except ValueError as e:
+        raise UpstreamSchemaError(f"Upstream page is not valid JSON: {e}")
+
+    validate_envelope(data)
+    if not isinstance(data.get("results"), list) or not all(
+            isinstance(movie, dict) and isinstance(movie.get("title"), str)
+            for movie in data["results"]):
+        raise UpstreamSchemaError("Upstream page has malformed results")
+    return data
+
+
+def validate_envelope(data: Any) -> None:
+    """Checks the pagination fields of a decoded page."""
+    if not isinstance(data, dict):
+        raise UpstreamSchemaError("Upstream page is not a JSON object")
+    for link in ("next", "previous"):
+        if not isinstance(data.get(link), (str, type(None))):
+            raise UpstreamSchemaError(f"Upstream page has an invalid {link}")
+    count = data.get("count")
+    if count is not None and (
+            not isinstance(count, int) or isinstance(count, bool)):
+        raise UpstreamSchemaError("Upstream page has an invalid count")
+
+
+def split_page(body: bytes) -> Optional[Tuple[Dict[str, Any], bytes]]:
+    """
+    Splits an upstream page into its decoded envelope and the raw bytes
+    from the ``results`` array on, without decoding the movies.
+
+    Args:
+        body (bytes): The upstream response body.
+
+    Returns:
+        Optional[Tuple[Dict[str, Any], bytes]]: The envelope and the rest
+            of the body, or None when the page is not laid out with the
+            ``next`` and ``previous`` links ahead of ``results``.
+
+    Raises:
+        UpstreamSchemaError: If the envelope is invalid.
+    """
+    start = body.find(RESULTS_KEY)
+    if start == -1:
+        return None
+    rest = body[start + len(RESULTS_KEY):]
+    if not rest.lstrip().startswith(b"["):
+        return None
+    try:
+        envelope = fast_json.loads(body[:start] + b'"results":[]}')
+    except ValueError:
+        return None
+    if not isinstance(envelope, dict) or not {"next", "previous"} <= set(
+            envelope):
+        return None
+
+    validate_envelope(envelope)
+    del envelope["results"]
+    return envelope, rest
+
+
+def join_page(envelope: Dict[str, Any], rest: bytes) -> bytes:
+    """
+    Encodes ``envelope`` and appends the raw ``results`` from
+    :func:`split_page`.
+    """
+    return fast_json.dumps(envelope)[:-1] + b',' + RESULTS_KEY + rest
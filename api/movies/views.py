@@ -1,31 +1,74 @@
+import math
+
 import requests
+from api.user_auth.authentication import StatelessJWTAuthentication
+from api.utils.api_client import UpstreamRateLimited
+from api.utils.renderers import MessagePackParser, MessagePackRenderer
+from django.conf import settings
 from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
+from django.http import HttpResponse
 from rest_framework import generics, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework.settings import api_settings
 
 from .constants.error_messages import GENERAL_ERRORS
 from .constants.logger import logger
-from .models import Collection
-from .serializers import CollectionSerializer
-from .services import (CreateCollectionService, ListCollectionsService,
-                       MovieListService, UpdateCollectionService)
+from .mixins import ReadYourWritesMixin
+from .models import Collection, Movie
+from .serializers import (CollectionBatchSerializer,
+                          CollectionPatchSerializer, CollectionSerializer)
+from .services import (BatchCollectionService, CreateCollectionService,
+                       DeleteCollectionService, ListCollectionsService,
+                       MovieListService, PatchCollectionService,
+                       UpdateCollectionService)
+from .upstream import UpstreamSchemaError, decode_page
 
 
 class MovieListView(generics.ListAPIView):
 
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES,
+                        MessagePackRenderer]
+    throttle_scope = "movies"
     movie_list_service = MovieListService()
 
     def get(self, request, *args, **kwargs):
-
         try:
             data = self.movie_list_service.get_list(request)
-            return Response(data, status=status.HTTP_200_OK)
+            if (isinstance(data, bytes)
+                    and request.accepted_renderer.format != "json"):
+                # Passthrough pages are JSON, other formats need the page.
+                data = decode_page(data)
+            if isinstance(data, bytes):
+                # Passthrough page, already encoded.
+                response = HttpResponse(data, content_type="application/json")
+            else:
+                response = Response(data, status=status.HTTP_200_OK)
+            if settings.MOVIE_PAGE_CACHE_TIMEOUT > 0:
+                # Cached pages are served again and again, keep them
+                # compressed too.
+                response.compression_cache_timeout = (
+                    settings.MOVIE_PAGE_CACHE_TIMEOUT)
+            return response
+
+        except UpstreamSchemaError as schema_err:
+            logger.exception(str(schema_err))
+            return Response(
+                {"error": str(schema_err)}, status=status.HTTP_502_BAD_GATEWAY)
 
+        except UpstreamRateLimited as rate_limited:
+            logger.warning(str(rate_limited))
+            return Response(
+                {"error": str(rate_limited)},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": str(
+                    math.ceil(rate_limited.retry_after))},
+            )
         except requests.exceptions.HTTPError as http_err:
             logger.exception(str(http_err))
             return Response(
@@ -43,10 +86,14 @@ class MovieListView(generics.ListAPIView):
             )
 
 
-class CollectionViewSet(viewsets.ModelViewSet):
+class CollectionViewSet(ReadYourWritesMixin, viewsets.ModelViewSet):
 
     permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES,
+                        MessagePackRenderer]
+    parser_classes = [*api_settings.DEFAULT_PARSER_CLASSES,
+                      MessagePackParser]
 
     queryset = Collection.objects.all()
     serializer_class = CollectionSerializer
@@ -54,6 +101,53 @@ class CollectionViewSet(viewsets.ModelViewSet):
     list_collection_service = ListCollectionsService()
     create_collection_service = CreateCollectionService()
     update_collection_service = UpdateCollectionService()
+    patch_collection_service = PatchCollectionService()
+    batch_collection_service = BatchCollectionService()
+    delete_collection_service = DeleteCollectionService()
+
+    def get_queryset(self):
+        """
+        Returns the collections queryset, loading the movies of a single
+        collection up front for the actions that serialize them.
+
+        Updates lock the collection row until their transaction ends, so
+        concurrent writes to one collection recompute its summary one after
+        the other instead of overwriting each other's summary.
+
+        Returns:
+            QuerySet: The collections queryset for the current action.
+        """
+        queryset = super().get_queryset()
+        if self.action in ("retrieve", "update"):
+            movies = Movie.objects.only(
+                "uuid", "title", "description", "genres", "collection_id"
+            ).order_by("title")
+            queryset = queryset.only(
+                "uuid", "title", "description"
+            ).prefetch_related(Prefetch("movies", queryset=movies))
+        elif self.action == "partial_update":
+            # Patches adjust the summary instead of recounting the movies.
+            queryset = queryset.only("uuid", "title", "description",
+                                     *Collection.SUMMARY_FIELDS)
+        elif self.action == "destroy":
+            queryset = queryset.only("uuid")
+        if self.action in ("update", "partial_update"):
+            queryset = queryset.select_for_update()
+        return queryset
+
+    @property
+    def throttle_scope(self):
+        if self.action in ("create", "update", "partial_update", "destroy",
+                           "batch"):
+            return "collections-write"
+        return None
+
+    def get_serializer_class(self):
+        if self.action == "partial_update":
+            return CollectionPatchSerializer
+        if self.action == "batch":
+            return CollectionBatchSerializer
+        return super().get_serializer_class()
 
     def list(self, request) -> Response:
         """
@@ -138,16 +232,123 @@ class CollectionViewSet(viewsets.ModelViewSet):
             )
         except ValidationError as e:
             logger.exception(str(e))
+            transaction.set_rollback(True)
+            return Response({"error": e.detail},
+                            status=status.HTTP_400_BAD_REQUEST)
+        except IntegrityError as e:
+            logger.exception(str(e))
+            transaction.set_rollback(True)
+            return Response(
+                GENERAL_ERRORS["INTEGRITY_ERROR"],
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        except Exception as e:
+            logger.exception(str(e))
+            transaction.set_rollback(True)
+            return Response(
+                {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @transaction.atomic
+    def partial_update(self, request, pk=None) -> Response:
+        """
+        Applies a sparse patch to a collection. Movies are added, updated or removed by UUID and only the rows that change are written.
+
+        Args:
+            request: The HTTP request object containing the patch.
+            pk (int, optional): The primary key of the collection to patch.
+
+        Returns:
+            Response: A Response object containing the patched collection's summary or an error message.
+        """ # noqa
+        collection = self.get_object()
+        try:
+            serializer = self.get_serializer(data=request.data)
+
+            response = self.patch_collection_service.patch_collection(
+                collection, serializer
+            )
+
+            return Response(
+                response, status=status.HTTP_200_OK
+            )
+        except ValidationError as e:
+            logger.exception(str(e))
+            transaction.set_rollback(True)
+            return Response({"error": e.detail},
+                            status=status.HTTP_400_BAD_REQUEST)
+        except IntegrityError as e:
+            logger.exception(str(e))
+            transaction.set_rollback(True)
+            return Response(
+                GENERAL_ERRORS["INTEGRITY_ERROR"],
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        except Exception as e:
+            logger.exception(str(e))
+            transaction.set_rollback(True)
+            return Response(
+                {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    def destroy(self, request, pk=None) -> Response:
+        """
+        Deletes a collection and its movies with set based deletes. When deletes are deferred the collection is hidden and a background job purges it.
+
+        Args:
+            request: The HTTP request object.
+            pk (int, optional): The primary key of the collection to delete.
+
+        Returns:
+            Response: An empty response, the purge job's UUID or an error message.
+        """ # noqa
+        collection = self.get_object()
+        try:
+            job = self.delete_collection_service.delete_collections(
+                [collection.uuid])
+            if job is not None:
+                return Response({"job_uuid": job.uuid},
+                                status=status.HTTP_202_ACCEPTED)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        except Exception as e:
+            logger.exception(str(e))
+            return Response(
+                {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=False, methods=["post"], url_path="batch")
+    @transaction.atomic
+    def batch(self, request) -> Response:
+        """
+        Creates, updates and deletes many collections in one request and transaction.
+
+        Args:
+            request: The HTTP request object containing the list of operations.
+
+        Returns:
+            Response: A Response object containing a result per operation or an error message.
+        """ # noqa
+        try:
+            serializer = self.get_serializer(data=request.data)
+            response = self.batch_collection_service.run(serializer)
+            return Response(
+                response, status=status.HTTP_200_OK
+            )
+        except ValidationError as e:
+            logger.exception(str(e))
+            transaction.set_rollback(True)
             return Response({"error": e.detail},
                             status=status.HTTP_400_BAD_REQUEST)
         except IntegrityError as e:
             logger.exception(str(e))
+            transaction.set_rollback(True)
             return Response(
                 GENERAL_ERRORS["INTEGRITY_ERROR"],
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
         except Exception as e:
             logger.exception(str(e))
+            transaction.set_rollback(True)
             return Response(
                 {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
@@ -0,0 +1,72 @@
+from api.utils.ttl_cache import MISSING, TTLCache
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+
+# Maps a user id to its ``is_active`` flag (``None`` for deleted users).
+user_state_cache = TTLCache(
+    maxsize=getattr(settings, "AUTH_USER_STATE_CACHE_SIZE", 10000),
+    ttl=getattr(settings, "AUTH_USER_STATE_CACHE_TTL", 30),
+)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Authenticates requests from the signed token claims instead of loading
+    the ``User`` row on every request.
+
+    The user's active state is still checked for revocation, but the result
+    is kept in a small in-process TTL cache so a user costs at most one
+    lightweight query per ``AUTH_USER_STATE_CACHE_TTL`` seconds per worker.
+    """
+
+    def get_user(self, validated_token):
+        """
+        Returns a token backed user after checking the cached user state.
+
+        Args:
+            validated_token (Token): The validated access token.
+
+        Returns:
+            TokenUser: A stateless user built from the token claims.
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification"))
+
+        is_active = user_state_cache.get(user_id, default=MISSING)
+        if is_active is MISSING:
+            is_active = self.get_user_state(user_id)
+            user_state_cache.set(user_id, is_active)
+
+        if is_active is None:
+            raise AuthenticationFailed(_("User not found"),
+                                       code="user_not_found")
+        if not is_active:
+            raise AuthenticationFailed(_("User is inactive"),
+                                       code="user_inactive")
+
+        return api_settings.TOKEN_USER_CLASS(validated_token)
+
+    def get_user_state(self, user_id):
+        """
+        Loads only the ``is_active`` column for the given user.
+
+        Args:
+            user_id: The value of the token's user id claim.
+
+        Returns:
+            Optional[bool]: The active flag, or None if the user is gone.
+        """
+        return (
+            get_user_model().objects
+            .filter(**{api_settings.USER_ID_FIELD: user_id})
+            .values_list("is_active", flat=True)
+            .first()
+        )
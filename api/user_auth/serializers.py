@@ -1,7 +1,13 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import (TokenBlacklistSerializer,
+                                                  TokenRefreshSerializer)
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from .services import PasswordHashingService, TokenBlacklistService
+
 
 class RegisterSerializer(serializers.ModelSerializer):
 
@@ -13,15 +19,66 @@ class RegisterSerializer(serializers.ModelSerializer):
             "password": {"write_only": True},
         }
 
+    password_hashing_service = PasswordHashingService()
+
     def create(self, validated_data):
         """
         Create the user object in the database
         """
-        user = user = User.objects.create_user(**validated_data)
+        user = User(
+            username=User.normalize_username(validated_data["username"]))
+        user.password = self.password_hashing_service.hash_password(
+            validated_data["password"])
+        user.save()
         return user
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
         refresh = RefreshToken.for_user(instance)
         representation["access"] = str(refresh.access_token)
+        representation["refresh"] = str(refresh)
         return representation
+
+
+class CacheTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refreshes an access token, rejecting refresh tokens revoked through
+    ``TokenBlacklistService`` and revoking the old token after rotation.
+    """
+
+    token_blacklist_service = TokenBlacklistService()
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        rotate = api_settings.ROTATE_REFRESH_TOKENS
+        if rotate and api_settings.BLACKLIST_AFTER_ROTATION:
+            # Claiming the token is the check, so of two concurrent
+            # refreshes with the same token only one gets new tokens.
+            if not self.token_blacklist_service.claim(refresh):
+                raise TokenError("Token is blacklisted")
+        elif self.token_blacklist_service.is_blacklisted(refresh):
+            raise TokenError("Token is blacklisted")
+
+        data = {"access": str(refresh.access_token)}
+
+        if rotate:
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+
+            data["refresh"] = str(refresh)
+
+        return data
+
+
+class CacheTokenBlacklistSerializer(TokenBlacklistSerializer):
+    """
+    Revokes a refresh token by storing its ``jti`` in the cache backend.
+    """
+
+    token_blacklist_service = TokenBlacklistService()
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        self.token_blacklist_service.blacklist(refresh)
+        return {}
@@ -0,0 +1,96 @@
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import caches
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+
+class PasswordHashingService:
+
+    """
+    Caps how many passwords a worker hashes at once.
+
+    Hashing still runs on the calling thread and blocks it; the semaphore
+    only makes signup bursts queue for a slot instead of running every hash
+    at once. The hashers release the GIL, so up to
+    ``PASSWORD_HASHING_WORKERS`` hashes run in parallel per worker.
+    """
+
+    semaphore = threading.BoundedSemaphore(settings.PASSWORD_HASHING_WORKERS)
+
+    def hash_password(self, raw_password: str) -> str:
+        """
+        Hashes a password with the configured hasher, waiting for a free
+        slot first.
+
+        Args:
+            raw_password (str): The plain text password.
+
+        Returns:
+            str: The encoded password hash.
+        """
+        with self.semaphore:
+            return make_password(raw_password)
+
+
+class TokenBlacklistService:
+
+    """
+    Keeps revoked refresh tokens in the cache backend instead of the database.
+    The cache must be shared by all workers, see ``api.utils.shared_cache``.
+
+    Every entry is keyed by the token's ``jti`` and expires together with the
+    token, so lookups are a single cache read and memory stays bounded by the
+    number of tokens that are both revoked and still unexpired.
+    """
+
+    key_prefix = "token_blacklist"
+
+    def __init__(self, cache_alias: str = "default"):
+        self.cache = caches[cache_alias]
+
+    def blacklist(self, token: Token) -> None:
+        """
+        Revokes a token until it expires.
+
+        Args:
+            token (Token): The validated token to revoke.
+        """
+        self.cache.set(self.get_key(token), True,
+                       timeout=self.get_timeout(token))
+
+    def claim(self, token: Token) -> bool:
+        """
+        Atomically revokes a token that is about to be used up, e.g. a
+        refresh token being rotated.
+
+        Args:
+            token (Token): The validated token to claim.
+
+        Returns:
+            bool: True if this call revoked the token, False if it was
+                already revoked, by an earlier or a concurrent request.
+        """
+        return self.cache.add(self.get_key(token), True,
+                              timeout=self.get_timeout(token))
+
+    def is_blacklisted(self, token: Token) -> bool:
+        """
+        Checks whether a token has been revoked.
+
+        Args:
+            token (Token): The validated token to check.
+
+        Returns:
+            bool: True if the token was blacklisted and has not expired yet.
+        """
+        return self.cache.get(self.get_key(token), False)
+
+    def get_timeout(self, token: Token) -> int:
+        return max(int(token["exp"] - time.time()), 1)
+
+    def get_key(self, token: Token) -> str:
+        return f"{self.key_prefix}:{token[api_settings.JTI_CLAIM]}"
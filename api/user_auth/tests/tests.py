@@ -1,7 +1,19 @@
 # tests/test_serializers.py
 
-from django.test import TestCase
-from ..serializers import RegisterSerializer
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 TokenError)
+from rest_framework_simplejwt.tokens import RefreshToken
+from ..authentication import StatelessJWTAuthentication, user_state_cache
+from ..serializers import CacheTokenRefreshSerializer, RegisterSerializer
+from ..services import PasswordHashingService
 from factories.factories import UserFactory
 
 
@@ -32,3 +44,122 @@ class RegisterSerializerTest(TestCase):
         serializer = RegisterSerializer(data=self.valid_payload)
         self.assertFalse(serializer.is_valid())
         self.assertIn('username', serializer.errors)
+
+
+class StatelessJWTAuthenticationTest(TestCase):
+
+    def setUp(self):
+        user_state_cache.clear()
+        self.user = UserFactory(username='tokenuser')
+        token = RefreshToken.for_user(self.user).access_token
+        self.factory = APIRequestFactory()
+        self.header = f'Bearer {token}'
+
+    def authenticate(self):
+        request = self.factory.get('/', HTTP_AUTHORIZATION=self.header)
+        return StatelessJWTAuthentication().authenticate(request)
+
+    def test_authenticate_returns_token_user(self):
+        user, _ = self.authenticate()
+        self.assertEqual(user.id, self.user.id)
+        self.assertTrue(user.is_authenticated)
+
+    def test_user_state_is_cached_between_requests(self):
+        with self.assertNumQueries(1):
+            self.authenticate()
+        with self.assertNumQueries(0):
+            self.authenticate()
+
+    def test_inactive_user_rejected(self):
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_deleted_user_rejected(self):
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+
+class PasswordHashingTest(TestCase):
+
+    @override_settings(PASSWORD_HASHERS=[
+        'api.user_auth.hashers.TunedScryptPasswordHasher',
+        'api.user_auth.hashers.TunedPBKDF2PasswordHasher',
+    ])
+    def test_register_uses_configured_hasher(self):
+        serializer = RegisterSerializer(data={'username': 'hashed',
+                                              'password': 'password123'})
+        self.assertTrue(serializer.is_valid())
+        user = serializer.save()
+
+        self.assertTrue(user.password.startswith('scrypt$'))
+        self.assertTrue(user.check_password('password123'))
+
+    @override_settings(PASSWORD_HASHERS=[
+        'api.user_auth.hashers.TunedPBKDF2PasswordHasher',
+    ], PBKDF2_ITERATIONS=1000)
+    def test_hasher_reads_costs_at_call_time(self):
+        encoded = PasswordHashingService().hash_password('password123')
+        self.assertTrue(encoded.startswith('pbkdf2_sha256$1000$'))
+
+
+class TokenEndpointsTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        response = self.client.post(reverse('register'),
+                                    {'username': 'username',
+                                     'password': 'password'})
+        self.refresh = response.data['refresh']
+
+    def test_register_returns_refresh_token(self):
+        self.assertIsNotNone(self.refresh)
+
+    def test_obtain_token_pair(self):
+        response = self.client.post(reverse('token-obtain'),
+                                    {'username': 'username',
+                                     'password': 'password'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.data)
+        self.assertIn('refresh', response.data)
+
+    def test_refresh_does_not_query_database(self):
+        with self.assertNumQueries(0):
+            response = self.client.post(reverse('token-refresh'),
+                                        {'refresh': self.refresh})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.data)
+        self.assertNotEqual(response.data['refresh'], self.refresh)
+
+    def test_rotated_refresh_token_is_rejected(self):
+        self.client.post(reverse('token-refresh'), {'refresh': self.refresh})
+        response = self.client.post(reverse('token-refresh'),
+                                    {'refresh': self.refresh})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_concurrent_refreshes_rotate_once(self):
+        barrier = threading.Barrier(8)
+
+        def refresh(_):
+            serializer = CacheTokenRefreshSerializer(
+                data={'refresh': self.refresh})
+            barrier.wait()
+            try:
+                return serializer.is_valid()
+            except TokenError:
+                return False
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(refresh, range(8)))
+        self.assertEqual(results.count(True), 1)
+
+    def test_blacklisted_refresh_token_is_rejected(self):
+        response = self.client.post(reverse('token-blacklist'),
+                                    {'refresh': self.refresh})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(reverse('token-refresh'),
+                                    {'refresh': self.refresh})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -1,6 +1,8 @@
 from rest_framework import generics
 from rest_framework.permissions import AllowAny
-from .serializers import RegisterSerializer
+from rest_framework_simplejwt.views import TokenViewBase
+from .serializers import (CacheTokenBlacklistSerializer,
+                          CacheTokenRefreshSerializer, RegisterSerializer)
 from django.contrib.auth.models import User
 
 
@@ -11,3 +13,18 @@ class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     permission_classes = (AllowAny,)
     serializer_class = RegisterSerializer
+
+
+class TokenRefreshView(TokenViewBase):
+    """
+    Exchange a refresh token for a new access token (and a rotated refresh
+    token when ``ROTATE_REFRESH_TOKENS`` is on)
+    """
+    serializer_class = CacheTokenRefreshSerializer
+
+
+class TokenBlacklistView(TokenViewBase):
+    """
+    Revoke a refresh token
+    """
+    serializer_class = CacheTokenBlacklistSerializer
@@ -1,17 +1,34 @@
-from requests import Session, Response
+from requests import RequestException, Session, Response
 from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 from urllib3.util import Retry
 
+from .rate_limiter import RateLimitExceeded
+
+
+class UpstreamRateLimited(RequestException):
+
+    """Raised when the client side rate limit leaves no room in time."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(
+            f"Upstream rate limit reached, retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
 
 class APIClient:
 
     """A client for making HTTP requests with retry logic."""
 
-    def __init__(self, base_url: str, username: str, password: str):
+    def __init__(self, base_url: str, username: str, password: str,
+                 rate_limiter=None, max_wait: float = 0):
         self.base_url = base_url
         self.auth = HTTPBasicAuth(username, password)
         self.session = self._create_session()
+        # Optional TokenBucketRateLimiter pacing every request, which may
+        # wait up to max_wait seconds for its turn.
+        self.rate_limiter = rate_limiter
+        self.max_wait = max_wait
 
     def _create_session(self) -> Session:
         """
@@ -40,7 +57,16 @@ class APIClient:
 
         Returns:
             Response: The response object from the GET request.
+
+        Raises:
+            UpstreamRateLimited: If the rate limiter has no room within ``max_wait``.
         """ # noqa
+        if self.rate_limiter is not None:
+            try:
+                self.rate_limiter.acquire(timeout=self.max_wait)
+            except RateLimitExceeded as e:
+                raise UpstreamRateLimited(e.retry_after) from e
+
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         response = self.session.get(url, params=params,
                                     auth=self.auth, verify=False, timeout=10)
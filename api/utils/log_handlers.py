@@ -0,0 +1,126 @@
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler
+
+
+class ForkSafeQueueHandler(QueueHandler):
+
+    """
+    Hands records to a background ``QueueListener`` so the calling thread
+    never waits on console or file I/O.
+
+    Configure it through ``dictConfig`` with a ``handlers`` list (Python 3.12+)
+    and the listener is started lazily in every process, which keeps it
+    working when gunicorn forks workers from a preloaded master. Records are
+    dropped, and counted in ``dropped``, when the queue is full.
+    """
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.dropped = 0
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self._pid != os.getpid():
+            self._start_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Merges the message arguments but leaves ``exc_info`` in place so the
+        traceback is formatted on the listener thread, not the request thread.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def _start_listener(self) -> None:
+        with self._lock:
+            if self._pid == os.getpid() or self.listener is None:
+                return
+            # A thread started before a fork does not exist in the child.
+            self.listener._thread = None
+            self.listener.start()
+            atexit.register(self._stop_listener)
+            self._pid = os.getpid()
+
+    def _stop_listener(self) -> None:
+        # Flushes the queue on interpreter exit.
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+
+class JsonFormatter(logging.Formatter):
+
+    """Formats records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(
+                record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if getattr(record, "suppressed", 0):
+            entry["suppressed"] = record.suppressed
+        return json.dumps(entry, default=str)
+
+
+class RepeatedExceptionFilter(logging.Filter):
+
+    """
+    Samples repeated exceptions.
+
+    The same exception type logged from the same line passes ``burst`` times
+    per ``window`` seconds, later ones are dropped. The next record that
+    passes carries the number of dropped records in ``suppressed``.
+    """
+
+    max_keys = 1000
+
+    def __init__(self, burst: int = 5, window: float = 60):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not record.exc_info or record.exc_info[0] is None:
+            return True
+
+        key = (record.name, record.exc_info[0].__name__,
+               record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            if len(self._seen) >= self.max_keys and key not in self._seen:
+                self._seen.clear()
+
+            window_start, count, suppressed = self._seen.get(key, (now, 0, 0))
+            if now - window_start >= self.window:
+                window_start, count = now, 0
+
+            if count >= self.burst:
+                self._seen[key] = (window_start, count, suppressed + 1)
+                return False
+
+            self._seen[key] = (window_start, count + 1, 0)
+
+        record.suppressed = suppressed
+        return True
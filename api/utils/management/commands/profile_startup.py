@@ -0,0 +1,103 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+# Runs in a fresh interpreter so nothing is imported yet, prints the phase
+# timings as JSON on stdout while -X importtime writes to stderr.
+STARTUP_SCRIPT = """
+import json
+import time
+
+timings = {}
+start = time.perf_counter()
+
+def phase(name):
+    global start
+    now = time.perf_counter()
+    timings[name] = (now - start) * 1000
+    start = now
+
+import django
+from django.conf import settings
+settings.INSTALLED_APPS
+phase("settings")
+
+django.setup()
+phase("apps")
+
+from django.urls import get_resolver
+get_resolver().url_patterns
+phase("urls")
+
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+phase("wsgi")
+
+print(json.dumps(timings))
+"""
+
+
+class Command(BaseCommand):
+    help = "Reports import time per module and Django setup phases of a cold worker start." # noqa
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=20,
+                            help="number of modules and packages to list")
+
+    def handle(self, *args, **options):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+            capture_output=True, text=True, env=os.environ.copy(),
+        )
+        if result.returncode:
+            self.stderr.write(result.stderr)
+            return
+
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        modules = self.parse_importtime(result.stderr)
+
+        self.stdout.write("Django setup phases")
+        for name, elapsed in timings.items():
+            self.stdout.write(f"  {name:<10} {elapsed:>9.1f} ms")
+        self.stdout.write(f"  {'total':<10} {sum(timings.values()):>9.1f} ms")
+
+        packages = defaultdict(float)
+        for name, self_ms, _ in modules:
+            packages[name.split(".")[0]] += self_ms
+
+        limit = options["limit"]
+        self.stdout.write("\nImport time per top level package (self)")
+        slowest_packages = sorted(packages.items(), key=lambda item: -item[1])
+        for name, elapsed in slowest_packages[:limit]:
+            self.stdout.write(f"  {elapsed:>9.1f} ms  {name}")
+
+        self.stdout.write("\nSlowest modules (cumulative)")
+        slowest_modules = sorted(modules, key=lambda item: -item[2])
+        for name, _, cumulative in slowest_modules[:limit]:
+            self.stdout.write(f"  {cumulative:>9.1f} ms  {name}")
+
+    @staticmethod
+    def parse_importtime(output: str):
+        """
+        Parses ``-X importtime`` output.
+
+        Args:
+            output (str): The interpreter's stderr.
+
+        Returns:
+            List[Tuple[str, float, float]]: Module name, self and cumulative
+            import time in milliseconds.
+        """
+        modules = []
+        for line in output.splitlines():
+            if not line.startswith("import time:") or "[us]" in line:
+                continue
+            self_us, cumulative_us, name = (
+                line[len("import time:"):].split("|"))
+            modules.append((name.strip(), int(self_us) / 1000,
+                            int(cumulative_us) / 1000))
+        return modules
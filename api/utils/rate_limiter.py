@@ -0,0 +1,201 @@
+"""
+A token bucket rate limiter shared by every worker through the cache.
+
+On django-redis the bucket is updated atomically by a Lua script that
+reads the time from the Redis server. Other backends fall back to counting
+calls per fixed window with ``add`` and ``incr``, which allows ``burst``
+calls per ``burst / rate`` seconds.
+
+The bucket is only shared when the cache is: on a per process LocMemCache
+every worker gets its own and the upstream sees ``workers * rate``. Gunicorn
+therefore refuses to start several workers with a limiter on a process local
+cache, see ``api.utils.shared_cache``.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Dict
+
+from django.core.cache import caches
+
+from .redis_cache import get_raw_client, get_script
+
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+-- The server's clock, so workers on hosts with skewed clocks cannot move
+-- ts backwards and get the same elapsed time credited twice.
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class RateLimitExceeded(Exception):
+
+    """Raised when no token becomes available before the deadline."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate limited, retry after {retry_after:.2f}s")
+        self.retry_after = retry_after
+
+
+class TokenBucketRateLimiter:
+
+    def __init__(self, name: str, rate: float, burst: int,
+                 cache_alias: str = "default"):
+        self.name = name
+        self.rate = rate
+        self.burst = max(int(burst), 1)
+        self.cache_alias = cache_alias
+        self.key = f"rate_limit:{name}"
+        self.lock = threading.Lock()
+        self.waiting = 0
+        self.metrics = {"acquired": 0, "waited": 0, "rejected": 0,
+                        "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+
+    @property
+    def cache(self):
+        cache = caches[self.cache_alias]
+        # Buckets live in the shared tier of the tiered cache.
+        return getattr(cache, "remote", cache)
+
+    def try_acquire(self) -> bool:
+        """
+        Takes a token if one is available right now.
+
+        Returns:
+            bool: True if a token was taken.
+        """
+        if self.take() > 0:
+            self.record("rejected")
+            return False
+        self.record("acquired")
+        return True
+
+    def acquire(self, timeout: float) -> float:
+        """
+        Takes a token, waiting for one for at most ``timeout`` seconds.
+
+        Args:
+            timeout (float): The longest time to wait.
+
+        Returns:
+            float: Seconds spent waiting.
+
+        Raises:
+            RateLimitExceeded: If no token is available before the deadline.
+        """
+        start = time.monotonic()
+        deadline = start + timeout
+        with self.lock:
+            self.waiting += 1
+        try:
+            waited = 0.0
+            while True:
+                wait = self.take()
+                if wait <= 0:
+                    self.record("acquired", waited)
+                    return waited
+                if time.monotonic() + wait > deadline:
+                    self.record("rejected")
+                    raise RateLimitExceeded(retry_after=wait)
+                # Jitter so waiting workers do not retry in lockstep.
+                time.sleep(wait + random.uniform(0, 0.01))
+                waited = time.monotonic() - start
+        finally:
+            with self.lock:
+                self.waiting -= 1
+
+    def take(self) -> float:
+        """
+        Tries to take a token from the shared bucket.
+
+        Returns:
+            float: 0 if a token was taken, otherwise seconds until one is due.
+        """
+        cache = self.cache
+        client = get_raw_client(cache)
+        if client is not None:
+            script = get_script(client, TOKEN_BUCKET_SCRIPT)
+            return float(script(
+                keys=[cache.make_and_validate_key(self.key)],
+                args=[self.rate, self.burst],
+            ))
+
+        window = self.burst / self.rate
+        now = time.time()
+        index = int(now // window)
+        key = f"{self.key}:{index}"
+        cache.add(key, 0, timeout=int(window) + 1)
+        if cache.incr(key) <= self.burst:
+            return 0.0
+        return (index + 1) * window - now
+
+    def record(self, outcome: str, waited: float = 0.0) -> None:
+        with self.lock:
+            self.metrics[outcome] += 1
+            if waited > 0:
+                self.metrics["waited"] += 1
+                self.metrics["wait_seconds"] += waited
+                self.metrics["max_wait_seconds"] = max(
+                    self.metrics["max_wait_seconds"], waited)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns this worker's counters for the limiter.
+
+        Returns:
+            Dict[str, Any]: Calls acquired, waited and rejected, the number
+            of threads waiting right now and wait times in seconds.
+        """
+        with self.lock:
+            acquired = self.metrics["acquired"]
+            return {
+                **self.metrics,
+                "queue_depth": self.waiting,
+                "mean_wait_seconds": (self.metrics["wait_seconds"] / acquired
+                                      if acquired else 0.0),
+                "rate": self.rate,
+                "burst": self.burst,
+            }
+
+
+limiters: Dict[str, TokenBucketRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, rate: float,
+                     burst: int) -> TokenBucketRateLimiter:
+    """
+    Returns the process wide limiter for ``name`` so its metrics add up
+    across requests.
+
+    Args:
+        name (str): Identifies the bucket, shared by every worker.
+        rate (float): Tokens added per second.
+        burst (int): Bucket size.
+
+    Returns:
+        TokenBucketRateLimiter: The limiter.
+    """
+    with _limiters_lock:
+        limiter = limiters.get(name)
+        if (limiter is None or limiter.rate != rate
+                or limiter.burst != max(int(burst), 1)):
+            limiter = limiters[name] = TokenBucketRateLimiter(
+                name, rate, burst)
+        return limiter
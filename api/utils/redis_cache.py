@@ -0,0 +1,101 @@
+"""
+django-redis extensions used by the Redis cache configuration.
+"""
+
+import pickle
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from django_redis.compressors.zlib import ZlibCompressor
+from django_redis.serializers.base import BaseSerializer
+
+PICKLE_EXT_TYPE = 1
+
+# Lua scripts by client and source. An entry keeps its client alive, so the
+# client's id is never reused while it is cached.
+_scripts: Dict[Tuple[int, str], Any] = {}
+_scripts_lock = threading.Lock()
+
+
+class ThresholdZlibCompressor(ZlibCompressor):
+
+    """
+    Compresses only values of at least ``COMPRESS_MIN_LENGTH`` bytes (cache
+    ``OPTIONS``), so large payloads like upstream movie pages shrink while
+    small values skip the CPU cost.
+    """
+
+    def __init__(self, options):
+        super().__init__(options)
+        self.min_length = options.get("COMPRESS_MIN_LENGTH", 1024)
+        self.preset = options.get("COMPRESS_LEVEL", self.preset)
+
+
+class MsgpackSerializer(BaseSerializer):
+
+    """
+    MessagePack serializer (requires ``msgpack``). Types MessagePack cannot
+    represent are pickled into an extension type, so any value that worked
+    with the default pickle serializer still round-trips. Tuples come back
+    as lists.
+    """
+
+    def __init__(self, options):
+        super().__init__(options)
+        import msgpack
+        self.msgpack = msgpack
+
+    def dumps(self, value: Any) -> bytes:
+        return self.msgpack.packb(value, default=self._pickle_ext,
+                                  use_bin_type=True)
+
+    def loads(self, value: bytes) -> Any:
+        return self.msgpack.unpackb(value, raw=False, strict_map_key=False,
+                                    ext_hook=self._unpickle_ext)
+
+    def _pickle_ext(self, value: Any):
+        return self.msgpack.ExtType(
+            PICKLE_EXT_TYPE, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+    def _unpickle_ext(self, code: int, data: bytes) -> Any:
+        if code == PICKLE_EXT_TYPE:
+            return pickle.loads(data)
+        return self.msgpack.ExtType(code, data)
+
+
+def get_raw_client(cache) -> Optional[Any]:
+    """
+    Returns the raw Redis client behind a django-redis cache.
+
+    Args:
+        cache (BaseCache): A cache backend instance.
+
+    Returns:
+        Optional[Redis]: The client, or None for non Redis backends.
+    """
+    get_client = getattr(getattr(cache, "client", None), "get_client", None)
+    if get_client is None:
+        return None
+    return get_client(write=True)
+
+
+def get_script(client, source: str):
+    """
+    Returns the Lua script ``source`` registered with ``client``, hashing it
+    only on first use instead of on every ``register_script`` call.
+
+    Args:
+        client (Redis): A raw client from ``get_raw_client``.
+        source (str): The Lua source.
+
+    Returns:
+        Script: Callable with ``keys`` and ``args``.
+    """
+    key = (id(client), source)
+    script = _scripts.get(key)
+    if script is None:
+        with _scripts_lock:
+            script = _scripts.get(key)
+            if script is None:
+                script = _scripts[key] = client.register_script(source)
+    return script
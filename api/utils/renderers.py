@@ -0,0 +1,46 @@
+"""
+MessagePack renderer and parser (requires ``msgpack``), negotiated next to
+JSON with ``Accept: application/msgpack`` and
+``Content-Type: application/msgpack``.
+
+Values are converted the way DRF's JSON encoder converts them, so both
+formats carry the same data: UUIDs, dates and decimals become strings and
+querysets become lists.
+"""
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+
+class MessagePackRenderer(BaseRenderer):
+
+    media_type = MSGPACK_MEDIA_TYPE
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        import msgpack
+
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=self.encoder.default,
+                             use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        import msgpack
+
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, TypeError, msgpack.UnpackException) as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
@@ -0,0 +1,73 @@
+"""
+Checks that state every worker must agree on is kept in a cache shared
+between processes.
+
+A ``LocMemCache`` lives in one process: with several gunicorn workers a
+refresh token revoked on one worker would still be accepted by the others.
+``config/gunicorn.conf.py`` calls ``check_shared_caches`` before it starts
+more than one worker, so such a deployment fails at startup instead.
+"""
+
+from typing import Dict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def get_shared_state() -> Dict[str, str]:
+    """
+    Returns the enabled features that need every worker to see their
+    writes.
+
+    Returns:
+        Dict[str, str]: The cache alias of each feature.
+    """
+    state = {"refresh token blacklist": "default"}
+    if settings.DATABASE_REPLICA_ALIASES:
+        state["replica read-your-writes pinning"] = "default"
+    if settings.MOVIE_API_RATE > 0:
+        state["MOVIE_API rate limiter"] = "default"
+    if any(api_settings.DEFAULT_THROTTLE_RATES.values()):
+        state["request throttling"] = "default"
+    return state
+
+
+def is_process_local(alias: str) -> bool:
+    """
+    Checks whether a cache is private to the current process.
+
+    Args:
+        alias (str): The cache alias.
+
+    Returns:
+        bool: True if other processes cannot see what is stored in it.
+    """
+    return isinstance(caches[alias], PROCESS_LOCAL_BACKENDS)
+
+
+def check_shared_caches(processes: int) -> None:
+    """
+    Refuses to serve from several processes with process local caches.
+
+    Args:
+        processes (int): How many processes will serve requests.
+
+    Raises:
+        ImproperlyConfigured: If ``processes`` is more than one and a
+            feature from ``get_shared_state`` uses a process local cache.
+    """
+    if processes < 2:
+        return
+    local = [f"{feature} (cache {alias!r})"
+             for feature, alias in get_shared_state().items()
+             if is_process_local(alias)]
+    if local:
+        raise ImproperlyConfigured(
+            f"{', '.join(local)} must be shared between the {processes} "
+            "workers; set CACHE_BACKEND=redis or tiered, or run one worker.")
@@ -0,0 +1,600 @@
+import gzip
+import io
+import json
+import logging
+import os
+import queue
+import sys
+import tempfile
+import time
+import uuid
+from logging.handlers import QueueListener
+from unittest import skipUnless
+from unittest.mock import Mock, patch
+
+from config.middelware.compression import (CompressionMiddleware,
+                                           negotiate_encoding)
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, transaction
+from django.db.utils import ConnectionHandler
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from ..api_client import APIClient, UpstreamRateLimited
+from ..log_handlers import (ForkSafeQueueHandler, JsonFormatter,
+                            RepeatedExceptionFilter)
+from ..management.commands.profile_startup import Command
+from ..redis_cache import (MsgpackSerializer, ThresholdZlibCompressor,
+                           get_raw_client, get_script)
+from ..rate_limiter import RateLimitExceeded, TokenBucketRateLimiter
+from ..renderers import MessagePackParser, MessagePackRenderer
+from ..shared_cache import check_shared_caches
+from ..throttling import ScopedCounterThrottle, UserCounterThrottle
+from ..ttl_cache import TTLCache
+from ..uuid7 import uuid7
+
+
+def make_record(exc_info=None, lineno=10):
+    return logging.LogRecord('api.movies', logging.ERROR, __file__, lineno,
+                             'failed %s', ('here',), exc_info)
+
+
+def exc_info_for(exc):
+    try:
+        raise exc
+    except Exception:
+        return sys.exc_info()
+
+
+class TTLCacheTest(SimpleTestCase):
+
+    def test_get_and_set(self):
+        cache = TTLCache(maxsize=2, ttl=30)
+        cache.set('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('missing'))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(maxsize=2, ttl=30)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+
+    def test_entries_expire(self):
+        cache = TTLCache(maxsize=2, ttl=30)
+        with patch('api.utils.ttl_cache.time.monotonic', return_value=0):
+            cache.set('a', 1)
+        with patch('api.utils.ttl_cache.time.monotonic', return_value=31):
+            self.assertIsNone(cache.get('a'))
+
+
+class RepeatedExceptionFilterTest(SimpleTestCase):
+
+    def test_repeated_exceptions_are_sampled(self):
+        log_filter = RepeatedExceptionFilter(burst=2, window=60)
+        exc_info = exc_info_for(ValueError('boom'))
+        results = [log_filter.filter(make_record(exc_info))
+                   for _ in range(5)]
+        self.assertEqual(results, [True, True, False, False, False])
+
+    def test_next_window_reports_suppressed_count(self):
+        log_filter = RepeatedExceptionFilter(burst=1, window=60)
+        exc_info = exc_info_for(ValueError('boom'))
+        with patch('api.utils.log_handlers.time.monotonic', return_value=0):
+            log_filter.filter(make_record(exc_info))
+            log_filter.filter(make_record(exc_info))
+            log_filter.filter(make_record(exc_info))
+        record = make_record(exc_info)
+        with patch('api.utils.log_handlers.time.monotonic', return_value=61):
+            self.assertTrue(log_filter.filter(record))
+        self.assertEqual(record.suppressed, 2)
+
+    def test_records_without_exception_always_pass(self):
+        log_filter = RepeatedExceptionFilter(burst=0, window=60)
+        self.assertTrue(log_filter.filter(make_record()))
+
+
+class JsonFormatterTest(SimpleTestCase):
+
+    def test_format(self):
+        record = make_record(exc_info_for(ValueError('boom')))
+        entry = json.loads(JsonFormatter().format(record))
+        self.assertEqual(entry['message'], 'failed here')
+        self.assertEqual(entry['level'], 'ERROR')
+        self.assertIn('ValueError: boom', entry['exception'])
+
+
+class ForkSafeQueueHandlerTest(SimpleTestCase):
+
+    def test_records_reach_target_handler(self):
+        target = logging.handlers.BufferingHandler(capacity=10)
+        handler = ForkSafeQueueHandler(queue.Queue())
+        handler.listener = QueueListener(handler.queue, target)
+        handler.handle(make_record(exc_info_for(ValueError('boom'))))
+        handler.listener.stop()
+
+        self.assertEqual(len(target.buffer), 1)
+        self.assertEqual(target.buffer[0].getMessage(), 'failed here')
+        self.assertIsNotNone(target.buffer[0].exc_info)
+
+    def test_records_dropped_when_queue_is_full(self):
+        handler = ForkSafeQueueHandler(queue.Queue(maxsize=1))
+        handler.handle(make_record())
+        handler.handle(make_record())
+        self.assertEqual(handler.dropped, 1)
+
+
+@override_settings(CACHES={
+    'default': {
+        'BACKEND': 'api.utils.tiered_cache.TieredCache',
+        'LOCATION': 'tiered-tests',
+        'OPTIONS': {'REMOTE': 'remote', 'LOCAL_TIMEOUT': 30},
+    },
+    'remote': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'tiered-tests-remote',
+    },
+})
+class TieredCacheTest(SimpleTestCase):
+
+    def setUp(self):
+        self.cache = caches['default']
+        self.remote = caches['remote']
+        self.cache.clear()
+
+    def test_remote_value_is_kept_locally(self):
+        self.remote.set('key', 'value')
+        self.assertEqual(self.cache.get('key'), 'value')
+
+        self.remote.delete('key')
+        self.assertEqual(self.cache.get('key'), 'value')
+
+    def test_local_copy_does_not_outlive_remote_entry(self):
+        with patch.object(self.cache, '_get_remote',
+                          return_value={'key': ('value', 0.05)}):
+            self.assertEqual(self.cache.get('key'), 'value')
+        local_key = self.cache.make_key('key')
+        self.assertIsNotNone(self.cache.local.get(local_key))
+        time.sleep(0.06)
+        self.assertIsNone(self.cache.local.get(local_key))
+
+    def test_redis_reads_values_and_ttls_in_one_round_trip(self):
+        pipeline = Mock()
+        pipeline.execute.return_value = [b'1', 50, None, -2, b'3', -1]
+        redis = Mock(**{'pipeline.return_value': pipeline})
+        remote = Mock()
+        remote.client.make_key = lambda key, version=None: f':1:{key}'
+        remote.client.decode = int
+        with patch.object(self.cache, 'redis', redis), \
+                patch.object(self.cache, 'remote', remote):
+            found = self.cache._get_remote(['a', 'b', 'c'])
+
+        self.assertEqual(found, {'a': (1, 0.05), 'c': (3, None)})
+        pipeline.get.assert_called_with(':1:c')
+        pipeline.pttl.assert_called_with(':1:c')
+        pipeline.execute.assert_called_once_with()
+
+    def test_set_writes_through(self):
+        self.cache.set('key', 'value')
+        self.assertEqual(self.remote.get('key'), 'value')
+
+    def test_delete_invalidates_local_tier(self):
+        self.cache.set('key', 'value')
+        self.cache.delete('key')
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_incr(self):
+        self.cache.set('counter', 1)
+        self.assertEqual(self.cache.incr('counter'), 2)
+        self.assertEqual(self.remote.get('counter'), 2)
+        self.assertEqual(self.cache.get('counter'), 2)
+
+    def test_get_many(self):
+        self.cache.set('a', 1)
+        self.remote.set('b', 2)
+        self.assertEqual(self.cache.get_many(['a', 'b', 'c']),
+                         {'a': 1, 'b': 2})
+
+    def test_stats_per_tier(self):
+        hits = self.cache.tier.hits.copy()
+        misses = self.cache.tier.misses
+        self.remote.set('key', 'value')
+        self.cache.get('key')
+        self.cache.get('key')
+        self.cache.get('missing')
+
+        self.assertEqual(self.cache.tier.hits['remote'] - hits['remote'], 1)
+        self.assertEqual(self.cache.tier.hits['local'] - hits['local'], 1)
+        self.assertEqual(self.cache.tier.misses - misses, 1)
+        self.assertIn('local_hit_ratio', self.cache.stats())
+
+    def test_invalidation_message_from_other_worker(self):
+        self.cache.set('key', 'value')
+        local_key = self.cache.make_key('key')
+        self.cache._handle_invalidation(f'other-worker\n{local_key}')
+        self.assertIsNone(self.cache.local.get(local_key))
+
+
+@skipUnless(settings.CACHE_BACKEND in ('redis', 'tiered'),
+            'needs Redis, run with CACHE_BACKEND=redis')
+class TieredCacheInvalidationTest(SimpleTestCase):
+
+    def setUp(self):
+        self.channel = f'cache-invalidation-{uuid.uuid4().hex}'
+        # Two workers with their own local tier over one Redis whose socket
+        # timeout is much shorter than the idle time below.
+        remote = {**settings.REDIS_CACHE, 'OPTIONS': {
+            **settings.REDIS_CACHE['OPTIONS'], 'SOCKET_TIMEOUT': 0.2}}
+        workers = {
+            name: {
+                'BACKEND': 'api.utils.tiered_cache.TieredCache',
+                'LOCATION': f'{name}-{self.channel}',
+                'OPTIONS': {'REMOTE': 'tiered-remote', 'LOCAL_TIMEOUT': 60,
+                            'INVALIDATION_CHANNEL': self.channel,
+                            'INVALIDATION_PING_INTERVAL': 0.1},
+            } for name in ('worker-a', 'worker-b')
+        }
+        override = self.settings(CACHES={**settings.CACHES,
+                                         'tiered-remote': remote, **workers})
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def wait_for(self, condition):
+        deadline = time.monotonic() + 2
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_invalidation_after_idle_channel(self):
+        a, b = caches['worker-a'], caches['worker-b']
+        a.get('key')
+        b.get('key')
+        self.wait_for(lambda: dict(a.redis.pubsub_numsub(self.channel))
+                      .get(self.channel.encode()) == 2)
+
+        b.set('key', 'old')
+        self.assertEqual(a.get('key'), 'old')
+        local_key = a.make_key('key')
+        time.sleep(0.6)
+        # Still subscribed on the same connection, a reconnect would have
+        # cleared the local tier.
+        self.assertEqual(a.local.get(local_key), 'old')
+
+        b.set('key', 'new')
+        self.wait_for(lambda: a.local.get(local_key) is None)
+        self.assertEqual(a.get('key'), 'new')
+
+    def test_listener_connection_has_no_socket_timeout(self):
+        kwargs = caches['worker-a']._listener_client() \
+            .connection_pool.connection_kwargs
+        self.assertIsNone(kwargs['socket_timeout'])
+        self.assertTrue(kwargs['socket_keepalive'])
+
+
+class RedisCacheExtensionsTest(SimpleTestCase):
+
+    def test_msgpack_serializer_round_trip(self):
+        serializer = MsgpackSerializer({})
+        value = {'uuid': uuid.uuid4(), 'results': [{'title': 'Movie'}],
+                 'body': b'raw'}
+        self.assertEqual(serializer.loads(serializer.dumps(value)), value)
+
+    def test_compressor_skips_small_values(self):
+        compressor = ThresholdZlibCompressor({'COMPRESS_MIN_LENGTH': 100})
+        self.assertEqual(compressor.compress(b'small'), b'small')
+        large = b'movie' * 100
+        compressed = compressor.compress(large)
+        self.assertLess(len(compressed), len(large))
+        self.assertEqual(compressor.decompress(compressed), large)
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_get_raw_client_for_non_redis_cache(self):
+        self.assertIsNone(get_raw_client(caches['default']))
+
+    def test_scripts_are_registered_once_per_client(self):
+        client = Mock()
+        script = get_script(client, 'return 1')
+        self.assertIs(get_script(client, 'return 1'), script)
+        client.register_script.assert_called_once_with('return 1')
+
+
+class TokenBucketRateLimiterTest(SimpleTestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.limiter = TokenBucketRateLimiter(
+            f'test-{uuid.uuid4().hex}', rate=20, burst=2)
+
+    def test_burst_then_reject(self):
+        self.assertTrue(self.limiter.try_acquire())
+        self.assertTrue(self.limiter.try_acquire())
+        self.assertFalse(self.limiter.try_acquire())
+        self.assertEqual(self.limiter.stats()['rejected'], 1)
+
+    def test_acquire_waits_for_next_token(self):
+        self.limiter.try_acquire()
+        self.limiter.try_acquire()
+        waited = self.limiter.acquire(timeout=1)
+        self.assertGreater(waited, 0)
+        stats = self.limiter.stats()
+        self.assertEqual(stats['waited'], 1)
+        self.assertEqual(stats['queue_depth'], 0)
+
+    def test_acquire_deadline(self):
+        limiter = TokenBucketRateLimiter(
+            f'test-{uuid.uuid4().hex}', rate=0.1, burst=1)
+        limiter.try_acquire()
+        with self.assertRaises(RateLimitExceeded) as raised:
+            limiter.acquire(timeout=0.01)
+        # The fallback's fixed window may be about to end, only the
+        # deadline is certain.
+        self.assertGreater(raised.exception.retry_after, 0.01)
+
+    @skipUnless(settings.CACHE_BACKEND in ('redis', 'tiered'),
+                'needs Redis, run with CACHE_BACKEND=redis')
+    def test_bucket_ignores_caller_clocks(self):
+        limiter = TokenBucketRateLimiter(
+            f'test-{uuid.uuid4().hex}', rate=0.1, burst=1)
+        # A worker whose clock is behind must not rewind the bucket.
+        with patch('time.time', return_value=time.time() - 1000):
+            self.assertTrue(limiter.try_acquire())
+        self.assertFalse(limiter.try_acquire())
+
+    def test_api_client_raises_upstream_rate_limited(self):
+        limiter = TokenBucketRateLimiter(
+            f'test-{uuid.uuid4().hex}', rate=0.1, burst=1)
+        limiter.try_acquire()
+        client = APIClient('https://example.com', 'user', 'password',
+                           rate_limiter=limiter, max_wait=0)
+        with patch('requests.Session.get') as session_get:
+            with self.assertRaises(UpstreamRateLimited):
+                client.get('/?page=1')
+        session_get.assert_not_called()
+
+
+class ThrottledView(APIView):
+
+    authentication_classes = []
+    permission_classes = []
+    throttle_classes = [UserCounterThrottle, ScopedCounterThrottle]
+    throttle_scope = 'search'
+
+    def get(self, request):
+        return Response({})
+
+
+@override_settings(REST_FRAMEWORK={'DEFAULT_THROTTLE_RATES': {
+    'user': '3/min', 'search': '2/min'}})
+class CounterThrottleTest(SimpleTestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.view = ThrottledView.as_view()
+        self.factory = APIRequestFactory()
+
+    def get(self, address='10.0.0.1'):
+        return self.view(self.factory.get('/', REMOTE_ADDR=address))
+
+    def test_scope_limit_returns_retry_after(self):
+        self.assertEqual(self.get().status_code, 200)
+        self.assertEqual(self.get().status_code, 200)
+        response = self.get()
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(1 <= int(response['Retry-After']) <= 60)
+
+        # Other clients have their own counters.
+        self.assertEqual(self.get('10.0.0.2').status_code, 200)
+
+    def test_user_limit_applies_across_views(self):
+        ThrottledView.throttle_scope = None
+        self.addCleanup(setattr, ThrottledView, 'throttle_scope', 'search')
+        statuses = [self.get().status_code for _ in range(4)]
+        self.assertEqual(statuses, [200, 200, 200, 429])
+
+    @override_settings(REST_FRAMEWORK={'DEFAULT_THROTTLE_RATES': {
+        'user': None, 'search': None}})
+    def test_empty_rate_disables_throttle(self):
+        statuses = {self.get().status_code for _ in range(5)}
+        self.assertEqual(statuses, {200})
+
+
+@override_settings(COMPRESSION_ENCODINGS=['gzip'], COMPRESSION_MIN_LENGTH=100)
+class CompressionMiddlewareTest(SimpleTestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.body = json.dumps([{'title': f'Movie {i}'}
+                                for i in range(100)]).encode()
+
+    def respond(self, response, accept='gzip, deflate'):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def json_response(self, body=None):
+        return HttpResponse(self.body if body is None else body,
+                            content_type='application/json')
+
+    def test_compresses_large_json(self):
+        response = self.respond(self.json_response())
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(int(response['Content-Length']),
+                         len(response.content))
+        self.assertEqual(gzip.decompress(response.content), self.body)
+
+    def test_skips_small_unaccepted_and_other_types(self):
+        small = self.respond(self.json_response(b'{}'))
+        self.assertFalse(small.has_header('Content-Encoding'))
+        self.assertEqual(small['Vary'], 'Accept-Encoding')
+
+        identity = self.respond(self.json_response(), accept='br')
+        self.assertFalse(identity.has_header('Content-Encoding'))
+
+        image = self.respond(HttpResponse(self.body,
+                                          content_type='image/png'))
+        self.assertFalse(image.has_header('Content-Encoding'))
+        self.assertFalse(image.has_header('Vary'))
+
+    def test_negotiation(self):
+        with self.settings(COMPRESSION_ENCODINGS=['zstd', 'br', 'gzip']):
+            self.assertEqual(negotiate_encoding('gzip;q=1, br;q=0.5'), 'gzip')
+            self.assertIsNone(negotiate_encoding('gzip;q=0'))
+            self.assertIsNone(negotiate_encoding(''))
+            self.assertEqual(negotiate_encoding('*'), negotiate_encoding(
+                'zstd, br, gzip'))
+
+    def test_cached_responses_are_compressed_once(self):
+        def cached_response():
+            response = self.json_response()
+            response.compression_cache_timeout = 60
+            return response
+
+        with patch('config.middelware.compression.gzip_compress',
+                   wraps=gzip.compress) as compress:
+            first = self.respond(cached_response())
+            second = self.respond(cached_response())
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(compress.call_count, 1)
+
+    @override_settings(COMPRESSION_CACHE_ENCODINGS=['br'])
+    def test_other_encodings_skip_the_cache(self):
+        response = self.json_response()
+        response.compression_cache_timeout = 60
+
+        with patch.object(caches['default'], 'get') as cache_get:
+            compressed = self.respond(response)
+        self.assertEqual(gzip.decompress(compressed.content), self.body)
+        cache_get.assert_not_called()
+
+
+class MessagePackTest(SimpleTestCase):
+
+    def test_round_trip_converts_like_json(self):
+        value = uuid.uuid4()
+        body = MessagePackRenderer().render(
+            {'uuid': value, 'genres': ('Drama', 'Comedy')})
+        self.assertEqual(
+            MessagePackParser().parse(io.BytesIO(body)),
+            {'uuid': str(value), 'genres': ['Drama', 'Comedy']})
+
+    def test_malformed_body(self):
+        for body in (b'\xc1', b'\x92\x01', b'\x81\x90\x01'):
+            with self.assertRaises(ParseError):
+                MessagePackParser().parse(io.BytesIO(body))
+
+
+@override_settings(CACHES={'default': {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+}})
+class SharedCacheTest(SimpleTestCase):
+
+    def test_one_process_may_use_local_cache(self):
+        check_shared_caches(processes=1)
+
+    def test_several_processes_need_shared_cache(self):
+        with self.assertRaises(ImproperlyConfigured):
+            check_shared_caches(processes=3)
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': 'redis://127.0.0.1:6379/1',
+    }})
+    def test_redis_is_shared(self):
+        check_shared_caches(processes=3)
+
+    @override_settings(MOVIE_API_RATE=10)
+    def test_upstream_rate_limiter_needs_shared_cache(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, 'MOVIE_API'):
+            check_shared_caches(processes=3)
+
+    @override_settings(REST_FRAMEWORK={'DEFAULT_THROTTLE_RATES': {
+        'user': '10/min'}})
+    def test_throttling_needs_shared_cache(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, 'throttling'):
+            check_shared_caches(processes=3)
+
+    @override_settings(DATABASE_REPLICA_ALIASES=['replica_0'])
+    def test_replica_pinning_needs_shared_cache(self):
+        with self.assertRaisesMessage(ImproperlyConfigured,
+                                      'read-your-writes'):
+            check_shared_caches(processes=3)
+
+
+class ProfileStartupCommandTest(SimpleTestCase):
+
+    def test_parse_importtime(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        300 |   requests.api\n"
+            "import time:       450 |        750 | requests\n"
+        )
+        modules = Command.parse_importtime(output)
+        self.assertEqual(modules, [('requests.api', 0.12, 0.3),
+                                   ('requests', 0.45, 0.75)])
+
+
+class UUID7Test(SimpleTestCase):
+
+    def test_layout(self):
+        before = time.time_ns() // 1_000_000
+        value = uuid7()
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+        self.assertLessEqual(abs((value.int >> 80) - before), 1000)
+
+    def test_increasing(self):
+        values = [uuid7() for _ in range(10000)]
+        self.assertEqual(values, sorted(values))
+        self.assertEqual([value.hex for value in values],
+                         sorted(value.hex for value in values))
+        self.assertEqual(len(set(values)), len(values))
+
+
+class SQLiteProfileTest(SimpleTestCase):
+
+    # DATABASES cannot be swapped under an open connection, so the profile
+    # gets a connection of its own, on a file since WAL needs one.
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        handler = ConnectionHandler({"default": {
+            "ENGINE": "config.db.sqlite3",
+            "NAME": os.path.join(directory.name, "db.sqlite3"),
+            "OPTIONS": {
+                "timeout": 7,
+                "transaction_mode": "IMMEDIATE",
+                "pragmas": {"journal_mode": "WAL", "synchronous": "NORMAL"},
+            },
+        }})
+        self.connection = connections["sqlite_profile"] = handler["default"]
+        self.addCleanup(self.connection.close)
+        self.addCleanup(connections.__delitem__, "sqlite_profile")
+
+    def pragma(self, name):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_pragmas_are_applied(self):
+        self.assertEqual(self.pragma("journal_mode"), "wal")
+        # NORMAL
+        self.assertEqual(self.pragma("synchronous"), 1)
+        self.assertEqual(self.pragma("busy_timeout"), 7000)
+
+    def test_write_transactions_begin_immediate(self):
+        with CaptureQueriesContext(self.connection) as queries:
+            with transaction.atomic(using="sqlite_profile"):
+                with self.connection.cursor() as cursor:
+                    cursor.execute("CREATE TABLE t (id INTEGER)")
+        self.assertEqual(queries[0]["sql"], "BEGIN IMMEDIATE")
@@ -0,0 +1,104 @@
+"""
+DRF throttles that count requests per fixed window with one atomic counter
+instead of ``SimpleRateThrottle``'s list of timestamps, which costs a read
+and a write of the whole history per request and loses updates under
+concurrency.
+
+On django-redis the counter is bumped and given its expiry by a Lua script
+in a single round trip. Other backends use ``add`` and ``incr``.
+
+Counters are only shared when the cache is: on a per process LocMemCache
+each gunicorn worker counts on its own, multiplying every rate by the number
+of workers. Gunicorn therefore refuses to start several workers with
+throttling on a process local cache, see ``api.utils.shared_cache``.
+"""
+
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import (ScopedRateThrottle,
+                                       SimpleRateThrottle, UserRateThrottle)
+
+from .redis_cache import get_raw_client, get_script
+
+COUNTER_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+
+
+class CounterRateThrottle(SimpleRateThrottle):
+
+    cache_alias = "default"
+
+    @property
+    def counters(self):
+        cache = caches[self.cache_alias]
+        # Counters live in the shared tier of the tiered cache.
+        return getattr(cache, "remote", cache)
+
+    def get_rate(self):
+        # Read the rates on every request rather than once at import, so
+        # they follow the settings.
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        window = int(now // self.duration)
+        self.wait_seconds = (window + 1) * self.duration - now
+        count = self.incr(f"{self.key}:{window}")
+        return count <= self.num_requests
+
+    def incr(self, key: str) -> int:
+        """
+        Counts a request in the window ``key``.
+
+        Args:
+            key (str): The counter of the current window.
+
+        Returns:
+            int: Requests counted in the window so far.
+        """
+        cache = self.counters
+        client = get_raw_client(cache)
+        if client is not None:
+            script = get_script(client, COUNTER_SCRIPT)
+            return int(script(keys=[cache.make_and_validate_key(key)],
+                              args=[self.duration + 1]))
+
+        cache.add(key, 0, timeout=self.duration + 1)
+        return cache.incr(key)
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class UserCounterThrottle(CounterRateThrottle, UserRateThrottle):
+
+    """Limits every user, or client IP when anonymous, to the ``user`` rate."""
+
+
+class ScopedCounterThrottle(CounterRateThrottle, ScopedRateThrottle):
+
+    """
+    Limits each user per ``throttle_scope`` of the view. Views without a
+    scope, or with no rate for it, are not limited.
+    """
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
@@ -0,0 +1,356 @@
+"""
+Two tier cache backend: a bounded in-process LRU in front of a shared cache.
+
+    CACHES = {
+        "default": {
+            "BACKEND": "api.utils.tiered_cache.TieredCache",
+            "OPTIONS": {
+                "REMOTE": "redis",           # alias of the shared cache
+                "LOCAL_MAX_ENTRIES": 1024,
+                "LOCAL_TIMEOUT": 5,          # seconds an entry stays local
+                "INVALIDATION_CHANNEL": "cache-invalidation",
+                "INVALIDATION_PING_INTERVAL": 30,
+            },
+        },
+        "redis": {...},
+    }
+
+Reads are served from the local tier when possible. Writes go to the shared
+cache and, when it is a django-redis backend, are published on a pub/sub
+channel so every worker drops its local copy. Counters (``incr``/``decr``)
+are not broadcast; other workers see the new value after ``LOCAL_TIMEOUT``.
+
+The listener has a connection of its own without a socket timeout, so an
+idle channel does not make redis-py reconnect and drop messages behind our
+back. It pings every ``INVALIDATION_PING_INTERVAL`` seconds instead, and
+clears the local tier whenever it (re)subscribes, since anything published
+while it was disconnected was missed.
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.utils.functional import cached_property
+
+from .ttl_cache import MISSING, TTLCache
+
+logger = logging.getLogger(__name__)
+
+CLEAR_ALL = "*"
+
+
+class LocalTier:
+
+    """
+    The in-process tier. Django creates a cache backend per thread, so this
+    state is shared by every ``TieredCache`` of the same configuration in
+    the process.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.hits = {"local": 0, "remote": 0}
+        self.misses = 0
+        self.origin = None
+        self.subscriber_pid = None
+        self.lock = threading.Lock()
+
+
+_local_tiers = {}
+_local_tiers_lock = threading.Lock()
+
+
+def get_local_tier(name, maxsize, ttl):
+    with _local_tiers_lock:
+        if name not in _local_tiers:
+            _local_tiers[name] = LocalTier(maxsize, ttl)
+        return _local_tiers[name]
+
+
+class TieredCache(BaseCache):
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self.remote_alias = options.get("REMOTE", "redis")
+        self.channel = options.get("INVALIDATION_CHANNEL",
+                                   "cache-invalidation")
+        self.ping_interval = options.get("INVALIDATION_PING_INTERVAL", 30)
+        self.tier = get_local_tier(
+            (location, self.remote_alias, self.channel),
+            maxsize=options.get("LOCAL_MAX_ENTRIES", 1024),
+            ttl=options.get("LOCAL_TIMEOUT", 5),
+        )
+        self.local = self.tier.cache
+
+    @cached_property
+    def remote(self):
+        return caches[self.remote_alias]
+
+    @cached_property
+    def redis(self):
+        """The raw Redis client of the remote tier, or None."""
+        try:
+            from django_redis import get_redis_connection
+            return get_redis_connection(self.remote_alias)
+        except (ImportError, NotImplementedError):
+            return None
+
+    def stats(self):
+        """
+        Returns hit and miss counters of this worker.
+
+        Returns:
+            Dict[str, Any]: Hits per tier, misses and hit ratios.
+        """
+        local, remote = self.tier.hits["local"], self.tier.hits["remote"]
+        misses = self.tier.misses
+        lookups = local + remote + misses
+        return {
+            "local_hits": local,
+            "remote_hits": remote,
+            "misses": misses,
+            "local_hit_ratio": local / lookups if lookups else 0.0,
+            "hit_ratio": (local + remote) / lookups if lookups else 0.0,
+            "local_entries": len(self.local),
+        }
+
+    def _local_ttl(self, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None:
+            return self.local.ttl
+        return min(max(timeout, 0), self.local.ttl)
+
+    def _get_remote(self, keys, version=None):
+        """
+        Reads keys from the remote tier together with what is left of their
+        timeouts. On Redis every ``GET`` and ``PTTL`` goes out in a single
+        pipeline, so this stays one round trip however many keys are read.
+
+        Returns:
+            Dict[str, Tuple[Any, Optional[float]]]: The value and remaining
+                seconds of every key found, seconds are None when unknown
+                or the key does not expire.
+        """
+        if self.redis is None:
+            return {key: (value, None) for key, value in
+                    self.remote.get_many(keys, version=version).items()}
+
+        client = self.remote.client
+        pipeline = self.redis.pipeline(transaction=False)
+        for key in keys:
+            remote_key = client.make_key(key, version=version)
+            pipeline.get(remote_key)
+            pipeline.pttl(remote_key)
+        replies = pipeline.execute()
+
+        found = {}
+        for key, value, pttl in zip(keys, replies[::2], replies[1::2]):
+            if value is not None:
+                found[key] = (client.decode(value),
+                              pttl / 1000 if pttl >= 0 else None)
+        return found
+
+    def _keep_remote_hit(self, local_key, value, remaining):
+        """
+        Copies a remote hit into the local tier for at most what is left of
+        its remote timeout, so the copy never outlives the remote entry.
+        """
+        ttl = self.local.ttl
+        if remaining is not None:
+            ttl = min(remaining, ttl)
+        if ttl > 0:
+            self.local.set(local_key, value, ttl=ttl)
+
+    def get(self, key, default=None, version=None):
+        self._ensure_subscriber()
+        local_key = self.make_and_validate_key(key, version=version)
+        value = self.local.get(local_key, MISSING)
+        if value is not MISSING:
+            self.tier.hits["local"] += 1
+            return value
+
+        found = self._get_remote([key], version=version)
+        if key not in found:
+            self.tier.misses += 1
+            return default
+
+        self.tier.hits["remote"] += 1
+        value, remaining = found[key]
+        self._keep_remote_hit(local_key, value, remaining)
+        return value
+
+    def get_many(self, keys, version=None):
+        self._ensure_subscriber()
+        found, pending = {}, []
+        for key in keys:
+            value = self.local.get(
+                self.make_and_validate_key(key, version=version), MISSING)
+            if value is MISSING:
+                pending.append(key)
+            else:
+                found[key] = value
+        self.tier.hits["local"] += len(found)
+
+        if pending:
+            remote_found = self._get_remote(pending, version=version)
+            self.tier.hits["remote"] += len(remote_found)
+            self.tier.misses += len(pending) - len(remote_found)
+            for key, (value, remaining) in remote_found.items():
+                self._keep_remote_hit(
+                    self.make_and_validate_key(key, version=version),
+                    value, remaining)
+                found[key] = value
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        self.remote.set(key, value, timeout=timeout, version=version)
+        self.local.set(local_key, value, ttl=self._local_ttl(timeout))
+        self._publish(local_key)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.remote.set_many(data, timeout=timeout, version=version)
+        local_keys = []
+        for key, value in data.items():
+            local_key = self.make_and_validate_key(key, version=version)
+            self.local.set(local_key, value, ttl=self._local_ttl(timeout))
+            local_keys.append(local_key)
+        self._publish(*local_keys)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.remote.add(key, value, timeout=timeout, version=version)
+        if added:
+            self._invalidate(self.make_and_validate_key(key, version=version))
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self._invalidate(self.make_and_validate_key(key, version=version))
+        return self.remote.touch(key, timeout=timeout, version=version)
+
+    def delete(self, key, version=None):
+        self._invalidate(self.make_and_validate_key(key, version=version))
+        return self.remote.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        self._invalidate(*[self.make_and_validate_key(key, version=version)
+                           for key in keys])
+        self.remote.delete_many(keys, version=version)
+
+    def has_key(self, key, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        if self.local.get(local_key, MISSING) is not MISSING:
+            return True
+        return self.remote.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        value = self.remote.incr(key, delta, version=version)
+        self.local.set(self.make_and_validate_key(key, version=version),
+                       value)
+        return value
+
+    def decr(self, key, delta=1, version=None):
+        return self.incr(key, -delta, version=version)
+
+    def clear(self):
+        self.local.clear()
+        self.remote.clear()
+        self._publish(CLEAR_ALL)
+
+    def close(self, **kwargs):
+        self.remote.close(**kwargs)
+
+    def _invalidate(self, *local_keys):
+        for local_key in local_keys:
+            self.local.delete(local_key)
+        self._publish(*local_keys)
+
+    def _publish(self, *local_keys):
+        if self.redis is None or not local_keys:
+            return
+        self._ensure_subscriber()
+        try:
+            self.redis.publish(
+                self.channel, "\n".join((self.tier.origin, *local_keys)))
+        except Exception:
+            # Other workers fall back to LOCAL_TIMEOUT expiry.
+            logger.exception("Cache invalidation publish failed")
+
+    def _ensure_subscriber(self):
+        """Starts the invalidation listener once per process."""
+        tier = self.tier
+        if tier.subscriber_pid == os.getpid() or self.redis is None:
+            return
+        with tier.lock:
+            if tier.subscriber_pid == os.getpid():
+                return
+            # Entries copied from a parent process may already be stale.
+            self.local.clear()
+            tier.origin = uuid.uuid4().hex
+            threading.Thread(target=self._listen, daemon=True,
+                             name="cache-invalidation").start()
+            tier.subscriber_pid = os.getpid()
+
+    def _listener_client(self):
+        """
+        Returns a client on a connection of its own for the listener: no
+        socket timeout, TCP keepalive, and no silent reconnects, so every
+        disconnect reaches ``_listen``.
+        """
+        from redis.connection import Connection
+
+        pool = self.redis.connection_pool
+        kwargs = {
+            **pool.connection_kwargs,
+            "socket_timeout": None,
+            "retry_on_timeout": False,
+            "retry_on_error": [],
+            "retry": None,
+            "health_check_interval": self.ping_interval,
+        }
+        if issubclass(pool.connection_class, Connection):
+            # Unix socket connections have no keepalive.
+            kwargs["socket_keepalive"] = True
+        return self.redis.__class__(connection_pool=pool.__class__(
+            connection_class=pool.connection_class, max_connections=1,
+            **kwargs))
+
+    def _listen(self):
+        client = self._listener_client()
+        while True:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                # Messages published before the subscription were missed.
+                self.local.clear()
+                while True:
+                    # Returns at least every ping interval, which lets the
+                    # health check ping the server.
+                    message = pubsub.get_message(timeout=self.ping_interval)
+                    if message is not None:
+                        self._handle_invalidation(message["data"])
+            except Exception:
+                logger.exception("Cache invalidation listener failed")
+                self.local.clear()
+                time.sleep(1)
+            finally:
+                pubsub.close()
+
+    def _handle_invalidation(self, data):
+        if isinstance(data, bytes):
+            data = data.decode()
+        origin, *local_keys = data.split("\n")
+        if origin == self.tier.origin:
+            return
+        if CLEAR_ALL in local_keys:
+            self.local.clear()
+            return
+        for local_key in local_keys:
+            self.local.delete(local_key)
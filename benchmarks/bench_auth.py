@@ -0,0 +1,44 @@
+"""
+Per request authentication overhead: the stock simplejwt
+``JWTAuthentication`` (one ``User`` query per request) against
+``StatelessJWTAuthentication`` (token claims plus a cached user state).
+
+    python -m benchmarks.bench_auth [--iterations N]
+"""
+
+import argparse
+
+from benchmarks import measure, report, setup_django, temporary_database
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from api.user_auth.authentication import (StatelessJWTAuthentication,
+                                              user_state_cache)
+    from django.contrib.auth.models import User
+    from rest_framework.test import APIRequestFactory
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    with temporary_database():
+        user = User.objects.create_user(username="bench", password="bench")
+        token = RefreshToken.for_user(user).access_token
+        request = APIRequestFactory().get(
+            "/movies/", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        for name, backend in (
+            ("JWTAuthentication", JWTAuthentication()),
+            ("StatelessJWTAuthentication", StatelessJWTAuthentication()),
+        ):
+            user_state_cache.clear()
+            report(name, measure(lambda: backend.authenticate(request),
+                                 args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Syncing many collections one request at a time versus a single
+``POST /collections/batch/`` request.
+
+    python -m benchmarks.bench_collection_batch [--collections N]
+"""
+
+import argparse
+import time
+import uuid
+
+from benchmarks import setup_django, temporary_database
+
+
+def collection_payload(movies: int) -> dict:
+    return {
+        "title": "Benchmark",
+        "description": "Benchmark collection",
+        "movies": [
+            {"uuid": str(uuid.uuid4()), "title": "Movie",
+             "description": "Movie", "genres": "Drama"}
+            for _ in range(movies)
+        ],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--collections", type=int, default=1000)
+    parser.add_argument("--movies", type=int, default=5,
+                        help="movies per collection")
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    with temporary_database():
+        user = User.objects.create_user(username="bench", password="bench")
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION="Bearer " + str(
+            RefreshToken.for_user(user).access_token))
+
+        payloads = [collection_payload(args.movies)
+                    for _ in range(args.collections)]
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for payload in payloads:
+                response = client.post("/collections/", payload,
+                                       format="json")
+                assert response.status_code == 201, response.data
+            elapsed = time.perf_counter() - start
+        print(f"{args.collections} x POST /collections/   "
+              f"{elapsed:8.2f}s  {len(queries):>6} queries")
+
+        operations = [{"op": "create", "data": collection_payload(args.movies)}
+                      for _ in range(args.collections)]
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = client.post("/collections/batch/",
+                                   {"operations": operations}, format="json")
+            elapsed = time.perf_counter() - start
+        assert response.data["is_success"], response.data
+        print(f"1 x POST /collections/batch/ "
+              f"{elapsed:8.2f}s  {len(queries):>6} queries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Latency of ``DELETE /collections/<uuid>/`` for a large collection with each
+COLLECTION_DELETE_MODE, against the plain ORM cascade.
+
+    python -m benchmarks.bench_collection_delete [--movies N]
+"""
+
+import argparse
+import time
+
+from benchmarks import setup_django, temporary_database
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--movies", type=int, default=50000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from api.movies.models import Collection, Movie
+    from api.movies.services import DeleteCollectionService
+    from django.contrib.auth.models import User
+    from django.test import override_settings
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    def large_collection():
+        collection = Collection.objects.create(title="Benchmark")
+        Movie.objects.bulk_create(
+            Movie(collection=collection, title="Movie", genres="Drama")
+            for _ in range(args.movies))
+        return collection
+
+    with temporary_database():
+        user = User.objects.create_user(username="bench", password="bench")
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION="Bearer " + str(
+            RefreshToken.for_user(user).access_token))
+
+        collection = large_collection()
+        start = time.perf_counter()
+        Collection.all_objects.filter(uuid=collection.uuid).delete()
+        print(f"ORM delete, no request{time.perf_counter() - start:8.3f}s")
+
+        for mode in ("inline", "deferred"):
+            collection = large_collection()
+            with override_settings(COLLECTION_DELETE_MODE=mode):
+                start = time.perf_counter()
+                response = client.delete(f"/collections/{collection.uuid}/")
+                elapsed = time.perf_counter() - start
+            assert response.status_code == 204, response.status_code
+            print(f"DELETE ({mode:<8})     {elapsed:8.3f}s")
+
+        start = time.perf_counter()
+        DeleteCollectionService().purge_deleted_collections()
+        print(f"deferred purge        {time.perf_counter() - start:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Concurrent write throughput of ``POST /collections/`` against the configured
+database profile. Run it once per profile to compare them:
+
+    DATABASE_ENGINE=sqlite python -m benchmarks.bench_collection_writes
+    SQLITE_PERFORMANCE_PROFILE=true \
+        python -m benchmarks.bench_collection_writes
+    DATABASE_ENGINE=postgres python -m benchmarks.bench_collection_writes
+
+SQLite runs against a temporary database file so every thread gets its own
+connection, just like separate server workers.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import setup_django, temporary_database
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=50,
+                        help="requests per thread")
+    parser.add_argument("--movies", type=int, default=10,
+                        help="movies per collection")
+    args = parser.parse_args()
+
+    setup_django()
+
+    import uuid
+
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.db import connection, connections
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    test_name = None
+    if connection.vendor == "sqlite":
+        test_name = os.path.join(tempfile.mkdtemp(), "bench.sqlite3")
+
+    with temporary_database(test_name=test_name):
+        user = User.objects.create_user(username="bench", password="bench")
+        token = str(RefreshToken.for_user(user).access_token)
+
+        def worker(_):
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+            statuses = Counter()
+            try:
+                for _ in range(args.requests):
+                    payload = {
+                        "title": "Benchmark",
+                        "description": "Benchmark collection",
+                        "movies": [
+                            {"uuid": str(uuid.uuid4()), "title": "Movie",
+                             "description": "Movie", "genres": "Drama"}
+                            for _ in range(args.movies)
+                        ],
+                    }
+                    response = client.post("/collections/", payload,
+                                           format="json")
+                    statuses[response.status_code] += 1
+            finally:
+                connections.close_all()
+            return statuses
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as pool:
+            results = list(pool.map(worker, range(args.threads)))
+        elapsed = time.perf_counter() - start
+
+    statuses = sum(results, Counter())
+    total = sum(statuses.values())
+    print(f"engine: {settings.DATABASES['default']['ENGINE']}")
+    print(f"threads: {args.threads}  requests: {total}  "
+          f"elapsed: {elapsed:.2f}s")
+    print(f"throughput: {statuses[201] / elapsed:.1f} collections/s")
+    print(f"status codes: {dict(statuses)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Bytes on the wire and CPU time per response for each installed encoding,
+on a collection with its movies and on a large movie page, and the cost of
+a cached page through the middleware: a precompressed cache hit for
+``COMPRESSION_CACHE_ENCODINGS``, plain compression for the others.
+
+    python -m benchmarks.bench_compression [--movies 500]
+"""
+
+import argparse
+import json
+import uuid
+
+from benchmarks import measure, report, setup_django
+
+
+def movies(count: int) -> list:
+    return [{
+        "uuid": str(uuid.uuid4()),
+        "title": f"Movie {index}",
+        "description": f"The plot of movie {index}, told at some length. " * 4,
+        "genres": "Drama, Comedy, Thriller",
+    } for index in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--movies", type=int, default=500,
+                        help="movies in the collection, ten times as many "
+                             "on the movie page")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from config.middelware.compression import (CompressionMiddleware,
+                                               get_encoders)
+    from django.conf import settings
+    from django.core.cache import caches
+    from django.http import HttpResponse
+    from django.test import RequestFactory, override_settings
+
+    payloads = {
+        "collection": {"uuid": str(uuid.uuid4()), "title": "Favourites",
+                       "description": "Movies to watch again",
+                       "movies": movies(args.movies)},
+        "movie page": {"count": 45466, "next": "https://example.com/?page=3",
+                       "previous": "https://example.com/?page=1",
+                       "results": movies(args.movies * 10)},
+    }
+
+    for name, payload in payloads.items():
+        body = json.dumps(payload).encode()
+        print(f"{name}: {len(body)} bytes")
+        for encoding, encoder in get_encoders().items():
+            size = len(encoder(body))
+            report(f"  {encoding} {size} bytes "
+                   f"({size / len(body):.1%})",
+                   measure(lambda: encoder(body), args.iterations, warmup=2))
+
+        def cached_response():
+            response = HttpResponse(body, content_type="application/json")
+            response.compression_cache_timeout = 60
+            return response
+
+        middleware = CompressionMiddleware(lambda request: cached_response())
+        for encoding in get_encoders():
+            caches["default"].clear()
+            cached = encoding in settings.COMPRESSION_CACHE_ENCODINGS
+            with override_settings(COMPRESSION_ENCODINGS=[encoding]):
+                request = RequestFactory().get(
+                    "/", HTTP_ACCEPT_ENCODING=encoding)
+                report(f"  {encoding}, cached page, "
+                       + ("precompressed cache hit" if cached
+                          else "compressed every time"),
+                       measure(lambda: middleware(request), args.iterations,
+                               warmup=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Cost of ``logger.exception`` on the calling thread: a synchronous
+``WatchedFileHandler`` against the queued pipeline, with and without
+sampling of repeated exceptions.
+
+    python -m benchmarks.bench_logging [--iterations N]
+"""
+
+import argparse
+import logging
+import os
+import queue
+import tempfile
+from logging.handlers import QueueListener, WatchedFileHandler
+
+from benchmarks import measure, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    from api.utils.log_handlers import (ForkSafeQueueHandler, JsonFormatter,
+                                        RepeatedExceptionFilter)
+
+    log_dir = tempfile.mkdtemp()
+
+    def file_handler():
+        handler = WatchedFileHandler(os.path.join(log_dir, "bench.log"))
+        handler.setFormatter(JsonFormatter())
+        return handler
+
+    def queue_handler(sample):
+        handler = ForkSafeQueueHandler(queue.Queue(maxsize=100000))
+        handler.listener = QueueListener(handler.queue, file_handler())
+        if sample:
+            handler.addFilter(RepeatedExceptionFilter())
+        return handler
+
+    setups = {
+        "sync file handler": file_handler(),
+        "queue handler": queue_handler(sample=False),
+        "queue handler + sampling": queue_handler(sample=True),
+    }
+
+    for name, handler in setups.items():
+        logger = logging.getLogger(f"bench.{name}")
+        logger.propagate = False
+        logger.addHandler(handler)
+
+        def log_exception():
+            try:
+                raise ValueError("upstream failed")
+            except ValueError as e:
+                logger.exception(str(e))
+
+        report(name, measure(log_exception, args.iterations))
+        if isinstance(handler, ForkSafeQueueHandler):
+            handler._stop_listener()
+
+
+if __name__ == "__main__":
+    main()
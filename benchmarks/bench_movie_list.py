@@ -0,0 +1,67 @@
+"""
+Cost of turning a large upstream page into the ``/movies/`` response body:
+decoding with the standard library or orjson and rendering with DRF,
+against passing the body through with only the links rewritten.
+
+    python -m benchmarks.bench_movie_list [--movies 5000]
+"""
+
+import argparse
+import json
+import uuid
+from unittest.mock import patch
+
+from benchmarks import measure, report, setup_django
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--movies", type=int, default=5000,
+                        help="movies on the upstream page")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from api.movies.services import MovieListService
+    from api.movies.upstream import decode_page
+    from api.utils import fast_json
+    from django.test import RequestFactory, override_settings
+    from rest_framework.renderers import JSONRenderer
+
+    body = json.dumps({
+        "count": 45466, "next": "/?page=3", "previous": "/?page=1",
+        "results": [{
+            "uuid": str(uuid.uuid4()),
+            "title": f"Movie {i}",
+            "description": f"The plot of movie {i}, told at some length. " * 4,
+            "genres": "Drama, Comedy, Thriller",
+        } for i in range(args.movies)],
+    }).encode()
+    request = RequestFactory().get("/movies/", {"page": 2},
+                                   HTTP_HOST="localhost")
+    renderer = JSONRenderer()
+
+    def serve():
+        response, _ = MovieListService.build_response(body, 2, request)
+        if not isinstance(response, bytes):
+            response = renderer.render(response)
+        return response
+
+    print(f"{len(body) / 1024:.0f}KiB page, {args.movies} movies")
+    with patch.object(fast_json, "orjson", None):
+        report("decode json", measure(
+            lambda: decode_page(body), args.iterations, warmup=3))
+        report("decode json + render",
+               measure(serve, args.iterations, warmup=3))
+    if fast_json.orjson is not None:
+        report("decode orjson", measure(
+            lambda: decode_page(body), args.iterations, warmup=3))
+        report("decode orjson + render",
+               measure(serve, args.iterations, warmup=3))
+    with override_settings(MOVIE_LIST_PASSTHROUGH=True):
+        report("passthrough", measure(serve, args.iterations, warmup=3))
+
+
+if __name__ == "__main__":
+    main()
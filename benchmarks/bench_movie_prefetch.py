@@ -0,0 +1,68 @@
+"""
+Latency of paging sequentially through ``/movies/`` against a simulated
+upstream, with and without prefetching the next pages.
+
+    python -m benchmarks.bench_movie_prefetch [--upstream-ms 150]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from unittest.mock import patch
+
+from benchmarks import setup_django
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--upstream-ms", type=float, default=150,
+                        help="simulated upstream latency")
+    parser.add_argument("--think-ms", type=float, default=300,
+                        help="time a user spends on each page")
+    args = parser.parse_args()
+
+    setup_django()
+
+    from api.movies.page_cache import PagePrefetcher, RateBudget
+    from api.movies.services import MovieListService
+    from django.core.cache import cache
+    from django.test import RequestFactory, override_settings
+    from requests.models import Response
+
+    def upstream_get(self, endpoint, params=None):
+        time.sleep(args.upstream_ms / 1000)
+        page = int(endpoint.rsplit("=", 1)[1])
+        response = Response()
+        response.status_code = 200
+        response._content = json.dumps({
+            "count": 45466, "next": f"/?page={page + 1}", "previous": None,
+            "results": [{"title": f"Movie {page}"}],
+        }).encode()
+        return response
+
+    factory = RequestFactory()
+    service = MovieListService()
+    for prefetch_pages in (0, 2):
+        cache.clear()
+        # The rate budget is sized at import, give the benchmark its own.
+        with override_settings(MOVIE_PAGE_CACHE_TIMEOUT=60,
+                               MOVIE_PREFETCH_PAGES=prefetch_pages), \
+                patch.object(PagePrefetcher, "budget", RateBudget(100, 10)), \
+                patch("api.utils.api_client.APIClient.get", upstream_get):
+            samples = []
+            for page in range(1, args.pages + 1):
+                request = factory.get("/movies/", {"page": page},
+                                      HTTP_HOST="localhost")
+                start = time.perf_counter()
+                service.get_list(request)
+                samples.append((time.perf_counter() - start) * 1000)
+                time.sleep(args.think_ms / 1000)
+        print(f"prefetch {prefetch_pages} pages: "
+              f"median {statistics.median(samples):7.1f}ms  "
+              f"mean {statistics.fmean(samples):7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Encode and decode time and payload size of a large collection with the
+MessagePack renderer and parser against DRF's JSON ones.
+
+    python -m benchmarks.bench_msgpack [--movies 10000]
+"""
+
+import argparse
+import io
+import uuid
+
+from benchmarks import measure, report, setup_django
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--movies", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from api.utils.renderers import MessagePackParser, MessagePackRenderer
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    # Shaped like CollectionSerializer output.
+    collection = {
+        "uuid": str(uuid.uuid4()),
+        "title": "Favourites",
+        "description": "Movies to watch again",
+        "movies": [{
+            "uuid": str(uuid.uuid4()),
+            "title": f"Movie {index}",
+            "description": f"The plot of movie {index}. " * 8,
+            "genres": "Drama, Comedy, Thriller",
+        } for index in range(args.movies)],
+    }
+
+    formats = {
+        "json": (JSONRenderer(), JSONParser()),
+        "msgpack": (MessagePackRenderer(), MessagePackParser()),
+    }
+    print(f"collection with {args.movies} movies")
+    for name, (renderer, body_parser) in formats.items():
+        body = renderer.render(collection)
+        report(f"{name} encode ({len(body)} bytes)",
+               measure(lambda: renderer.render(collection), args.iterations,
+                       warmup=3))
+        report(f"{name} decode",
+               measure(lambda: body_parser.parse(io.BytesIO(body)),
+                       args.iterations, warmup=3))
+
+
+if __name__ == "__main__":
+    main()
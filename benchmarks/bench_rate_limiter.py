@@ -0,0 +1,89 @@
+"""
+A burst of concurrent ``/movies/`` upstream calls against a simulated
+upstream that answers 429 above ``--upstream-rate`` requests per second,
+with and without the shared client side rate limiter.
+
+    python -m benchmarks.bench_rate_limiter
+    REDIS_URL=redis://localhost:6379/1 CACHE_BACKEND=redis \
+        python -m benchmarks.bench_rate_limiter
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from benchmarks import setup_django
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--calls", type=int, default=10,
+                        help="calls per thread")
+    parser.add_argument("--upstream-rate", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from api.utils.api_client import APIClient, UpstreamRateLimited
+    from api.utils.rate_limiter import TokenBucketRateLimiter
+    from django.core.cache import cache
+    from requests.models import Response
+
+    lock = threading.Lock()
+    windows = Counter()
+
+    def upstream_get(self, url, **kwargs):
+        with lock:
+            second = int(time.time())
+            windows[second] += 1
+            throttled = windows[second] > args.upstream_rate
+        response = Response()
+        response.status_code = 429 if throttled else 200
+        response._content = b"{}"
+        return response
+
+    for limited in (False, True):
+        cache.clear()
+        windows.clear()
+        limiter = (TokenBucketRateLimiter("bench", args.upstream_rate,
+                                          burst=args.upstream_rate // 2)
+                   if limited else None)
+
+        def worker(_):
+            client = APIClient("https://upstream", "user", "password",
+                               rate_limiter=limiter, max_wait=30)
+            results = []
+            for _ in range(args.calls):
+                start = time.perf_counter()
+                try:
+                    status = client.get("/?page=1").status_code
+                except UpstreamRateLimited:
+                    status = "limited"
+                results.append((status, time.perf_counter() - start))
+            return results
+
+        with patch("requests.Session.get", upstream_get):
+            start = time.perf_counter()
+            with ThreadPoolExecutor(args.threads) as pool:
+                results = sum(pool.map(worker, range(args.threads)), [])
+            elapsed = time.perf_counter() - start
+
+        statuses = Counter(status for status, _ in results)
+        latencies = sorted(latency * 1000 for _, latency in results)
+        print(f"{'limiter' if limited else 'no limiter':<11} "
+              f"elapsed {elapsed:5.2f}s  statuses {dict(statuses)}  "
+              f"p50 {statistics.median(latencies):7.1f}ms  "
+              f"p95 {latencies[int(len(latencies) * 0.95) - 1]:7.1f}ms")
+        if limiter is not None:
+            print(f"            {limiter.stats()}")
+
+
+if __name__ == "__main__":
+    main()
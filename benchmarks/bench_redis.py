@@ -0,0 +1,107 @@
+"""
+Redis cache options: serializers, compression of large values, and
+pipelined counter and multi-key paths.
+
+Runs against REDIS_URL when set. Otherwise it starts fakeredis's TCP server
+(pip install fakeredis lupa) as a local Redis-compatible stand-in. Absolute
+numbers from the stand-in are not representative of a real Redis server,
+but the number of round trips and payload sizes are.
+
+    python -m benchmarks.bench_redis [--iterations N]
+"""
+
+import argparse
+import os
+import threading
+import uuid
+
+from benchmarks import measure, report, setup_django
+
+
+def start_stand_in() -> str:
+    from fakeredis import TcpFakeServer
+
+    server = TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return f"redis://{host}:{port}/1"
+
+
+def movie_page(movies: int = 100) -> dict:
+    return {
+        "count": 45466,
+        "next": "https://example.com/movies/?page=2",
+        "previous": None,
+        "results": [
+            {"uuid": str(uuid.uuid4()), "title": f"Movie {index}",
+             "description": f"Plot of movie {index}. " * 20,
+             "genres": "Action, Drama"}
+            for index in range(movies)
+        ],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    location = os.getenv("REDIS_URL") or start_stand_in()
+    setup_django()
+
+    from api.counter.services import RequestCounterService
+    from django.conf import settings
+    from django.core.cache import caches
+    from django.test import override_settings
+
+    def redis_cache(serializer: str, compress: bool) -> dict:
+        options = dict(settings.REDIS_CACHE["OPTIONS"])
+        options["SERIALIZER"] = settings.REDIS_SERIALIZERS[serializer]
+        if not compress:
+            options["COMPRESSOR"] = (
+                "django_redis.compressors.identity.IdentityCompressor")
+        return {**settings.REDIS_CACHE, "LOCATION": location,
+                "OPTIONS": options}
+
+    page = movie_page()
+    for serializer in settings.REDIS_SERIALIZERS:
+        for compress in (False, True):
+            name = f"{serializer}{' + zlib' if compress else ''}"
+            with override_settings(CACHES={
+                    "default": redis_cache(serializer, compress)}):
+                cache = caches["default"]
+                cache.set("page", page)
+                size = cache.client.get_client().strlen(
+                    cache.make_key("page"))
+                report(f"set page {name}",
+                       measure(lambda: cache.set("page", page),
+                               args.iterations))
+                report(f"get page {name} ({size} bytes)",
+                       measure(lambda: cache.get("page"), args.iterations))
+
+    with override_settings(CACHES={"default": redis_cache("pickle", True)}):
+        cache = caches["default"]
+
+        def counter_get_set_incr():
+            if cache.get("request_count") is None:
+                cache.set("request_count", 0, timeout=None)
+            cache.incr("request_count")
+
+        counter = RequestCounterService()
+        report("counter get + incr (old middleware)",
+               measure(counter_get_set_incr, args.iterations))
+        report("counter single INCR",
+               measure(counter.increment, args.iterations))
+
+        keys = [f"key{index}" for index in range(20)]
+        cache.set_many({key: index for index, key in enumerate(keys)})
+        report("20 x get",
+               measure(lambda: [cache.get(key) for key in keys],
+                       args.iterations // 10))
+        report("get_many(20)",
+               measure(lambda: cache.get_many(keys), args.iterations // 10))
+
+
+if __name__ == "__main__":
+    main()
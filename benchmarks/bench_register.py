@@ -0,0 +1,59 @@
+"""
+Registrations per second per core for each supported password hasher, plus
+the throughput under the hashing semaphore when several requests register
+at once.
+
+    python -m benchmarks.bench_register [--iterations N] [--concurrency N]
+"""
+
+import argparse
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import measure, report, setup_django, temporary_database
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from api.user_auth.serializers import RegisterSerializer
+    from django.conf import settings
+    from django.test import override_settings
+
+    counter = itertools.count()
+
+    def register():
+        serializer = RegisterSerializer(data={
+            "username": f"user{next(counter)}", "password": "password123"})
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+    with temporary_database():
+        for name, hasher in settings._PASSWORD_HASHER_CLASSES.items():
+            try:
+                with override_settings(PASSWORD_HASHERS=[hasher]):
+                    result = measure(register, args.iterations, warmup=1)
+                    report(f"{name} (1 thread)", result)
+
+                    start = time.perf_counter()
+                    with ThreadPoolExecutor(args.concurrency) as pool:
+                        futures = [pool.submit(register)
+                                   for _ in range(args.iterations)]
+                    for future in futures:
+                        future.result()
+                    elapsed = time.perf_counter() - start
+                    print(f"{name} ({args.concurrency} threads)".ljust(40),
+                          f"{args.iterations / elapsed:.1f} registrations/s")
+            except ValueError as e:
+                # Argon2 without argon2-cffi installed.
+                print(f"{name:<40} skipped: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Throughput of ``manage.py runserver`` against gunicorn with the production
+configuration (``config/gunicorn.conf.py``).
+
+Each server is started in turn on a free port and hammered with concurrent
+keep-alive clients for a fixed duration. The target is
+``/request-count/`` without credentials. It goes through the middleware
+stack and authentication but needs no database, so the numbers reflect
+server and framework overhead.
+
+    python -m benchmarks.bench_server [--duration S] [--clients N]
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+PATH = "/request-count/"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server at {url} did not start")
+
+
+def load(url: str, duration: float, clients: int) -> int:
+    deadline = time.monotonic() + duration
+
+    def client(_):
+        served = 0
+        with requests.Session() as session:
+            while time.monotonic() < deadline:
+                session.get(url, timeout=10)
+                served += 1
+        return served
+
+    with ThreadPoolExecutor(clients) as pool:
+        return sum(pool.map(client, range(clients)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--clients", type=int, default=16)
+    args = parser.parse_args()
+
+    servers = {
+        "runserver": lambda port: [
+            sys.executable, "manage.py", "runserver", "--noreload",
+            f"127.0.0.1:{port}"],
+        "gunicorn": lambda port: [
+            sys.executable, "-m", "gunicorn", "-c", "config/gunicorn.conf.py",
+            "--bind", f"127.0.0.1:{port}", "--access-logfile", "/dev/null"],
+    }
+
+    for name, command in servers.items():
+        port = free_port()
+        url = f"http://127.0.0.1:{port}{PATH}"
+        process = subprocess.Popen(
+            command(port), env=os.environ.copy(),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_until_ready(url)
+            served = load(url, args.duration, args.clients)
+            print(f"{name:<12} {served / args.duration:>10.1f} requests/s")
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
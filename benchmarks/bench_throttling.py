@@ -0,0 +1,81 @@
+"""
+Latency a throttle adds to each request: none, DRF's history based
+``UserRateThrottle``, and the counter throttles, on the local memory cache
+and on Redis.
+
+Runs against REDIS_URL when set. Otherwise it falls back to fakeredis's TCP
+server like ``bench_redis``, which runs in this process: those rows, labelled
+``fakeredis``, measure fakeredis and not the round trip to a Redis server.
+
+    python -m benchmarks.bench_throttling [--iterations N]
+"""
+
+import argparse
+import os
+from unittest.mock import patch
+
+from benchmarks import measure, report, setup_django
+from benchmarks.bench_redis import start_stand_in
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    location = os.getenv("REDIS_URL")
+    remote = "redis"
+    if not location:
+        location, remote = start_stand_in(), "fakeredis"
+        print("REDIS_URL is not set, the fakeredis rows run in this process "
+              "and do not measure a Redis round trip.")
+    setup_django()
+
+    from api.utils.throttling import (ScopedCounterThrottle,
+                                      UserCounterThrottle)
+    from django.conf import settings
+    from django.core.cache import caches
+    from django.test import override_settings
+    from rest_framework.response import Response
+    from rest_framework.test import APIRequestFactory
+    from rest_framework.throttling import SimpleRateThrottle, UserRateThrottle
+    from rest_framework.views import APIView
+
+    class PingView(APIView):
+        authentication_classes = []
+        permission_classes = []
+        throttle_scope = "ping"
+
+        def get(self, request):
+            return Response({})
+
+    # High enough that no request is rejected, only the bookkeeping counts.
+    rates = {"user": "1000000/min", "ping": "1000000/min"}
+    request = APIRequestFactory().get("/", REMOTE_ADDR="10.0.0.1")
+    throttles = {
+        "no throttle": [],
+        "UserRateThrottle (history)": [UserRateThrottle],
+        "UserCounterThrottle": [UserCounterThrottle],
+        "user + scoped counter": [UserCounterThrottle,
+                                  ScopedCounterThrottle],
+    }
+    backends = {
+        "locmem": {"BACKEND":
+                   "django.core.cache.backends.locmem.LocMemCache"},
+        remote: {**settings.REDIS_CACHE, "LOCATION": location},
+    }
+
+    for backend, cache_config in backends.items():
+        with override_settings(
+                CACHES={"default": cache_config},
+                REST_FRAMEWORK={"DEFAULT_THROTTLE_RATES": rates}), \
+                patch.object(SimpleRateThrottle, "THROTTLE_RATES", rates):
+            for name, classes in throttles.items():
+                caches["default"].clear()
+                view = PingView.as_view(throttle_classes=classes)
+                report(f"{backend} {name}",
+                       measure(lambda: view(request), args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Insert throughput and index size of a growing movie table with random
+(uuid4) against time ordered (uuid7) primary keys.
+
+Throughput is reported for each tenth of the rows, so the slowdown of
+random keys once the primary key index no longer fits in the page cache
+shows up as the table grows.
+
+    python -m benchmarks.bench_uuid_keys [--rows 1000000] [--batch 10000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import uuid
+
+from benchmarks import setup_django, temporary_database
+
+
+def relation_sizes(connection) -> dict:
+    """
+    Returns the on-disk size in bytes of the movie table and its indexes.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT c.relname, pg_relation_size(c.oid) FROM pg_class c "
+                "WHERE c.oid = 'movies_movie'::regclass OR c.oid IN ("
+                "SELECT indexrelid FROM pg_index "
+                "WHERE indrelid = 'movies_movie'::regclass)")
+        else:
+            # dbstat needs SQLITE_ENABLE_DBSTAT_VTAB, which the Python
+            # builds ship with.
+            cursor.execute(
+                "SELECT name, SUM(pgsize) FROM dbstat WHERE name IN ("
+                "SELECT name FROM sqlite_master "
+                "WHERE tbl_name = 'movies_movie') GROUP BY name")
+        return dict(cursor.fetchall())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--batch", type=int, default=10000,
+                        help="movies per transaction, each batch in a new "
+                             "collection")
+    args = parser.parse_args()
+
+    setup_django()
+
+    from api.movies.models import Collection, Movie
+    from api.utils.uuid7 import uuid7
+    from django.db import connection, transaction
+
+    for name, make_key in (("uuid4", uuid.uuid4), ("uuid7", uuid7)):
+        test_name = None
+        if connection.vendor == "sqlite":
+            test_name = os.path.join(tempfile.mkdtemp(), "bench.sqlite3")
+
+        with temporary_database(test_name=test_name) as db:
+            print(f"{name}: {args.rows} movies")
+            tenth = max(args.rows // 10, args.batch)
+            inserted, reported, elapsed = 0, 0, 0.0
+            while inserted < args.rows:
+                count = min(args.batch, args.rows - inserted)
+                start = time.perf_counter()
+                with transaction.atomic():
+                    collection = Collection.objects.create(
+                        uuid=make_key(), title="Benchmark")
+                    Movie.objects.bulk_create(
+                        Movie(uuid=make_key(), collection=collection,
+                              title=f"Movie {inserted + index}",
+                              genres="Drama, Comedy")
+                        for index in range(count))
+                elapsed += time.perf_counter() - start
+                inserted += count
+                if inserted % tenth < args.batch or inserted == args.rows:
+                    print(f"  {inserted:>9} rows  "
+                          f"{(inserted - reported) / elapsed:9.0f} rows/s")
+                    reported, elapsed = inserted, 0.0
+
+            for relation, size in sorted(relation_sizes(db).items()):
+                print(f"  {relation:<40} {size / 2 ** 20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
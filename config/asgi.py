@@ -8,9 +8,14 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 """
 
 import os
-
+import dotenv
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+dotenv.load_dotenv()
+env = os.getenv("ENVIRONMENT")
+if env:
+    if env not in ['development', 'production']:
+        env = 'base'
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', f'config.settings.{env or 'base'}')
 
 application = get_asgi_application()
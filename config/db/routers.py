@@ -0,0 +1,66 @@
+"""
+Routes ``api.movies`` reads to read replicas.
+
+Reads go to a random alias from ``DATABASE_REPLICA_ALIASES`` unless the
+current request is pinned to the primary, which happens for writes and for
+``REPLICA_STICKY_SECONDS`` after a user's last write so they always read
+their own changes. That window is kept in the default cache, which must be
+shared by the workers (see ``api.utils.shared_cache``) or a write on one
+worker would not pin the user's reads on the others.
+"""
+
+import random
+from contextvars import ContextVar, Token
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_use_primary = ContextVar("use_primary", default=False)
+
+STICKY_KEY_PREFIX = "replica_sticky"
+
+
+def pin_to_primary() -> Token:
+    """Sends all reads in the current context to the primary."""
+    return _use_primary.set(True)
+
+
+def unpin(token: Token) -> None:
+    _use_primary.reset(token)
+
+
+def mark_recent_write(user_id) -> None:
+    """Keeps the user's reads on the primary for the sticky window."""
+    caches["default"].set(f"{STICKY_KEY_PREFIX}:{user_id}", True,
+                          timeout=settings.REPLICA_STICKY_SECONDS)
+
+
+def has_recent_write(user_id) -> bool:
+    return caches["default"].get(f"{STICKY_KEY_PREFIX}:{user_id}", False)
+
+
+class PrimaryReplicaRouter:
+
+    route_app_labels = {"movies"}
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICA_ALIASES
+        if (
+            not replicas
+            or model._meta.app_label not in self.route_app_labels
+            or _use_primary.get()
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
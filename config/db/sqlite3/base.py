@@ -0,0 +1,35 @@
+"""
+SQLite backend tuned for concurrent writers.
+
+Extra ``OPTIONS`` on top of the stock backend:
+
+    "pragmas": {"journal_mode": "WAL", ...}  executed on every new connection
+    "transaction_mode": "IMMEDIATE"          used to open write transactions
+
+``BEGIN IMMEDIATE`` takes the write lock up front, so a transaction waits on
+``timeout`` (the busy timeout) instead of failing with "database is locked"
+when it tries to upgrade a read lock held by another writer.
+"""
+
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        self.pragmas = kwargs.pop("pragmas", {})
+        self.transaction_mode = kwargs.pop("transaction_mode", None)
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        if self.transaction_mode:
+            self.cursor().execute(f"BEGIN {self.transaction_mode}")
+        else:
+            super()._start_transaction_under_autocommit()
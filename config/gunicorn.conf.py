@@ -0,0 +1,54 @@
+"""
+Gunicorn configuration for production.
+
+    gunicorn -c config/gunicorn.conf.py
+
+Every value can be overridden through the matching GUNICORN_* variable.
+The application is loaded once in the master (``preload_app``), so HUP only
+restarts the workers on the already loaded code. Deploying new code needs a
+full restart, or USR2 to start a new master followed by TERM to the old one.
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+# gthread serves WSGI with a thread pool per worker. Set
+# GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker (pip install uvicorn)
+# to serve the ASGI application instead.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1)) # noqa
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+
+if "uvicorn" in worker_class:
+    wsgi_app = "config.asgi:application"
+else:
+    wsgi_app = "config.wsgi:application"
+
+# Import Django once in the master so workers share its memory pages
+# copy-on-write and boot faster.
+preload_app = True
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+
+# Recycle workers periodically to bound memory growth, with jitter so they
+# do not all restart at once.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+accesslog = os.getenv("GUNICORN_ACCESSLOG", "-")
+
+
+def on_starting(server):
+    # With preload_app Django is already set up in the master here.
+    from api.utils.shared_cache import check_shared_caches
+    check_shared_caches(server.cfg.workers)
+
+
+def post_fork(server, worker):
+    # Database connections must never be shared between processes.
+    from django.db import connections
+    connections.close_all()
@@ -0,0 +1,182 @@
+"""
+Compresses responses with the best encoding the client accepts: zstd or
+brotli when ``zstandard`` or ``brotli`` is installed, gzip otherwise.
+
+Responses below ``COMPRESSION_MIN_LENGTH`` bytes, streaming responses and
+content types outside ``COMPRESSION_CONTENT_TYPES`` are sent as they are.
+
+Views can mark a response whose body is served again and again, like a
+cached upstream page, with ``response.compression_cache_timeout``. Its
+compressed body is then kept in the cache under a digest of the content,
+so repeated hits skip compression. Only ``COMPRESSION_CACHE_ENCODINGS`` are
+cached: hashing the body and reading the cache costs about as much as
+compressing it with zstd.
+"""
+
+import gzip
+import hashlib
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+
+def gzip_compress(data: bytes) -> bytes:
+    # mtime=0 keeps the output identical for identical input.
+    return gzip.compress(data, compresslevel=settings.COMPRESSION_GZIP_LEVEL,
+                         mtime=0)
+
+
+def brotli_compress(data: bytes) -> bytes:
+    return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+
+def zstd_compress(data: bytes) -> bytes:
+    return zstandard.ZstdCompressor(
+        level=settings.COMPRESSION_ZSTD_LEVEL).compress(data)
+
+
+def get_encoders() -> Dict[str, Callable[[bytes], bytes]]:
+    """
+    Returns the installed encoders, by content coding.
+
+    Returns:
+        Dict[str, Callable[[bytes], bytes]]: Compress functions.
+    """
+    encoders = {"gzip": gzip_compress}
+    if brotli is not None:
+        encoders["br"] = brotli_compress
+    if zstandard is not None:
+        encoders["zstd"] = zstd_compress
+    return encoders
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """
+    Parses an ``Accept-Encoding`` header into quality values.
+
+    Args:
+        header (str): The header, e.g. ``"gzip, br;q=0.9, *;q=0"``.
+
+    Returns:
+        Dict[str, float]: The quality of each content coding.
+    """
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def negotiate_encoding(header: str) -> Optional[str]:
+    """
+    Picks the content coding for a response.
+
+    Args:
+        header (str): The request's ``Accept-Encoding`` header.
+
+    Returns:
+        Optional[str]: The accepted coding with the highest quality, ties
+            going to the first in ``COMPRESSION_ENCODINGS``, or None.
+    """
+    accepted = parse_accept_encoding(header)
+    encoders = get_encoders()
+    best, best_quality = None, 0.0
+    for coding in settings.COMPRESSION_ENCODINGS:
+        if coding not in encoders:
+            continue
+        quality = accepted.get(coding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class CompressionMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.is_compressible(response):
+            return response
+
+        # The body depends on Accept-Encoding whether or not it is
+        # compressed this time.
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if len(response.content) < settings.COMPRESSION_MIN_LENGTH:
+            return response
+
+        encoding = negotiate_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        compressed = self.compress(response, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        response.headers["Content-Encoding"] = encoding
+        # The compressed body is no longer byte for byte what a strong
+        # ETag promised.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        return response
+
+    def is_compressible(self, response) -> bool:
+        if response.streaming or response.has_header("Content-Encoding"):
+            return False
+        content_type = response.get("Content-Type", "").split(";")[0]
+        return content_type.startswith(settings.COMPRESSION_CONTENT_TYPES)
+
+    def compress(self, response, encoding: str) -> bytes:
+        """
+        Compresses the response body, through the cache when the view
+        marked the response with ``compression_cache_timeout`` and the
+        encoding is one of ``COMPRESSION_CACHE_ENCODINGS``.
+
+        Args:
+            response (HttpResponse): The rendered response.
+            encoding (str): The negotiated content coding.
+
+        Returns:
+            bytes: The compressed body.
+        """
+        encoder = get_encoders()[encoding]
+        timeout = getattr(response, "compression_cache_timeout", None)
+        if (not timeout
+                or encoding not in settings.COMPRESSION_CACHE_ENCODINGS):
+            return encoder(response.content)
+
+        cache = caches["default"]
+        digest = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+        key = f"compressed:{encoding}:{digest}"
+        compressed = cache.get(key)
+        if compressed is None:
+            compressed = encoder(response.content)
+            cache.set(key, compressed, timeout=timeout)
+        return compressed
@@ -1,17 +1,14 @@
 # middleware.py
-from django.core.cache import caches
+from api.counter.services import RequestCounterService
 
 
 class RequestCountMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
+        self.request_counter_service = RequestCounterService()
 
     def __call__(self, request):
 
-        caches_ = caches['default']
-        if caches_.get('request_count') is None:
-            caches_.set('request_count', 0,  timeout=None)
-
-        caches_.incr('request_count')
+        self.request_counter_service.increment()
         response = self.get_response(request)
         return response
@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 from pathlib import Path
 import os
 from datetime import timedelta
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -45,12 +46,15 @@ INSTALLED_APPS = [
     "api.movies",
     "api.user_auth",
     'api.counter',
+    "api.jobs",
+    "api.utils",
     "rest_framework",
     "corsheaders",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "config.middelware.compression.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -83,21 +87,102 @@ WSGI_APPLICATION = "config.wsgi.application"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.user_auth.authentication.StatelessJWTAuthentication",
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
+    "DEFAULT_THROTTLE_CLASSES": [
+        "api.utils.throttling.UserCounterThrottle",
+        "api.utils.throttling.ScopedCounterThrottle",
+    ],
+    # "<requests>/<s|min|hour|day>" per user, or per IP when anonymous. An
+    # empty value turns the throttle off.
+    "DEFAULT_THROTTLE_RATES": {
+        "user": os.getenv("THROTTLE_USER_RATE", "1000/min") or None,
+        "movies": os.getenv("THROTTLE_MOVIES_RATE", "60/min") or None,
+        "collections-write": os.getenv(
+            "THROTTLE_COLLECTIONS_WRITE_RATE", "120/min") or None,
+    },
 }
 
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# DATABASE_ENGINE selects the profile: "sqlite" (default, single writer,
+# fine for development) or "postgres" for deployments.
+
+DATABASE_ENGINE = os.getenv("DATABASE_ENGINE", "sqlite")
+
+if DATABASE_ENGINE == "postgres":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.getenv("DB_NAME"),
+            "USER": os.getenv("DB_USER"),
+            "PASSWORD": os.getenv("DB_PASSWORD"),
+            "HOST": os.getenv("DB_HOST"),
+            "PORT": os.getenv("DB_PORT", "5432"),
+            # Keep connections open between requests and verify them before
+            # reuse instead of reconnecting on every request.
+            "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", 60)),
+            "CONN_HEALTH_CHECKS": True,
+            # Server side cursors do not survive transaction pooling, turn
+            # them off when connecting through PgBouncer.
+            "DISABLE_SERVER_SIDE_CURSORS": os.getenv(
+                "DB_PGBOUNCER", "").lower() in ("1", "true", "yes"),
+            "OPTIONS": {
+                "connect_timeout": int(os.getenv("DB_CONNECT_TIMEOUT", 5)),
+            },
+        }
     }
-}
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+        }
+    }
+
+# Read replicas: comma separated hosts that mirror the PostgreSQL primary.
+# Collection reads are spread over them, see config.db.routers.
+_REPLICA_HOSTS = [
+    host.strip() for host in os.getenv("DATABASE_REPLICAS", "").split(",")
+    if host.strip()
+]
+DATABASE_REPLICA_ALIASES = [
+    f"replica_{index}" for index in range(len(_REPLICA_HOSTS))
+]
+DATABASES.update({
+    alias: {**DATABASES["default"], "HOST": host,
+            "TEST": {"MIRROR": "default"}}
+    for alias, host in zip(DATABASE_REPLICA_ALIASES, _REPLICA_HOSTS)
+})
+
+DATABASE_ROUTERS = ["config.db.routers.PrimaryReplicaRouter"]
+
+# Seconds a user's reads stay on the primary after they write.
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", 5))
+
+# Opt-in SQLite profile for small deployments with concurrent writers: WAL
+# lets readers run alongside the writer and write transactions queue on the
+# busy timeout instead of failing with "database is locked".
+if DATABASE_ENGINE == "sqlite" and os.getenv(
+        "SQLITE_PERFORMANCE_PROFILE", "").lower() in ("1", "true", "yes"):
+    DATABASES["default"].update({
+        "ENGINE": "config.db.sqlite3",
+        "OPTIONS": {
+            "timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", 20)),
+            "transaction_mode": "IMMEDIATE",
+            "pragmas": {
+                "journal_mode": "WAL",
+                "synchronous": "NORMAL",
+                # Negative values are KiB, i.e. a 64 MiB page cache.
+                "cache_size": -64000,
+                "mmap_size": 268435456,
+                "temp_store": "MEMORY",
+            },
+        },
+    })
 
 
 # Password validation
@@ -119,6 +204,41 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# https://docs.djangoproject.com/en/5.0/topics/auth/passwords/
+# PASSWORD_HASHER selects the hasher for new passwords: pbkdf2 (default),
+# argon2 (needs argon2-cffi) or scrypt. The others stay enabled so existing
+# hashes keep verifying and are upgraded on the next login.
+
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "pbkdf2")
+
+_PASSWORD_HASHER_CLASSES = {
+    "pbkdf2": "api.user_auth.hashers.TunedPBKDF2PasswordHasher",
+    "argon2": "api.user_auth.hashers.TunedArgon2PasswordHasher",
+    "scrypt": "api.user_auth.hashers.TunedScryptPasswordHasher",
+}
+
+if PASSWORD_HASHER not in _PASSWORD_HASHER_CLASSES:
+    raise ImproperlyConfigured(
+        f"PASSWORD_HASHER must be one of {', '.join(_PASSWORD_HASHER_CLASSES)}"
+        f", not {PASSWORD_HASHER!r}")
+
+PASSWORD_HASHERS = [_PASSWORD_HASHER_CLASSES[PASSWORD_HASHER]] + [
+    hasher for name, hasher in _PASSWORD_HASHER_CLASSES.items()
+    if name != PASSWORD_HASHER
+] + ["django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher"]
+
+PBKDF2_ITERATIONS = int(os.getenv("PBKDF2_ITERATIONS", 720000))
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", 2))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", 102400))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", 8))
+SCRYPT_WORK_FACTOR = int(os.getenv("SCRYPT_WORK_FACTOR", 2**14))
+
+# How many passwords a worker hashes at once, further requests wait.
+PASSWORD_HASHING_WORKERS = int(
+    os.getenv("PASSWORD_HASHING_WORKERS", os.cpu_count() or 1))
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
 
@@ -145,6 +265,55 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 MOVIE_API = os.getenv("MOVIE_API")
 MOVIE_API_USERNAME = os.getenv("MOVIE_API_USERNAME")
 MOVIE_API_PASSWORD = os.getenv("MOVIE_API_PASSWORD")
+# Requests per second to MOVIE_API across all workers, 0 for no limit. A
+# request waits up to MOVIE_API_MAX_WAIT seconds for its turn, then /movies/
+# answers 503 with Retry-After.
+MOVIE_API_RATE = float(os.getenv("MOVIE_API_RATE", 0))
+MOVIE_API_BURST = int(os.getenv("MOVIE_API_BURST", max(MOVIE_API_RATE, 1)))
+MOVIE_API_MAX_WAIT = float(os.getenv("MOVIE_API_MAX_WAIT", 2))
+
+# Seconds upstream movie pages stay cached, 0 disables the page cache.
+MOVIE_PAGE_CACHE_TIMEOUT = int(os.getenv("MOVIE_PAGE_CACHE_TIMEOUT", 0))
+# Pages after the one served to fetch into the page cache in the background
+# (needs the page cache), on MOVIE_PREFETCH_WORKERS threads per worker and
+# at most MOVIE_PREFETCH_RATE upstream requests per second per worker.
+MOVIE_PREFETCH_PAGES = int(os.getenv("MOVIE_PREFETCH_PAGES", 0))
+MOVIE_PREFETCH_WORKERS = int(os.getenv("MOVIE_PREFETCH_WORKERS", 2))
+MOVIE_PREFETCH_RATE = float(os.getenv("MOVIE_PREFETCH_RATE", 2))
+# Pass upstream pages through to /movies/ with only the next and previous
+# links rewritten, instead of decoding and validating every movie.
+MOVIE_LIST_PASSTHROUGH = os.getenv(
+    "MOVIE_LIST_PASSTHROUGH", "").lower() in ("1", "true", "yes")
+
+# Response compression, see config.middelware.compression. Encodings are
+# tried in this order, zstd and br only when zstandard and brotli are
+# installed. Smaller bodies are sent uncompressed.
+COMPRESSION_ENCODINGS = [
+    coding.strip() for coding in os.getenv(
+        "COMPRESSION_ENCODINGS", "zstd,br,gzip").split(",")
+    if coding.strip()
+]
+# Encodings whose compressed bodies are cached for responses marked with
+# compression_cache_timeout. zstd compresses about as fast as a cache hit.
+COMPRESSION_CACHE_ENCODINGS = [
+    coding.strip() for coding in os.getenv(
+        "COMPRESSION_CACHE_ENCODINGS", "br,gzip").split(",")
+    if coding.strip()
+]
+COMPRESSION_MIN_LENGTH = int(os.getenv("COMPRESSION_MIN_LENGTH", 1024))
+COMPRESSION_CONTENT_TYPES = (
+    "application/json", "application/msgpack", "text/")
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", 3))
+
+# Loggers only enqueue records, a listener thread formats and writes them,
+# see api.utils.log_handlers. Repeated exceptions are sampled before they
+# reach the queue. Every gunicorn worker logs to stdout; LOG_FILE also
+# appends JSON lines to a file, which is reopened when an external
+# logrotate moves it (Python's own rotation is not safe across processes).
+LOG_FILE = os.getenv("LOG_FILE", "")
+LOG_HANDLERS = ["console", "file"] if LOG_FILE else ["console"]
 
 LOGGING = {
     "version": 1,
@@ -158,33 +327,53 @@ LOGGING = {
             "format": "{levelname} {asctime} {message}",
             "style": "{",
         },
+        "json": {
+            "()": "api.utils.log_handlers.JsonFormatter",
+        },
+    },
+    "filters": {
+        "sample_exceptions": {
+            "()": "api.utils.log_handlers.RepeatedExceptionFilter",
+            "burst": int(os.getenv("LOG_EXCEPTION_BURST", 5)),
+            "window": int(os.getenv("LOG_EXCEPTION_WINDOW", 60)),
+        },
     },
     "handlers": {
         "console": {
             "class": "logging.StreamHandler",
-            "formatter": "simple",
+            "stream": "ext://sys.stdout",
+            "formatter": os.getenv("LOG_CONSOLE_FORMAT", "simple"),
         },
         "file": {
-            "class": "logging.FileHandler",
-            "filename": os.path.join(
-                BASE_DIR, "logs/django.log"
-            ),
-            "formatter": "verbose",
+            "class": "logging.handlers.WatchedFileHandler",
+            "filename": LOG_FILE or os.devnull,
+            "delay": True,
+            "formatter": "json",
+        },
+        "queue": {
+            "class": "api.utils.log_handlers.ForkSafeQueueHandler",
+            "handlers": LOG_HANDLERS,
+            "queue": {
+                "()": "queue.Queue",
+                "maxsize": int(os.getenv("LOG_QUEUE_SIZE", 10000)),
+            },
+            "respect_handler_level": True,
+            "filters": ["sample_exceptions"],
         },
     },
     "loggers": {
         "django": {
-            "handlers": ["console", "file"],
-            "level": "INFO", 
+            "handlers": ["queue"],
+            "level": "INFO",
             "propagate": True,
         },
         "api.movies": {
-            "handlers": ["console", "file"],
+            "handlers": ["queue"],
             "level": "DEBUG",
             "propagate": False,
         },
         "api.user_auth": {
-            "handlers": ["console", "file"],
+            "handlers": ["queue"],
             "level": "DEBUG",
             "propagate": False,
         },
@@ -193,17 +382,55 @@ LOGGING = {
 
 
 # settings.py
+# 'redis' shares the cache between workers, 'tiered' puts a small per worker
+# LRU in front of Redis (see api.utils.tiered_cache), anything else keeps
+# the per process LocMemCache.
 CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'default')
 
+# REDIS_SERIALIZER: 'pickle' (default) or 'msgpack' (faster, needs msgpack).
+REDIS_SERIALIZERS = {
+    'pickle': 'django_redis.serializers.pickle.PickleSerializer',
+    'msgpack': 'api.utils.redis_cache.MsgpackSerializer',
+}
+
+REDIS_CACHE = {
+    'BACKEND': 'django_redis.cache.RedisCache',
+    'LOCATION': os.getenv('REDIS_URL', 'redis://redis:6379/1'),
+    'OPTIONS': {
+        'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+        'CONNECTION_POOL_KWARGS': {
+            # Per worker process, shared by its threads.
+            'max_connections': int(os.getenv('REDIS_MAX_CONNECTIONS', 50)),
+            'retry_on_timeout': True,
+            'health_check_interval': 30,
+        },
+        'SOCKET_CONNECT_TIMEOUT': float(
+            os.getenv('REDIS_SOCKET_CONNECT_TIMEOUT', 1)),
+        'SOCKET_TIMEOUT': float(os.getenv('REDIS_SOCKET_TIMEOUT', 1)),
+        'SERIALIZER': REDIS_SERIALIZERS[
+            os.getenv('REDIS_SERIALIZER', 'pickle')],
+        'COMPRESSOR': 'api.utils.redis_cache.ThresholdZlibCompressor',
+        'COMPRESS_MIN_LENGTH': int(
+            os.getenv('REDIS_COMPRESS_MIN_LENGTH', 1024)),
+    }
+}
+
 if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': REDIS_CACHE,
+    }
+elif CACHE_BACKEND == 'tiered':
     CACHES = {
         'default': {
-            'BACKEND': 'django_redis.cache.RedisCache',
-            'LOCATION': 'redis://redis:6379/1',
+            'BACKEND': 'api.utils.tiered_cache.TieredCache',
             'OPTIONS': {
-                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                'REMOTE': 'redis',
+                'LOCAL_MAX_ENTRIES': int(
+                    os.getenv('CACHE_LOCAL_MAX_ENTRIES', 1024)),
+                'LOCAL_TIMEOUT': int(os.getenv('CACHE_LOCAL_TIMEOUT', 5)),
             }
-        }
+        },
+        'redis': REDIS_CACHE,
     }
 else:
     CACHES = {
@@ -215,5 +442,41 @@ else:
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
-
+    "REFRESH_TOKEN_LIFETIME": timedelta(
+        days=int(os.getenv("REFRESH_TOKEN_LIFETIME_DAYS", 1))),
+    # Old refresh tokens are revoked in the cache on every refresh, see
+    # api.user_auth.services.TokenBlacklistService.
+    "ROTATE_REFRESH_TOKENS": True,
+    "BLACKLIST_AFTER_ROTATION": True,
 }
+
+# How long (seconds) a worker trusts a cached user ``is_active`` state
+# before re-checking it for revoked or deleted users.
+AUTH_USER_STATE_CACHE_TTL = int(os.getenv("AUTH_USER_STATE_CACHE_TTL", 30))
+AUTH_USER_STATE_CACHE_SIZE = int(
+    os.getenv("AUTH_USER_STATE_CACHE_SIZE", 10000))
+
+# Most operations accepted by one POST /collections/batch/ request.
+BATCH_MAX_OPERATIONS = int(os.getenv("BATCH_MAX_OPERATIONS", 1000))
+
+# 'inline' deletes a collection and its movies with one set based DELETE
+# per table. 'deferred' only flags it as deleted, so the request does not
+# wait on large collections, and a background job (or
+# ``manage.py purge_deleted_collections``) removes the movies in batches of
+# COLLECTION_PURGE_BATCH_SIZE rows, each batch in its own transaction.
+COLLECTION_DELETE_MODE = os.getenv("COLLECTION_DELETE_MODE", "inline")
+COLLECTION_PURGE_BATCH_SIZE = int(
+    os.getenv("COLLECTION_PURGE_BATCH_SIZE", 1000))
+
+# Background jobs, see api.jobs. Workers run ``manage.py run_jobs``.
+# JOBS_ALWAYS_EAGER runs jobs inside the request instead, for tests and
+# deployments without a worker.
+JOBS_ALWAYS_EAGER = os.getenv(
+    "JOBS_ALWAYS_EAGER", "").lower() in ("1", "true", "yes")
+JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", 1))
+# Seconds before the first retry, doubled on every further attempt.
+JOBS_RETRY_BACKOFF = int(os.getenv("JOBS_RETRY_BACKOFF", 10))
+# Running jobs refresh a heartbeat every JOBS_HEARTBEAT_INTERVAL seconds,
+# one silent for JOBS_STALE_AFTER seconds is assumed lost with its worker.
+JOBS_HEARTBEAT_INTERVAL = float(os.getenv("JOBS_HEARTBEAT_INTERVAL", 30))
+JOBS_STALE_AFTER = int(os.getenv("JOBS_STALE_AFTER", 600))
@@ -1,8 +1,4 @@
 from .base import *
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
 
 DEBUG = True
 
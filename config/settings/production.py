@@ -1,23 +1,11 @@
 from .base import *
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
 
 DEBUG = True
 
 ALLOWED_HOSTS = []
 
-# DATABASES = {
-#     'default': {
-#         'ENGINE': 'django.db.backends.postgresql',
-#         'NAME': os.getenv('DB_NAME'),
-#         'USER': os.getenv('DB_USER'),
-#         'PASSWORD': os.getenv('DB_PASSWORD'),
-#         'HOST': os.getenv('DB_HOST'),
-#         'PORT': os.getenv('DB_PORT'),
-#     }
-# }
+# The PostgreSQL profile lives in base.py, enable it with
+# DATABASE_ENGINE=postgres and the DB_* variables.
 
 # STATIC_ROOT = BASE_DIR / 'static/'
 # MEDIA_ROOT = BASE_DIR / 'media/'
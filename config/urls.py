@@ -15,12 +15,16 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
-from api.counter.views import RequestCountAPIView, ResetRequestCountAPIView
+from api.counter.views import (MetricsAPIView, RequestCountAPIView,
+                               ResetRequestCountAPIView)
+from api.jobs.views import JobDetailView
 from api.movies.views import CollectionViewSet, MovieListView
-from api.user_auth.views import RegisterView
+from api.user_auth.views import (RegisterView, TokenBlacklistView,
+                                 TokenRefreshView)
 from django.contrib import admin
 from django.urls import path
 from rest_framework.routers import SimpleRouter
+from rest_framework_simplejwt.views import TokenObtainPairView
 
 router = SimpleRouter()
 router.register(r"collections", CollectionViewSet, basename='collection')
@@ -28,9 +32,14 @@ router.register(r"collections", CollectionViewSet, basename='collection')
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("register/", RegisterView.as_view(), name="register"),
+    path("token/", TokenObtainPairView.as_view(), name="token-obtain"),
+    path("token/refresh/", TokenRefreshView.as_view(), name="token-refresh"),
+    path("token/blacklist/", TokenBlacklistView.as_view(), name="token-blacklist"), # noqa
     path("movies/", MovieListView.as_view(), name="movies"),
     path('request-count/', RequestCountAPIView.as_view(), name='request-count'),# noqa
     path('request-count/reset/', ResetRequestCountAPIView.as_view(), name='reset-request-count'), # noqa
+    path('metrics/', MetricsAPIView.as_view(), name='metrics'),
+    path('jobs/<uuid:pk>/', JobDetailView.as_view(), name='job-detail'),
 ]
 
 urlpatterns += router.urls
@@ -2,7 +2,7 @@ import factory
 from django.contrib.auth.models import User
 from factory.django import DjangoModelFactory
 from api.movies.models import Movie, Collection
-import uuid
+from api.utils.uuid7 import uuid7
 
 
 class UserFactory(factory.django.DjangoModelFactory):
@@ -32,5 +32,5 @@ class MovieFactory(DjangoModelFactory):
     title = factory.Faker('sentence', nb_words=3)
     description = factory.Faker('text')
     genres = factory.Faker('word')
-    uuid = factory.LazyFunction(uuid.uuid4)
+    uuid = factory.LazyFunction(uuid7)
     collection = factory.SubFactory(CollectionFactory)
@@ -0,0 +1,21 @@
+from django.urls import reverse
+
+
+class AuthenticatedTestMixin:
+
+    """
+    Registers a user before each test and sends its access token with every
+    request of ``self.client``. Mix into ``APITestCase`` or
+    ``APITransactionTestCase``.
+    """
+
+    username = 'username'
+    password = 'password'
+
+    def setUp(self):
+        super().setUp()
+        response = self.client.post(reverse('register'),
+                                    {'username': self.username,
+                                     'password': self.password})
+        self.token = response.data['access']
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.token)
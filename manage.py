@@ -8,8 +8,10 @@ load_dotenv()
 
 def main():
     env = os.getenv("ENVIRONMENT")
+    if not env and sys.argv[1:2] == ['test']:
+        env = 'test'
     if env:
-        if env not in ['development', 'production']:
+        if env not in ['development', 'production', 'test']:
             env = 'base'
 
     """Run administrative tasks."""